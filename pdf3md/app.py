@@ -1,24 +1,79 @@
 """PDF3MD Flask Application - Main Entry Point."""
 
 import os
-import tempfile
+import json
 import uuid
 import time
 import signal
 import subprocess
+import zipfile
 from datetime import datetime
-from threading import Thread
 
-from flask import request, jsonify, send_file, send_from_directory
-
-from .config import create_app, setup_logging
-from .utils import cleanup_temp_files, load_version_meta, get_git_info
+from flask import (
+    Response,
+    request,
+    jsonify,
+    send_file,
+    send_from_directory,
+    stream_with_context,
+)
+from werkzeug.datastructures import FileStorage
+from werkzeug.exceptions import HTTPException
+
+from .config import (
+    create_app,
+    setup_logging,
+    get_upload_mode,
+    get_pdf_engine,
+    is_isolation_enabled,
+)
+from .utils import (
+    PageRangeError,
+    parse_page_ranges,
+    format_page_ranges,
+    load_version_meta,
+    get_git_info,
+)
 from .converters import (
+    ENGINES,
+    OptionsError,
+    PdfSource,
+    parse_options,
+    extraction_kwargs,
     convert_pdf_with_progress,
+    build_result,
+    make_cache_key,
+    load_cached_result,
+    get_cache_stats,
+    get_page_cache_stats,
+    get_table_scan_stats,
+    table_prescan_active,
+    run_on_document,
     markdown_to_docx,
     convert_docx_to_markdown,
+    get_pandoc_pool,
+)
+from .formatters import (
+    get_profile_manager,
+    validate_profile,
+    get_profile_template,
+    get_reference_doc_stats,
+)
+from .jobs import (
+    FollowUp,
+    PRIORITY_HIGH,
+    PRIORITY_LOW,
+    QueueFullError,
+    JobFailedError,
+    InsufficientSpaceError,
+    get_job_executor,
+    get_job_store,
+    get_result_store,
+    get_workspace_manager,
+    get_worker_supervisor,
+    scan_pdf_features,
+    get_cost_model,
 )
-from .formatters import get_profile_manager, validate_profile, get_profile_template
 
 # Setup logging
 logger = setup_logging()
@@ -27,15 +82,382 @@ logger = setup_logging()
 app = create_app()
 
 # Store conversion progress
-conversion_progress = {}
+job_store = get_job_store()
+# Finished markdown, served by /result/<id>
+result_store = get_result_store()
+
+# Seconds between keep-alive comments on an idle event stream
+STREAM_KEEPALIVE_INTERVAL = 15
+# Bytes copied per step when streaming result files into a batch zip
+RESULT_CHUNK_SIZE = 1024 * 1024
+# Default and maximum seconds a long-poll /progress request blocks
+LONG_POLL_TIMEOUT = 25
+LONG_POLL_MAX_TIMEOUT = 60
+# Result variants served by /result/<id> next to the full result
+RESULT_VARIANTS = ("preview",)
+
+
+def insufficient_storage_response():
+    """Build the response for uploads rejected by the scratch space guard.
+
+    Returns:
+        Tuple of (response, status code)
+    """
+    return jsonify(
+        {"error": "Server is low on disk space, please retry later", "success": False}
+    ), 507
+
+
+def run_conversion(
+    source,
+    workspace,
+    conversion_id,
+    filename,
+    cache_key,
+    batch_id=None,
+    pages=None,
+    preview_pages=None,
+    cost=None,
+    engine=None,
+    options=None,
+):
+    """Run a queued PDF conversion and release its workspace afterwards.
+
+    With ``preview_pages`` only the preview is converted; the full
+    conversion is returned as a low-priority follow-up job that reuses the
+    open source and workspace.
+
+    Args:
+        source: PdfSource of the uploaded PDF
+        workspace: Workspace of the job
+        conversion_id: Unique conversion ID
+        filename: Original filename
+        cache_key: Result cache key
+        batch_id: ID of the batch the PDF belongs to, if any
+        pages: Optional sorted 0-based page numbers to convert
+        preview_pages: Optional 0-based page numbers of the preview
+        cost: Predicted run time of the full conversion in seconds
+        engine: Conversion engine, one of ENGINES
+        options: Extraction options from parse_options()
+
+    Returns:
+        FollowUp running the full conversion after a preview, else None
+
+    Raises:
+        JobFailedError: If the conversion failed or was cancelled; the job
+            state already says so
+    """
+    if preview_pages:
+        convert_pdf_with_progress(
+            source,
+            conversion_id,
+            filename,
+            job_store,
+            result_store=result_store,
+            pages=preview_pages,
+            preview=True,
+            engine=engine,
+            options=options,
+        )
+        entry = job_store.get(conversion_id)
+        if entry is not None and entry.get("status") != "error":
+            return FollowUp(
+                run_conversion,
+                args=(source, workspace, conversion_id, filename, cache_key),
+                kwargs={
+                    "batch_id": batch_id,
+                    "pages": pages,
+                    "engine": engine,
+                    "options": options,
+                },
+                cost=cost,
+                priority=PRIORITY_LOW,
+            )
+        source.close()
+        workspace.release()
+    else:
+        with workspace:
+            convert_pdf_with_progress(
+                source,
+                conversion_id,
+                filename,
+                job_store,
+                cache_key=cache_key,
+                result_store=result_store,
+                pages=pages,
+                engine=engine,
+                options=options,
+            )
+    if batch_id:
+        refresh_batch(batch_id)
+    entry = job_store.get(conversion_id)
+    if entry is None or entry.get("status") == "error":
+        raise JobFailedError(entry.get("error") if entry is not None else "cancelled")
+    return None
+
+
+def release_conversion(conversion_id):
+    """Drop the job state and result files of a conversion.
+
+    Args:
+        conversion_id: Conversion ID
+    """
+    job_store.delete(conversion_id)
+    for variant in (None, *RESULT_VARIANTS):
+        result_store.delete(result_store.name(conversion_id, variant))
+
+
+def format_sse(event, data, event_id=None):
+    """Format a Server-Sent Events message.
+
+    Args:
+        event: Event name
+        data: JSON-serializable payload
+        event_id: Optional event ID used for client reconnects
+
+    Returns:
+        SSE message string
+    """
+    message = f"event: {event}\n"
+    if event_id is not None:
+        message += f"id: {event_id}\n"
+    return message + f"data: {json.dumps(data)}\n\n"
+
+
+def start_pdf_conversion(
+    file,
+    upload_mode,
+    expected_bytes=0,
+    bounded=True,
+    batch_id=None,
+    pages=None,
+    preview=None,
+    engine=None,
+    options=None,
+):
+    """Admit an uploaded PDF: answer it from the cache or queue a conversion.
+
+    With ``preview`` the first pages of the selection are converted first,
+    ahead of all other queued work, and published as a preview result. The
+    remaining conversion then continues at low priority.
+
+    Args:
+        file: Werkzeug FileStorage of the PDF
+        upload_mode: One of UPLOAD_MODES
+        expected_bytes: Expected upload size for the scratch space guard
+        bounded: Whether the job queue limit applies
+        batch_id: ID of the batch the PDF belongs to, if any
+        pages: Optional page range specification such as ``1-5,8``
+        preview: Optional number of pages to convert as a preview
+        engine: Conversion engine, one of ENGINES; defaults to the
+            configured engine
+        options: Extraction options from parse_options(); defaults to the
+            default tier
+
+    Returns:
+        Tuple of (conversion ID, whether the result came from the cache)
+
+    Raises:
+        InsufficientSpaceError: If the scratch volume is too full
+        QueueFullError: If the job queue is full
+        PageRangeError: If ``pages`` does not fit the document
+    """
+    conversion_id = str(uuid.uuid4())
+    engine = engine or get_pdf_engine()
+    if engine == "fast":
+        options = None
+    elif options is None:
+        options = parse_options()
+    workspace = get_workspace_manager().create(
+        conversion_id, expected_bytes if upload_mode != "memory" else 0
+    )
+
+    logger.info(f"Receiving {file.filename} ({upload_mode} upload)")
+    try:
+        source = PdfSource.from_upload(file, upload_mode, workspace.file("upload.pdf"))
+    except Exception:
+        workspace.release()
+        raise
+    file_size = source.size
+    extra_fields = {"batch_id": batch_id} if batch_id else {}
+
+    def discard_source():
+        source.close()
+        workspace.release()
+
+    page_numbers = None
+    selection = {}
+    if pages:
+        try:
+            document_pages = run_on_document(source, len)
+            page_numbers = parse_page_ranges(pages, document_pages)
+        except Exception:
+            discard_source()
+            raise
+        if len(page_numbers) == document_pages:
+            page_numbers = None
+        else:
+            extra_fields["pages"] = format_page_ranges(page_numbers)
+            selection = {
+                "pages": extra_fields["pages"],
+                "documentPageCount": document_pages,
+            }
+
+    # Subsets, other engines and non-default options are cached separately;
+    # the default whole-document key is unchanged
+    key_options = {"pages": selection["pages"]} if selection else {}
+    if engine != "pymupdf4llm":
+        key_options["engine"] = engine
+    if extraction_kwargs(options):
+        key_options["extraction"] = extraction_kwargs(options)
+    cache_key = make_cache_key(source.digest, key_options or None)
+
+    cached = load_cached_result(cache_key)
+    if cached is not None:
+        discard_source()
+        logger.info(f"Cache hit for {file.filename} ({cache_key[:12]})")
+        result = result_store.spill(
+            conversion_id,
+            build_result(
+                "".join(cached["pages"]),
+                file.filename,
+                file_size,
+                cached["pageCount"],
+                cached=True,
+                engine=engine,
+                **({"options": options} if options is not None else {}),
+                **selection,
+            ),
+        )
+        job_store.put(
+            conversion_id,
+            {
+                "progress": 100,
+                "stage": "Conversion complete!",
+                "total_pages": cached["pageCount"],
+                "current_page": cached["pageCount"],
+                "filename": file.filename,
+                "file_size": file_size,
+                "status": "completed",
+                "result": result,
+                **extra_fields,
+            },
+        )
+        return conversion_id, True
+
+    preview_pages = None
+    if preview:
+        try:
+            selected = page_numbers or list(range(run_on_document(source, len)))
+        except Exception:
+            discard_source()
+            raise
+        if preview < len(selected):
+            preview_pages = selected[:preview]
+            extra_fields["preview_pages"] = preview
+
+    try:
+        cost_model = get_cost_model()
+        estimated_seconds = cost_model.predict(
+            run_on_document(source, scan_pdf_features, page_numbers), engine
+        )
+        preview_seconds = (
+            cost_model.predict(
+                run_on_document(source, scan_pdf_features, preview_pages), engine
+            )
+            if preview_pages
+            else None
+        )
+    except Exception as e:
+        logger.warning(f"Pre-scan failed for {file.filename}: {e}")
+        estimated_seconds = preview_seconds = None
+    if batch_id and upload_mode == "disk":
+        # The job reopens the file; queued batch files should not hold documents
+        source.close()
+
+    job_store.put(
+        conversion_id,
+        {
+            "progress": 0,
+            "stage": "Queued...",
+            "filename": file.filename,
+            "status": "queued",
+            "estimated_seconds": estimated_seconds,
+            **extra_fields,
+        },
+    )
+
+    args = (source, workspace, conversion_id, file.filename, cache_key)
+    kwargs = {
+        "batch_id": batch_id,
+        "pages": page_numbers,
+        "engine": engine,
+        "options": options,
+    }
+    try:
+        if preview_pages:
+            get_job_executor().submit(
+                conversion_id,
+                run_conversion,
+                args=args,
+                kwargs={
+                    **kwargs,
+                    "preview_pages": preview_pages,
+                    "cost": estimated_seconds,
+                },
+                cost=preview_seconds,
+                bounded=bounded,
+                priority=PRIORITY_HIGH,
+            )
+        else:
+            get_job_executor().submit(
+                conversion_id,
+                run_conversion,
+                args=args,
+                kwargs=kwargs,
+                cost=estimated_seconds,
+                bounded=bounded,
+            )
+    except QueueFullError:
+        job_store.delete(conversion_id)
+        discard_source()
+        logger.warning(f"Conversion queue full, rejected {file.filename}")
+        raise
+
+    return conversion_id, False
+
+
+def queue_full_response(error):
+    """Build the response for uploads rejected because the queue is full.
+
+    Args:
+        error: QueueFullError raised by the job executor
+
+    Returns:
+        Tuple of (response, status code)
+    """
+    response = jsonify(
+        {"error": "Server is busy, please retry later", "success": False}
+    )
+    response.headers["Retry-After"] = str(error.retry_after)
+    return response, 429
 
 
 @app.route("/convert", methods=["POST"])
 def convert():
-    """Convert PDF to Markdown."""
+    """Convert PDF to Markdown.
+
+    An optional ``pages`` field (e.g. ``1-5,8,10-``) limits the conversion
+    to the selected 1-based pages. An optional ``preview`` field (a page
+    count) converts those first pages ahead of other work; the job then
+    reports ``preview_ready`` and a ``preview`` result while the rest of
+    the document converts at low priority. An optional ``engine`` field
+    selects the conversion engine (``pymupdf4llm`` or ``fast``). Extraction
+    settings come from an optional ``tier`` (``fast``, ``balanced`` or
+    ``full``) and an ``options`` JSON object overriding single settings;
+    the effective settings are echoed in the result.
+    """
     try:
-        cleanup_temp_files(prefix="temp_", suffix=".pdf")
-
         if "pdf" not in request.files:
             logger.error("No file in request")
             return jsonify({"error": "No file uploaded"}), 400
@@ -45,17 +467,57 @@ def convert():
             logger.error("Empty filename")
             return jsonify({"error": "No file selected"}), 400
 
-        conversion_id = str(uuid.uuid4())
-
-        temp_path = os.path.join(tempfile.gettempdir(), f"temp_{conversion_id}.pdf")
-        logger.info(f"Saving file to {temp_path}")
-        file.save(temp_path)
+        preview = request.form.get("preview") or request.args.get("preview")
+        if preview is not None:
+            try:
+                preview = int(preview)
+                if preview < 1:
+                    raise ValueError
+            except ValueError:
+                return jsonify(
+                    {"error": "preview must be a positive page count", "success": False}
+                ), 400
+
+        engine = request.form.get("engine") or request.args.get("engine")
+        if engine is not None and engine not in ENGINES:
+            return jsonify(
+                {"error": f"Unknown engine '{engine}'", "success": False}
+            ), 400
 
-        thread = Thread(
-            target=convert_pdf_with_progress,
-            args=(temp_path, conversion_id, file.filename, conversion_progress),
-        )
-        thread.start()
+        try:
+            options = parse_options(
+                request.form.get("tier") or request.args.get("tier"),
+                request.form.get("options") or request.args.get("options"),
+            )
+        except OptionsError as e:
+            return jsonify({"error": str(e), "success": False}), 400
+
+        try:
+            conversion_id, cached = start_pdf_conversion(
+                file,
+                get_upload_mode(),
+                request.content_length,
+                pages=request.form.get("pages") or request.args.get("pages"),
+                preview=preview,
+                engine=engine,
+                options=options,
+            )
+        except PageRangeError as e:
+            return jsonify({"error": str(e), "success": False}), 400
+        except InsufficientSpaceError:
+            return insufficient_storage_response()
+        except QueueFullError as e:
+            return queue_full_response(e)
+
+        if cached:
+            return jsonify(
+                {
+                    "conversion_id": conversion_id,
+                    "message": "Conversion completed from cache",
+                    "cached": True,
+                    "success": True,
+                }
+            )
 
         return jsonify(
             {
@@ -73,27 +535,351 @@ def convert():
         return jsonify({"error": f"Server error: {str(e)}", "success": False}), 500
 
 
-@app.route("/progress/<conversion_id>", methods=["GET"])
-def get_progress(conversion_id):
-    """Get conversion progress for a specific conversion ID."""
+def iter_batch_uploads(files):
+    """Expand uploaded files into the PDFs of a batch.
+
+    Args:
+        files: Uploaded FileStorage objects; zip archives are unpacked
+
+    Yields:
+        Tuple of (FileStorage or None, filename, expected size in bytes);
+        the FileStorage is None for skipped files
+    """
+    for file in files:
+        name = file.filename or ""
+        if name.lower().endswith(".zip"):
+            with zipfile.ZipFile(file.stream) as archive:
+                for info in archive.infolist():
+                    member = os.path.basename(info.filename)
+                    if info.is_dir() or info.filename.startswith("__MACOSX/"):
+                        continue
+                    if not member.lower().endswith(".pdf"):
+                        yield None, member, 0
+                        continue
+                    with archive.open(info) as stream:
+                        upload = FileStorage(stream, filename=member)
+                        yield upload, member, info.file_size
+        elif name.lower().endswith(".pdf"):
+            yield file, name, 0
+        elif name:
+            yield None, name, 0
+
+
+def refresh_batch(batch_id):
+    """Record a finished batch file and close the batch once all are done.
+
+    Args:
+        batch_id: Batch ID
+    """
+    batch = job_store.get(batch_id)
+    if batch is None or batch.get("status") != "processing":
+        return
+    statuses = [
+        (job_store.get(job["conversion_id"]) or {}).get("status", "error")
+        for job in batch["jobs"]
+    ]
+    finished = sum(status in ("completed", "error") for status in statuses)
+    # Every call bumps the batch version, waking aggregate stream readers
+    job_store.update(
+        batch_id,
+        finished=finished,
+        status="completed" if finished == len(statuses) else "processing",
+    )
+
+
+def batch_summary(batch_id):
+    """Build the aggregate progress view of a batch.
+
+    Args:
+        batch_id: Batch ID
+
+    Returns:
+        Dictionary with overall progress, counters and per-file status,
+        or None if the batch is unknown
+    """
+    batch = job_store.get(batch_id)
+    if batch is None or batch.get("type") != "batch":
+        return None
+
+    jobs = []
+    counts = {"queued": 0, "processing": 0, "completed": 0, "error": 0}
+    for job in batch["jobs"]:
+        entry = job_store.get(job["conversion_id"]) or {
+            "status": "error",
+            "error": "Conversion expired",
+        }
+        status = entry.get("status", "queued")
+        counts[status] = counts.get(status, 0) + 1
+        jobs.append(
+            {
+                "conversion_id": job["conversion_id"],
+                "filename": job["filename"],
+                "status": status,
+                "progress": entry.get("progress", 0),
+                "stage": entry.get("stage"),
+                "error": entry.get("error"),
+                "result_url": (entry.get("result") or {}).get("result_url"),
+            }
+        )
+
+    total = len(jobs)
+    # Failed files are done as well; their progress stops where they failed
+    done = sum(
+        100 if job["status"] in ("completed", "error") else job["progress"]
+        for job in jobs
+    )
+    return {
+        "batch_id": batch_id,
+        "status": batch["status"],
+        "total": total,
+        "progress": int(done / total) if total else 100,
+        "counts": counts,
+        "skipped": batch.get("skipped", []),
+        "jobs": jobs,
+        "download_url": f"/batch/{batch_id}/download",
+    }
+
+
+@app.route("/convert/batch", methods=["POST"])
+def convert_batch():
+    """Convert many PDFs in one request.
+
+    Accepts any number of PDF files and zip archives of PDFs in any form
+    field. The batch is admitted as a whole, so one free queue slot is
+    enough; its files are then queued for the conversion workers. Track it
+    with /batch/<id> and download all results with /batch/<id>/download.
+    """
     try:
-        if conversion_id not in conversion_progress:
-            return jsonify({"error": "Conversion not found"}), 404
+        files = [file for key in request.files for file in request.files.getlist(key)]
+        if not files:
+            return jsonify({"error": "No files uploaded"}), 400
+
+        try:
+            get_job_executor().check_capacity()
+        except QueueFullError as e:
+            return queue_full_response(e)
+
+        batch_id = str(uuid.uuid4())
+        job_store.put(
+            batch_id,
+            {"type": "batch", "status": "admitting", "jobs": [], "skipped": []},
+        )
+        jobs = []
+        skipped = []
+        cached = 0
+        for file, filename, size in iter_batch_uploads(files):
+            if file is None:
+                skipped.append(filename)
+                continue
+            try:
+                # Queued files of a batch stay on disk, never in memory
+                conversion_id, from_cache = start_pdf_conversion(
+                    file, "disk", size, bounded=False, batch_id=batch_id
+                )
+                cached += from_cache
+            except Exception as e:
+                logger.error(f"Batch {batch_id}: could not start {filename}: {e}")
+                conversion_id = str(uuid.uuid4())
+                job_store.put(
+                    conversion_id,
+                    {
+                        "progress": 0,
+                        "stage": f"Error: {e}",
+                        "status": "error",
+                        "error": str(e),
+                        "filename": filename,
+                        "batch_id": batch_id,
+                    },
+                )
+            jobs.append({"conversion_id": conversion_id, "filename": filename})
 
-        progress_data = conversion_progress[conversion_id].copy()
+        if not jobs:
+            job_store.delete(batch_id)
+            return jsonify({"error": "No PDF files found", "skipped": skipped}), 400
 
-        if progress_data.get("status") in ["completed", "error"]:
-            temp_path = os.path.join(tempfile.gettempdir(), f"temp_{conversion_id}.pdf")
-            if os.path.exists(temp_path):
-                os.remove(temp_path)
-                logger.info(f"Temp file removed: {temp_path}")
+        job_store.update(
+            batch_id, status="processing", jobs=jobs, skipped=skipped, finished=0
+        )
+        refresh_batch(batch_id)
+        logger.info(f"Batch {batch_id}: {len(jobs)} PDFs, {cached} from cache")
+
+        return jsonify(
+            {
+                "batch_id": batch_id,
+                "total": len(jobs),
+                "cached": cached,
+                "skipped": skipped,
+                "message": "Batch conversion started",
+                "success": True,
+            }
+        )
+
+    except zipfile.BadZipFile as e:
+        return jsonify({"error": f"Invalid zip archive: {e}", "success": False}), 400
+    except Exception as e:
+        logger.error(f"Server error: {str(e)}")
+        import traceback
+
+        logger.error(traceback.format_exc())
+        return jsonify({"error": f"Server error: {str(e)}", "success": False}), 500
+
+
+@app.route("/batch/<batch_id>", methods=["GET"])
+def get_batch(batch_id):
+    """Get the aggregate progress of a batch conversion."""
+    try:
+        summary = batch_summary(batch_id)
+        if summary is None:
+            return jsonify({"error": "Batch not found"}), 404
+        return jsonify(summary)
+
+    except Exception as e:
+        logger.error(f"Batch error: {str(e)}")
+        return jsonify({"error": f"Batch error: {str(e)}"}), 500
+
+
+class ZipStreamBuffer:
+    """Write-only file object collecting zip output between yields."""
+
+    def __init__(self):
+        self._chunks = []
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def pop(self):
+        """Return and clear the bytes written so far."""
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+
+@app.route("/batch/<batch_id>/download", methods=["GET"])
+def download_batch(batch_id):
+    """Stream a zip archive of the markdown results of a batch.
+
+    Files are added as their conversions finish, so the download can start
+    while the batch is still running. Failed conversions are represented by
+    a ``.error.txt`` file with the error message.
+    """
+    batch = job_store.get(batch_id)
+    if batch is None or batch.get("type") != "batch":
+        return jsonify({"error": "Batch not found"}), 404
+
+    def archive_names(jobs):
+        names = {}
+        used = set()
+        for job in jobs:
+            stem = os.path.splitext(job["filename"])[0] or "document"
+            name = stem
+            index = 1
+            while name in used:
+                index += 1
+                name = f"{stem}_{index}"
+            used.add(name)
+            names[job["conversion_id"]] = name
+        return names
+
+    def generate():
+        buffer = ZipStreamBuffer()
+        pending = list(batch["jobs"])
+        names = archive_names(pending)
+        with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as archive:
+            while pending:
+                version = job_store.version(batch_id)
+                for job in list(pending):
+                    conversion_id = job["conversion_id"]
+                    entry = job_store.get(conversion_id)
+                    status = (entry or {}).get("status", "error")
+                    if status not in ("completed", "error"):
+                        continue
+                    pending.remove(job)
+                    name = names[conversion_id]
+                    if status == "completed" and result_store.exists(conversion_id):
+                        src = open(result_store.path(conversion_id), "rb")
+                        dst = archive.open(f"{name}.md", "w", force_zip64=True)
+                        with src, dst:
+                            while True:
+                                data = src.read(RESULT_CHUNK_SIZE)
+                                if not data:
+                                    break
+                                dst.write(data)
+                                yield buffer.pop()
+                    else:
+                        error = (entry or {}).get("error") or "Conversion expired"
+                        archive.writestr(f"{name}.error.txt", error)
+                    yield buffer.pop()
+                if pending:
+                    job_store.wait(batch_id, version, STREAM_KEEPALIVE_INTERVAL)
+        yield buffer.pop()
+
+    return Response(
+        stream_with_context(generate()),
+        mimetype="application/zip",
+        headers={
+            "Content-Disposition": (
+                f"attachment; filename=pdf3md_batch_{batch_id[:8]}.zip"
+            )
+        },
+    )
 
-            def cleanup_progress():
-                time.sleep(5)
-                if conversion_id in conversion_progress:
-                    del conversion_progress[conversion_id]
 
-            Thread(target=cleanup_progress).start()
+def progress_payload(conversion_id):
+    """Build the progress payload of a conversion.
+
+    Args:
+        conversion_id: Unique conversion ID
+
+    Returns:
+        Progress dictionary including queue position, ETA and version,
+        or None if the conversion is unknown
+    """
+    progress_data, version = job_store.snapshot(conversion_id)
+    if progress_data is None:
+        return None
+
+    progress_data["version"] = version
+    executor = get_job_executor()
+    if progress_data.get("status") == "queued":
+        position = executor.queue_position(conversion_id)
+        if position is not None:
+            progress_data["queue_position"] = position
+            progress_data["stage"] = f"Queued (position {position})..."
+    if progress_data.get("status") in ("queued", "processing"):
+        total_pages = progress_data.get("total_pages") or 0
+        fraction_done = (
+            progress_data.get("current_page", 0) / total_pages if total_pages else None
+        )
+        progress_data["eta_seconds"] = executor.eta(conversion_id, fraction_done)
+    elif progress_data.get("status") == "completed":
+        progress_data["eta_seconds"] = 0
+    return progress_data
+
+
+@app.route("/progress/<conversion_id>", methods=["GET"])
+def get_progress(conversion_id):
+    """Get conversion progress for a specific conversion ID.
+
+    With ``?wait=<version>`` the request long-polls: it blocks until the
+    job's version differs from the given one or ``timeout`` seconds pass.
+    """
+    try:
+        wait_version = request.args.get("wait", type=int)
+        if wait_version is not None:
+            timeout = request.args.get("timeout", LONG_POLL_TIMEOUT, type=float)
+            job_store.wait(
+                conversion_id,
+                wait_version,
+                min(max(timeout, 0), LONG_POLL_MAX_TIMEOUT),
+            )
+
+        progress_data = progress_payload(conversion_id)
+        if progress_data is None:
+            return jsonify({"error": "Conversion not found"}), 404
 
         return jsonify(progress_data)
 
@@ -102,6 +888,197 @@ def get_progress(conversion_id):
         return jsonify({"error": f"Progress error: {str(e)}"}), 500
 
 
+@app.route("/progress/<conversion_id>/stream", methods=["GET"])
+def stream_progress(conversion_id):
+    """Push conversion progress as Server-Sent Events.
+
+    Sends a ``progress`` event with the /progress payload whenever the job
+    changes, using the job version as event ID, and closes the stream once
+    the job has completed or failed.
+    """
+    if conversion_id not in job_store:
+        return jsonify({"error": "Conversion not found"}), 404
+
+    def generate():
+        version = None
+        while True:
+            progress_data = progress_payload(conversion_id)
+            if progress_data is None:
+                yield format_sse("error", {"error": "Conversion not found"})
+                return
+
+            version = progress_data["version"]
+            yield format_sse("progress", progress_data, event_id=version)
+            if progress_data.get("status") in ("completed", "error"):
+                return
+
+            while (
+                job_store.wait(conversion_id, version, STREAM_KEEPALIVE_INTERVAL)
+                == version
+            ):
+                yield ": keep-alive\n\n"
+
+    return Response(
+        stream_with_context(generate()),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@app.route("/stream/<conversion_id>", methods=["GET"])
+def stream_conversion(conversion_id):
+    """Stream per-page markdown as Server-Sent Events while a PDF converts.
+
+    Emits a ``page`` event for every finished page (in completion order, with
+    its 1-based page number), ``progress`` events on stage changes and a final
+    ``done`` or ``error`` event. Page events carry their index as event ID,
+    so reconnecting clients resume via ``Last-Event-ID``. The job store drops
+    pages once a job finishes, so cache hits stream no pages; the ``done``
+    event's ``result_url`` always serves the complete markdown.
+    """
+    if conversion_id not in job_store:
+        return jsonify({"error": "Conversion not found"}), 404
+
+    try:
+        next_index = int(request.headers.get("Last-Event-ID", -1)) + 1
+    except ValueError:
+        next_index = 0
+
+    def generate(next_index):
+        last_progress = None
+        last_sent = time.monotonic()
+        while True:
+            entry, version = job_store.snapshot(conversion_id)
+            if entry is None:
+                yield format_sse("error", {"error": "Conversion not found"})
+                return
+
+            for chunk in job_store.get_chunks(conversion_id, next_index):
+                yield format_sse("page", chunk, event_id=next_index)
+                next_index += 1
+                last_sent = time.monotonic()
+
+            status = entry.get("status")
+            if status == "completed":
+                yield format_sse("done", entry.get("result") or {})
+                return
+            if status == "error":
+                yield format_sse("error", {"error": entry.get("error")})
+                return
+
+            progress = (entry.get("progress"), entry.get("stage"))
+            if progress != last_progress:
+                last_progress = progress
+                yield format_sse(
+                    "progress", {"progress": progress[0], "stage": progress[1]}
+                )
+                last_sent = time.monotonic()
+            elif time.monotonic() - last_sent > STREAM_KEEPALIVE_INTERVAL:
+                yield ": keep-alive\n\n"
+                last_sent = time.monotonic()
+
+            job_store.wait(conversion_id, version, STREAM_KEEPALIVE_INTERVAL)
+
+    return Response(
+        stream_with_context(generate(next_index)),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@app.route("/convert/<conversion_id>", methods=["DELETE"])
+def cancel_conversion(conversion_id):
+    """Cancel a conversion and release everything it holds.
+
+    A queued job is removed from the queue and its scratch files are
+    deleted at once. A running job stops before its next page (an isolated
+    worker process is killed); its workspace is deleted right away and its
+    open document is closed by the job. The cancellation is recorded in the
+    job store, so a job queued or running in another server process stops
+    as well and releases its files itself. The job state and any result
+    files are dropped, so later requests for the conversion return 404.
+    """
+    try:
+        entry = job_store.get(conversion_id)
+        if entry is None or entry.get("type") == "batch":
+            return jsonify({"error": "Conversion not found"}), 404
+
+        state, job = get_job_executor().cancel(conversion_id)
+        if state == "queued":
+            source, workspace = job["args"][:2]
+            source.close()
+            workspace.release()
+        elif state == "running":
+            get_workspace_manager().release(conversion_id)
+        cancelled = entry.get("status") not in ("completed", "error")
+        if cancelled:
+            job_store.cancel(conversion_id)
+        release_conversion(conversion_id)
+        if entry.get("batch_id"):
+            refresh_batch(entry["batch_id"])
+
+        logger.info(f"Cancelled conversion {conversion_id} ({entry.get('status')})")
+        return jsonify(
+            {
+                "conversion_id": conversion_id,
+                "cancelled": cancelled,
+                "status": entry.get("status"),
+                "success": True,
+            }
+        )
+
+    except Exception as e:
+        logger.error(f"Cancel error: {str(e)}")
+        return jsonify({"error": f"Cancel error: {str(e)}"}), 500
+
+
+@app.route("/result/<conversion_id>", methods=["GET"])
+def get_result(conversion_id):
+    """Serve the markdown of a finished conversion as ``text/markdown``.
+
+    The body comes straight from the spilled result file, precompressed
+    with the best encoding the client accepts (zstd or gzip). Responses
+    carry a strong ETag per encoding and support conditional and Range
+    requests. ``?variant=preview`` serves the preview of a conversion
+    started with ``preview``.
+    """
+    try:
+        variant = request.args.get("variant")
+        if variant is not None and variant not in RESULT_VARIANTS:
+            return jsonify({"error": f"Unknown result variant '{variant}'"}), 400
+
+        entry = job_store.get(conversion_id)
+        result = (entry or {}).get(variant or "result") or {}
+        name = result_store.name(conversion_id, variant)
+        if not result.get("digest") or not result_store.exists(name):
+            return jsonify({"error": "Result not found"}), 404
+
+        encoding = request.accept_encodings.best_match(
+            result_store.encodings, default="identity"
+        )
+        etag = result["digest"]
+        if encoding != "identity":
+            etag = f"{etag}-{encoding}"
+        response = send_file(
+            result_store.path(name, encoding),
+            mimetype="text/markdown",
+            etag=etag,
+            conditional=True,
+            max_age=0,
+        )
+        if encoding != "identity":
+            response.headers["Content-Encoding"] = encoding
+        response.headers["Vary"] = "Accept-Encoding"
+        return response
+
+    except HTTPException:
+        # E.g. 416 for an unsatisfiable Range, raised by send_file()
+        raise
+    except Exception as e:
+        logger.error(f"Result error: {str(e)}")
+        return jsonify({"error": f"Result error: {str(e)}"}), 500
+
+
 @app.route("/convert-markdown-to-word", methods=["POST"])
 def convert_markdown_to_word():
     """Convert markdown text to Word document."""
@@ -138,6 +1115,38 @@ def convert_markdown_to_word():
         return jsonify({"error": f"Conversion error: {str(e)}"}), 500
 
 
+@app.route("/cache/stats", methods=["GET"])
+def cache_stats():
+    """Get PDF conversion and reference document cache statistics."""
+    return jsonify(
+        {
+            "results": get_cache_stats(),
+            "pages": get_page_cache_stats(),
+            "reference_docs": get_reference_doc_stats(),
+        }
+    )
+
+
+@app.route("/jobs/stats", methods=["GET"])
+def job_stats():
+    """Get queue, workspace, table pre-scan, isolation and pandoc statistics."""
+    return jsonify(
+        {
+            **get_job_executor().stats(),
+            "store": job_store.stats(),
+            "workspaces": get_workspace_manager().stats(),
+            "table_scan": {
+                **get_table_scan_stats(),
+                "active": table_prescan_active(get_pdf_engine()),
+            },
+            "isolation": {
+                "enabled": is_isolation_enabled(),
+                **get_worker_supervisor().stats(),
+            },
+            "pandoc": get_pandoc_pool().stats(),
+        }
+    )
+
 
 @app.route("/version", methods=["GET"])
 def get_version_info():
@@ -161,7 +1170,7 @@ def get_version_info():
 @app.route("/convert-word-to-markdown", methods=["POST"])
 def convert_word_to_markdown_route():
     """Convert DOCX file to markdown."""
-    temp_path = None
+    workspace = None
     try:
         if "document" not in request.files:
             logger.error("No file in request for Word to Markdown conversion")
@@ -179,8 +1188,13 @@ def convert_word_to_markdown_route():
             ), 400
 
         conversion_id = str(uuid.uuid4())
-        temp_filename = f"temp_word_upload_{conversion_id}.docx"
-        temp_path = os.path.join(tempfile.gettempdir(), temp_filename)
+        try:
+            workspace = get_workspace_manager().create(
+                conversion_id, request.content_length
+            )
+        except InsufficientSpaceError:
+            return insufficient_storage_response()
+        temp_path = workspace.file("upload.docx")
         logger.info(f"Saving Word file to {temp_path}")
         file.save(temp_path)
 
@@ -195,14 +1209,8 @@ def convert_word_to_markdown_route():
         logger.error(traceback.format_exc())
         return jsonify({"error": f"Server error: {str(e)}", "success": False}), 500
     finally:
-        if temp_path and os.path.exists(temp_path):
-            try:
-                os.remove(temp_path)
-                logger.info(f"Removed temporary Word upload file: {temp_path}")
-            except Exception as e_clean:
-                logger.error(
-                    f"Error removing temporary file {temp_path}: {str(e_clean)}"
-                )
+        if workspace is not None:
+            workspace.release()
 
 
 @app.route("/", defaults={"path": ""})
@@ -4,6 +4,7 @@ import os
 import sys
 import logging
 import re
+import tempfile
 from flask import Flask
 from flask_cors import CORS
 
@@ -144,10 +145,327 @@ def setup_cors(app):
         response.headers.add(
             "Access-Control-Allow-Methods", "GET,PUT,POST,DELETE,OPTIONS"
         )
-        response.headers.add("Access-Control-Expose-Headers", "Content-Disposition")
+        response.headers.add(
+            "Access-Control-Expose-Headers", "Content-Disposition,Retry-After"
+        )
         return response
 
 
+def get_int_env(name, default, minimum=None):
+    """Read an integer setting from the environment.
+
+    Args:
+        name: Environment variable name
+        default: Value used when the variable is unset or invalid
+        minimum: Optional lower bound for the returned value
+
+    Returns:
+        Integer setting value
+    """
+    try:
+        value = int(os.environ.get(name, default))
+    except (TypeError, ValueError):
+        logger.warning(f"Invalid value for {name}, using default {default}")
+        value = int(default)
+    if minimum is not None and value < minimum:
+        return minimum
+    return value
+
+
+def get_pdf_workers():
+    """Get the number of worker processes for page-parallel PDF conversion.
+
+    ``PDF3MD_PDF_WORKERS=1`` (the default) keeps the serial path,
+    ``0`` uses one worker per CPU core.
+
+    Returns:
+        Number of worker processes
+    """
+    workers = get_int_env("PDF3MD_PDF_WORKERS", 1, minimum=0)
+    if workers == 0:
+        workers = os.cpu_count() or 1
+    return workers
+
+
+def is_isolation_enabled():
+    """Check whether conversions run in recycled worker processes.
+
+    Returns:
+        True if PDF3MD_ISOLATION is set to 1
+    """
+    return os.environ.get("PDF3MD_ISOLATION", "0") == "1"
+
+
+def get_worker_max_jobs():
+    """Get the number of jobs after which a worker process is recycled.
+
+    Returns:
+        Job count
+    """
+    return get_int_env("PDF3MD_WORKER_MAX_JOBS", 50, minimum=1)
+
+
+def get_worker_max_rss_bytes():
+    """Get the resident memory above which a worker process is recycled.
+
+    Returns:
+        Size in bytes
+    """
+    return get_int_env("PDF3MD_WORKER_MAX_RSS_MB", 1024, minimum=64) * 1024 * 1024
+
+
+def get_job_memory_limit_bytes():
+    """Get the address space a job may add to its worker process.
+
+    Returns:
+        Size in bytes, 0 for no limit
+    """
+    return get_int_env("PDF3MD_JOB_MEMORY_LIMIT_MB", 2048, minimum=0) * 1024 * 1024
+
+
+def get_job_cpu_limit():
+    """Get the CPU time a job may use in its worker process.
+
+    Returns:
+        Seconds, 0 for no limit
+    """
+    return get_int_env("PDF3MD_JOB_CPU_LIMIT", 600, minimum=0)
+
+
+def get_parallel_min_pages():
+    """Get the minimum page count for which parallel conversion is used.
+
+    Returns:
+        Page count threshold
+    """
+    return get_int_env("PDF3MD_PARALLEL_MIN_PAGES", 16, minimum=1)
+
+
+def is_cache_enabled():
+    """Check whether the PDF conversion cache is enabled.
+
+    Returns:
+        True unless PDF3MD_CACHE_ENABLED is set to 0
+    """
+    return os.environ.get("PDF3MD_CACHE_ENABLED", "1") == "1"
+
+
+def is_table_prescan_enabled():
+    """Check whether pages are pre-scanned for table rulings.
+
+    Returns:
+        True unless PDF3MD_TABLE_PRESCAN is set to 0
+    """
+    return os.environ.get("PDF3MD_TABLE_PRESCAN", "1") == "1"
+
+
+def get_cache_dir():
+    """Get the directory of the PDF conversion cache.
+
+    Returns:
+        Path to cache directory
+    """
+    return os.environ.get("PDF3MD_CACHE_DIR") or os.path.join(
+        os.path.expanduser("~"), ".pdf3md", "cache"
+    )
+
+
+def get_cache_max_bytes():
+    """Get the size limit of the PDF conversion cache.
+
+    Returns:
+        Maximum cache size in bytes
+    """
+    return get_int_env("PDF3MD_CACHE_MAX_MB", 512, minimum=1) * 1024 * 1024
+
+
+def get_page_cache_max_bytes():
+    """Get the size limit of the per-page conversion cache.
+
+    Returns:
+        Maximum page cache size in bytes
+    """
+    return get_int_env("PDF3MD_PAGE_CACHE_MAX_MB", 256, minimum=1) * 1024 * 1024
+
+
+def get_job_workers():
+    """Get the number of conversion jobs that run concurrently.
+
+    Returns:
+        Number of job worker threads
+    """
+    default = min(4, os.cpu_count() or 1)
+    return get_int_env("PDF3MD_JOB_WORKERS", default, minimum=1)
+
+
+def get_job_queue_size():
+    """Get the number of conversion jobs that may wait for a worker.
+
+    Returns:
+        Maximum queue length
+    """
+    return get_int_env("PDF3MD_JOB_QUEUE_SIZE", 32, minimum=0)
+
+
+def get_job_store_backend():
+    """Get the backend of the job state store.
+
+    ``memory`` keeps job state in the server process, ``sqlite`` shares it
+    between several server processes through a database file.
+
+    Returns:
+        Backend name
+    """
+    backend = os.environ.get("PDF3MD_JOB_STORE", "memory").strip().lower()
+    if backend not in ("memory", "sqlite"):
+        logger.warning(f"Unknown PDF3MD_JOB_STORE '{backend}', using 'memory'")
+        return "memory"
+    return backend
+
+
+def get_job_store_path():
+    """Get the database path of the SQLite job store.
+
+    Returns:
+        Path to database file
+    """
+    return os.environ.get("PDF3MD_JOB_STORE_PATH") or os.path.join(
+        os.path.expanduser("~"), ".pdf3md", "jobs.sqlite3"
+    )
+
+
+def get_job_ttl():
+    """Get how long finished jobs and their results are kept.
+
+    Returns:
+        TTL in seconds
+    """
+    return get_int_env("PDF3MD_JOB_TTL", 600, minimum=5)
+
+
+def get_job_store_max_bytes():
+    """Get the memory budget of the in-process job store.
+
+    Returns:
+        Budget in bytes
+    """
+    return get_int_env("PDF3MD_JOB_STORE_MAX_MB", 256, minimum=1) * 1024 * 1024
+
+
+def get_result_dir():
+    """Get the directory finished conversion results are spilled to.
+
+    Returns:
+        Path to result directory
+    """
+    return os.environ.get("PDF3MD_RESULT_DIR") or os.path.join(
+        tempfile.gettempdir(), "pdf3md-results"
+    )
+
+
+def get_scratch_dir():
+    """Get the root directory of per-job scratch workspaces.
+
+    Point PDF3MD_SCRATCH_DIR at a tmpfs mount to keep uploads off disk.
+
+    Returns:
+        Path to scratch root
+    """
+    return os.environ.get("PDF3MD_SCRATCH_DIR") or os.path.join(
+        tempfile.gettempdir(), "pdf3md-scratch"
+    )
+
+
+def get_scratch_ttl():
+    """Get the age after which orphaned scratch workspaces are removed.
+
+    Returns:
+        TTL in seconds
+    """
+    return get_int_env("PDF3MD_SCRATCH_TTL", 3600, minimum=60)
+
+
+def get_scratch_min_free_bytes():
+    """Get the free space that must remain on the scratch volume.
+
+    Returns:
+        Minimum free space in bytes
+    """
+    return get_int_env("PDF3MD_SCRATCH_MIN_FREE_MB", 256, minimum=0) * 1024 * 1024
+
+
+def get_upload_mode():
+    """Get how uploaded PDFs are held during conversion.
+
+    ``disk`` writes a temp file, ``memory`` keeps the bytes in RAM and
+    ``spool`` memory-maps a temporary spool file.
+
+    Returns:
+        Upload mode name
+    """
+    mode = os.environ.get("PDF3MD_UPLOAD_MODE", "disk").strip().lower()
+    if mode not in ("disk", "memory", "spool"):
+        logger.warning(f"Unknown PDF3MD_UPLOAD_MODE '{mode}', using 'disk'")
+        return "disk"
+    return mode
+
+
+def get_pdf_engine():
+    """Get the default PDF conversion engine.
+
+    ``pymupdf4llm`` runs the full layout analysis, ``fast`` extracts text
+    spans only and suits text-only documents.
+
+    Returns:
+        Engine name
+    """
+    engine = os.environ.get("PDF3MD_PDF_ENGINE", "pymupdf4llm").strip().lower()
+    if engine not in ("pymupdf4llm", "fast"):
+        logger.warning(f"Unknown PDF3MD_PDF_ENGINE '{engine}', using 'pymupdf4llm'")
+        return "pymupdf4llm"
+    return engine
+
+
+def get_pandoc_servers():
+    """Get the number of long-lived ``pandoc server`` processes.
+
+    Servers are opt-in: some pandoc builds accept ``pandoc server`` but
+    never answer requests.
+
+    Returns:
+        Number of servers; 0 (the default) runs every conversion as a
+        pandoc subprocess
+    """
+    return get_int_env("PDF3MD_PANDOC_SERVERS", 0, minimum=0)
+
+
+def get_pandoc_concurrency():
+    """Get the number of pandoc conversions that may run at once.
+
+    Returns:
+        Maximum concurrent pandoc calls
+    """
+    return get_int_env("PDF3MD_PANDOC_CONCURRENCY", 4, minimum=1)
+
+
+def get_pandoc_timeout():
+    """Get the time limit of a single pandoc conversion.
+
+    Returns:
+        Timeout in seconds
+    """
+    return get_int_env("PDF3MD_PANDOC_TIMEOUT", 120, minimum=1)
+
+
+def is_reference_doc_enabled():
+    """Check whether Word exports use per-profile pandoc reference documents.
+
+    Returns:
+        True unless PDF3MD_REFERENCE_DOC is set to 0
+    """
+    return os.environ.get("PDF3MD_REFERENCE_DOC", "1") == "1"
+
+
 def create_app():
     """Create and configure the Flask application.
 
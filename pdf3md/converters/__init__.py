@@ -1,11 +1,54 @@
 """Conversion modules for pdf3md."""
 
-from .pdf_converter import convert_pdf_with_progress, ProgressCapture
+from .pdf_converter import (
+    convert_pdf,
+    convert_pdf_with_progress,
+    build_result,
+    JobProgress,
+    PreviewProgress,
+    ConversionCancelled,
+    ENGINES,
+    table_prescan_active,
+    run_on_document,
+)
+from .table_scan import get_table_scan_stats
+from .options import OptionsError, parse_options, extraction_kwargs, TIERS
+from .result_cache import (
+    make_cache_key,
+    load_cached_result,
+    store_cached_result,
+    get_cache_stats,
+)
+from .page_cache import get_page_cache_stats
+from .pdf_source import PdfSource, UPLOAD_MODES
 from .docx_converter import markdown_to_docx, convert_docx_to_markdown
+from .pandoc_pool import PandocError, run_pandoc, get_pandoc_pool
 
 __all__ = [
+    "convert_pdf",
     "convert_pdf_with_progress",
-    "ProgressCapture",
+    "build_result",
+    "JobProgress",
+    "PreviewProgress",
+    "ConversionCancelled",
+    "ENGINES",
+    "table_prescan_active",
+    "run_on_document",
+    "get_table_scan_stats",
+    "OptionsError",
+    "parse_options",
+    "extraction_kwargs",
+    "TIERS",
+    "make_cache_key",
+    "load_cached_result",
+    "store_cached_result",
+    "get_cache_stats",
+    "get_page_cache_stats",
+    "PdfSource",
+    "UPLOAD_MODES",
     "markdown_to_docx",
     "convert_docx_to_markdown",
+    "PandocError",
+    "run_pandoc",
+    "get_pandoc_pool",
 ]
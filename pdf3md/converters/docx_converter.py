@@ -2,15 +2,18 @@
 
 import os
 import logging
-import tempfile
-import uuid
 from datetime import datetime
 from io import BytesIO
 from typing import Optional
-import pypandoc
 
 from ..utils import ensure_pandoc_available, format_file_size
-from ..formatters import apply_docx_formatting, get_profile_manager
+from ..formatters import (
+    REFERENCE_DOC_NAME,
+    apply_docx_formatting,
+    get_profile_manager,
+    get_reference_doc,
+)
+from .pandoc_pool import run_pandoc
 
 logger = logging.getLogger(__name__)
 
@@ -20,6 +23,10 @@ def markdown_to_docx(
 ):
     """Convert markdown text to a Word document using Pandoc.
 
+    The document never touches the disk: pandoc's output is formatted and
+    saved in memory. Pandoc styles it with the profile's compiled reference
+    document, so the formatting pass only handles what styles cannot express.
+
     Args:
         markdown_text: Markdown text to convert
         filename: Base filename for logging
@@ -28,7 +35,6 @@ def markdown_to_docx(
     Returns:
         BytesIO buffer containing DOCX data
     """
-    temp_docx_path = None
     try:
         ensure_pandoc_available()
 
@@ -46,24 +52,31 @@ def markdown_to_docx(
 
         logger.info(f"Using profile '{profile.get('name', 'default')}' for conversion")
 
-        temp_docx_filename = f"temp_pandoc_output_{uuid.uuid4()}.docx"
-        temp_docx_path = os.path.join(tempfile.gettempdir(), temp_docx_filename)
-
         logger.debug(f"Converting markdown to docx for: {filename}")
 
-        pypandoc.convert_text(
-            markdown_text, "docx", format="md", outputfile=temp_docx_path
-        )
+        reference = get_reference_doc(profile)
+        if reference is not None:
+            docx_bytes = run_pandoc(
+                "markdown",
+                "docx",
+                text=markdown_text,
+                options={"reference-doc": REFERENCE_DOC_NAME},
+                files={REFERENCE_DOC_NAME: reference},
+            )
+        else:
+            docx_bytes = run_pandoc("markdown", "docx", text=markdown_text)
 
+        doc_buffer = BytesIO()
         try:
-            apply_docx_formatting(temp_docx_path, profile)
+            apply_docx_formatting(
+                BytesIO(docx_bytes),
+                profile,
+                output=doc_buffer,
+                styles_applied=reference is not None,
+            )
         except Exception as format_error:
             logger.warning(f"Post-processing DOCX formatting failed: {format_error}")
-
-        with open(temp_docx_path, "rb") as f:
-            output_docx_bytes = f.read()
-
-        doc_buffer = BytesIO(output_docx_bytes)
+            doc_buffer = BytesIO(docx_bytes)
         doc_buffer.seek(0)
 
         logger.info(f"Successfully converted markdown to docx for {filename}")
@@ -77,16 +90,6 @@ def markdown_to_docx(
     except Exception as e:
         logger.error(f"Error converting markdown to docx using Pandoc: {str(e)}")
         raise e
-    finally:
-        if temp_docx_path and os.path.exists(temp_docx_path):
-            try:
-                os.remove(temp_docx_path)
-                logger.debug(f"Removed temporary pandoc output file: {temp_docx_path}")
-            except Exception as e_clean:
-                logger.error(
-                    f"Error removing temporary file {temp_docx_path}: {str(e_clean)}"
-                )
-
 
 
 def convert_docx_to_markdown(docx_path, original_filename):
@@ -103,9 +106,9 @@ def convert_docx_to_markdown(docx_path, original_filename):
         ensure_pandoc_available()
         logger.debug(f"Converting DOCX to markdown for: {original_filename}")
 
-        markdown_output = pypandoc.convert_file(
-            docx_path, "markdown_strict", format="docx"
-        )
+        markdown_output = run_pandoc(
+            "docx", "markdown_strict", input_path=docx_path
+        ).decode("utf-8")
 
         logger.info(f"Successfully converted DOCX to markdown for {original_filename}")
 
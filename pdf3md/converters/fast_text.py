@@ -0,0 +1,248 @@
+"""Fast markdown extraction for text-only PDFs.
+
+The ``fast`` engine skips the layout analysis of pymupdf4llm (tables,
+images, vector graphics, columns) and works on text spans only. Lines are
+turned into NumPy arrays of bounding boxes and font sizes, and headings and
+paragraph breaks are detected with vectorized comparisons over them.
+"""
+
+from typing import Dict, List, Optional
+
+import numpy as np
+import pymupdf
+
+# Keep whitespace and ligatures as in the PDF; skip images entirely
+TEXT_FLAGS = (
+    pymupdf.TEXT_PRESERVE_WHITESPACE
+    | pymupdf.TEXT_PRESERVE_LIGATURES
+    | pymupdf.TEXT_MEDIABOX_CLIP
+)
+
+# Heading levels assigned to font sizes above the body text size
+MAX_HEADER_LEVELS = 6
+# Font sizes must exceed the body size by this many points to be headings
+HEADER_MIN_DELTA = 1
+
+# Vertical gap, in median line heights, that starts a new paragraph
+PARAGRAPH_GAP = 0.6
+# Vertical offset, in median line heights, below which two lines share a row
+SAME_ROW = 0.3
+# Horizontal gap, in font sizes, between spans that stands for a space
+WORD_GAP = 0.15
+
+BULLETS = ("•", "·", "◦", "▪", "▫", "‣", "⁃", "●", "○", "■", "□", "▸", "►")
+# Dashes also occur in running text; they only count as bullets followed by
+# a space on a line that starts at the left edge of its block
+DASH_BULLETS = ("–",)
+# Tolerance, in points, of the left edge of a block
+MARGIN_TOLERANCE = 1
+
+# pymupdf span flags
+FLAG_ITALIC = 2
+FLAG_MONO = 8
+FLAG_BOLD = 16
+
+
+class FontSizeHeaders:
+    """Maps font sizes to markdown heading levels.
+
+    The body size is the size carrying the most characters; larger sizes
+    become heading levels, the largest being ``#``. Instances are plain
+    data and can be passed to worker processes.
+    """
+
+    def __init__(self, doc, pages=None, max_levels=MAX_HEADER_LEVELS):
+        """Collect font-size statistics.
+
+        Args:
+            doc: Open pymupdf.Document
+            pages: Optional 0-based pages the statistics are limited to
+            max_levels: Maximum number of heading levels
+        """
+        sizes = []
+        counts = []
+        for pno in pages if pages is not None else range(len(doc)):
+            for block in doc[pno].get_text("dict", flags=TEXT_FLAGS)["blocks"]:
+                for line in block.get("lines", ()):
+                    for span in line["spans"]:
+                        chars = len(span["text"].strip())
+                        if chars:
+                            sizes.append(span["size"])
+                            counts.append(chars)
+
+        self.body_size = 0
+        self.header_id: Dict[int, str] = {}
+        if not sizes:
+            return
+
+        unique, inverse = np.unique(np.rint(sizes).astype(int), return_inverse=True)
+        weights = np.bincount(inverse, weights=counts)
+        self.body_size = int(unique[np.argmax(weights)])
+        larger = unique[unique >= self.body_size + HEADER_MIN_DELTA][::-1]
+        self.header_id = {
+            int(size): "#" * level + " "
+            for level, size in enumerate(larger[:max_levels], start=1)
+        }
+
+    def levels(self, sizes: np.ndarray) -> np.ndarray:
+        """Get the heading level of each font size.
+
+        Args:
+            sizes: Array of font sizes
+
+        Returns:
+            Integer array of heading levels, 0 for body text
+        """
+        rounded = np.rint(sizes).astype(int)
+        levels = np.zeros(len(rounded), dtype=int)
+        for size, prefix in self.header_id.items():
+            levels[rounded == size] = len(prefix) - 1
+        return levels
+
+
+def _span_style(span) -> tuple:
+    flags = span["flags"]
+    font = span["font"].lower()
+    bold = bool(flags & FLAG_BOLD) or "bold" in font
+    italic = bool(flags & FLAG_ITALIC) or "italic" in font or "oblique" in font
+    mono = bool(flags & FLAG_MONO)
+    return bold, italic, mono
+
+
+def _format_run(text: str, style: tuple) -> str:
+    bold, italic, mono = style
+    core = text.strip()
+    if not core:
+        return text
+    if mono:
+        core = f"`{core}`"
+    else:
+        if italic:
+            core = f"_{core}_"
+        if bold:
+            core = f"**{core}**"
+    # Markers hug the text; surrounding whitespace stays outside of them
+    lead = text[: len(text) - len(text.lstrip())]
+    trail = text[len(text.rstrip()) :]
+    return lead + core + trail
+
+
+def _strip_bullet(spans, at_margin):
+    """Remove a list bullet from the raw spans of a line.
+
+    Args:
+        spans: Non-blank spans of the line
+        at_margin: Whether the line starts at the left edge of its block
+
+    Returns:
+        Tuple of (remaining spans, whether the line starts with a bullet)
+    """
+    text = spans[0]["text"].lstrip()
+    bullet = text.startswith(BULLETS) or (
+        at_margin
+        and text.startswith(DASH_BULLETS)
+        # A dash alone in its span is followed by the text of the next span
+        and (text[1:2].isspace() or (len(text) == 1 and len(spans) > 1))
+    )
+    if not bullet:
+        return spans, False
+    rest = text[1:].lstrip()
+    return ([{**spans[0], "text": rest}] if rest else []) + spans[1:], True
+
+
+def _line_markdown(spans) -> str:
+    runs = []
+    previous = None
+    for span in spans:
+        text = span["text"]
+        if (
+            previous is not None
+            and span["bbox"][0] - previous["bbox"][2] > WORD_GAP * span["size"]
+            and not previous["text"][-1:].isspace()
+            and not text[:1].isspace()
+        ):
+            text = " " + text
+        previous = span
+        style = _span_style(span)
+        if runs and runs[-1][1] == style:
+            runs[-1][0] += text
+        else:
+            runs.append([text, style])
+    return "".join(_format_run(text, style) for text, style in runs).strip()
+
+
+def _extract_lines(page):
+    boxes = []
+    sizes = []
+    blocks = []
+    bullets = []
+    texts = []
+    for bno, block in enumerate(page.get_text("dict", flags=TEXT_FLAGS)["blocks"]):
+        for line in block.get("lines", ()):
+            spans = [span for span in line["spans"] if span["text"].strip()]
+            if not spans:
+                continue
+            boxes.append(line["bbox"])
+            sizes.append(max(span["size"] for span in spans))
+            blocks.append(bno)
+            # Bullets are removed before markup is added around the spans
+            spans, bullet = _strip_bullet(
+                spans, line["bbox"][0] <= block["bbox"][0] + MARGIN_TOLERANCE
+            )
+            bullets.append(bullet)
+            texts.append(_line_markdown(spans))
+    return (
+        np.asarray(boxes, dtype=float).reshape(-1, 4),
+        np.asarray(sizes, dtype=float),
+        np.asarray(blocks, dtype=int),
+        np.asarray(bullets, dtype=bool),
+        texts,
+    )
+
+
+def page_to_markdown(page, headers: Optional[FontSizeHeaders]) -> str:
+    """Convert the text of one page to markdown.
+
+    Args:
+        page: pymupdf.Page
+        headers: FontSizeHeaders of the document, or None for no headings
+
+    Returns:
+        Markdown text of the page
+    """
+    boxes, sizes, blocks, bullets, texts = _extract_lines(page)
+    if not texts:
+        return ""
+
+    if headers is not None:
+        levels = headers.levels(sizes)
+    else:
+        levels = np.zeros(len(texts), dtype=int)
+    heights = boxes[:, 3] - boxes[:, 1]
+    body = heights[levels == 0]
+    line_height = float(np.median(body if len(body) else heights)) or 1.0
+
+    # Relations between each line and its predecessor
+    gap = boxes[1:, 1] - boxes[:-1, 3]
+    same_row = (np.abs(boxes[1:, 1] - boxes[:-1, 1]) < SAME_ROW * line_height) & (
+        boxes[1:, 0] >= boxes[:-1, 2] - 1
+    )
+    breaks = ~same_row & (
+        (blocks[1:] != blocks[:-1])
+        | (levels[1:] != levels[:-1])
+        | bullets[1:]
+        | (gap > PARAGRAPH_GAP * line_height)
+        | (gap < -line_height)
+    )
+    starts = np.concatenate(([0], np.flatnonzero(breaks) + 1, [len(texts)]))
+
+    paragraphs: List[str] = []
+    for first, end in zip(starts[:-1], starts[1:]):
+        text = " ".join(filter(None, texts[first:end]))
+        level = int(levels[first])
+        if level:
+            text = "#" * level + " " + text
+        elif bullets[first]:
+            text = "- " + text
+        paragraphs.append(text)
+    return "\n\n".join(paragraphs) + "\n\n"
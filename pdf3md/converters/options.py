@@ -0,0 +1,132 @@
+"""Validated pymupdf4llm extraction options and named cost tiers."""
+
+import json
+from typing import Any, Dict, Optional
+
+import pymupdf4llm
+
+
+class OptionsError(ValueError):
+    """Raised for unknown tiers, unknown options or invalid option values."""
+
+
+# Allowed values of each option; ``bool`` accepts true/false only
+OPTION_VALUES = {
+    "table_strategy": ("lines_strict", "lines", "text", None),
+    "ignore_images": bool,
+    "ignore_graphics": bool,
+    "detect_bg_color": bool,
+    "ignore_code": bool,
+    "force_text": bool,
+    "use_ocr": bool,
+}
+
+# pymupdf4llm defaults, i.e. what a call without options does
+DEFAULT_OPTIONS = {
+    "table_strategy": "lines_strict",
+    "ignore_images": False,
+    "ignore_graphics": False,
+    "detect_bg_color": True,
+    "ignore_code": False,
+    "force_text": True,
+    "use_ocr": True,
+}
+
+# Options understood by each pymupdf4llm code path
+CLASSIC_OPTIONS = (
+    "table_strategy",
+    "ignore_images",
+    "ignore_graphics",
+    "detect_bg_color",
+    "ignore_code",
+    "force_text",
+)
+LAYOUT_OPTIONS = ("ignore_code", "force_text", "use_ocr")
+
+# Named tiers, from cheapest to most thorough, as overrides of the defaults
+TIERS = {
+    "fast": {
+        "table_strategy": None,
+        "ignore_images": True,
+        "ignore_graphics": True,
+        "detect_bg_color": False,
+        "use_ocr": False,
+    },
+    "balanced": {
+        "ignore_images": True,
+        "use_ocr": False,
+    },
+    "full": {},
+}
+DEFAULT_TIER = "full"
+
+
+def uses_layout() -> bool:
+    """Check whether pymupdf4llm runs in layout mode.
+
+    Layout mode has no IdentifyHeaders and ignores the options of the
+    classic code path, such as the table strategy.
+
+    Returns:
+        True in layout mode
+    """
+    return not hasattr(pymupdf4llm, "IdentifyHeaders")
+
+
+def parse_options(tier: Optional[str] = None, options=None) -> Dict[str, Any]:
+    """Resolve a tier and explicit options into effective extraction options.
+
+    Args:
+        tier: Optional tier name, one of TIERS; defaults to DEFAULT_TIER
+        options: Optional overrides as a dict or JSON object string. A
+            ``tier`` key inside the object is used when no tier is given.
+
+    Returns:
+        Effective options for the active pymupdf4llm code path, with ``tier``
+
+    Raises:
+        OptionsError: If the tier, an option name or a value is invalid
+    """
+    if isinstance(options, str):
+        try:
+            options = json.loads(options) if options.strip() else None
+        except ValueError as e:
+            raise OptionsError(f"options is not valid JSON: {e}") from None
+    if options is not None and not isinstance(options, dict):
+        raise OptionsError("options must be a JSON object")
+    options = dict(options or {})
+    tier = tier or options.pop("tier", None) or DEFAULT_TIER
+    options.pop("tier", None)
+    if tier not in TIERS:
+        raise OptionsError(f"Unknown tier '{tier}', use one of {', '.join(TIERS)}")
+
+    for name, value in options.items():
+        allowed = OPTION_VALUES.get(name)
+        if allowed is None:
+            raise OptionsError(f"Unknown option '{name}'")
+        if allowed is bool:
+            valid = isinstance(value, bool)
+        else:
+            valid = value in allowed
+        if not valid:
+            raise OptionsError(f"Invalid value {value!r} for option '{name}'")
+
+    resolved = {**DEFAULT_OPTIONS, **TIERS[tier], **options}
+    names = LAYOUT_OPTIONS if uses_layout() else CLASSIC_OPTIONS
+    return {"tier": tier, **{name: resolved[name] for name in names}}
+
+
+def extraction_kwargs(options: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """Get the pymupdf4llm.to_markdown() arguments of effective options.
+
+    Args:
+        options: Options from parse_options(), or None for the defaults
+
+    Returns:
+        Keyword arguments that differ from the pymupdf4llm defaults
+    """
+    return {
+        name: value
+        for name, value in (options or {}).items()
+        if name in DEFAULT_OPTIONS and value != DEFAULT_OPTIONS[name]
+    }
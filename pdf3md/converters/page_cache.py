@@ -0,0 +1,149 @@
+"""Per-page cache for incremental re-conversion of revised PDFs."""
+
+import os
+import json
+import hashlib
+import logging
+from threading import Lock
+from typing import Any, Dict, Optional
+
+from ..config import is_cache_enabled, get_cache_dir, get_page_cache_max_bytes
+from ..utils import DiskCache
+from .result_cache import library_versions
+
+logger = logging.getLogger(__name__)
+
+# Bump when the conversion of a single page changes what it produces
+PAGE_CACHE_VERSION = 2
+
+_page_cache = None
+_page_cache_lock = Lock()
+
+
+def get_page_cache() -> Optional[DiskCache]:
+    """Get the global per-page markdown cache.
+
+    Returns:
+        DiskCache instance, or None if caching is disabled
+    """
+    global _page_cache
+    if not is_cache_enabled():
+        return None
+    with _page_cache_lock:
+        if _page_cache is None:
+            _page_cache = DiskCache(
+                os.path.join(get_cache_dir(), "pages"), get_page_cache_max_bytes()
+            )
+        return _page_cache
+
+
+def page_fingerprint(doc, page) -> str:
+    """Fingerprint everything on a page that influences its markdown.
+
+    Covers the content stream, referenced form XObjects, fonts, image
+    digests, links, geometry and rotation. Object numbers (xrefs) are
+    deliberately left out since they shift between revisions of a document.
+
+    Args:
+        doc: Open pymupdf.Document
+        page: pymupdf.Page of that document
+
+    Returns:
+        SHA-256 hex digest of the page
+    """
+    hasher = hashlib.sha256()
+    hasher.update(page.read_contents())
+
+    for xref, name, _invoker, _bbox in page.get_xobjects():
+        hasher.update(name.encode("utf-8"))
+        hasher.update(doc.xref_stream_raw(xref) or b"")
+
+    fonts = [font[1:6] for font in page.get_fonts()]
+    images = [
+        (info["digest"].hex(), [round(v, 1) for v in info["bbox"]])
+        for info in page.get_image_info(hashes=True)
+    ]
+    links = [
+        (link.get("uri"), link.get("page"), [round(v, 1) for v in link["from"]])
+        for link in page.get_links()
+    ]
+    meta = {
+        "rect": [round(v, 1) for v in page.rect],
+        "rotation": page.rotation,
+        "fonts": fonts,
+        "images": images,
+        "links": links,
+    }
+    hasher.update(json.dumps(meta, sort_keys=True, default=str).encode("utf-8"))
+    return hasher.hexdigest()
+
+
+def make_page_cache_key(
+    doc, page, hdr_info, options: Optional[Dict[str, Any]] = None
+) -> str:
+    """Build the cache key of a single page.
+
+    Heading levels are derived from the whole document, so the header
+    mapping is part of the key: a page whose content did not change still
+    converts differently if a revision shifted the document's font sizes.
+
+    Args:
+        doc: Open pymupdf.Document
+        page: pymupdf.Page of that document
+        hdr_info: Header info computed by identify_headers()
+        options: Conversion options affecting the output
+
+    Returns:
+        Hex digest used as cache key
+    """
+    header_ids = getattr(hdr_info, "header_id", None) or {}
+    payload = {
+        "version": PAGE_CACHE_VERSION,
+        "page": page_fingerprint(doc, page),
+        "headers": sorted(header_ids.items()),
+        "options": options or {},
+        **library_versions(),
+    }
+    encoded = json.dumps(payload, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()
+
+
+def load_cached_page(page_key: str) -> Optional[str]:
+    """Look up the markdown of a page.
+
+    Args:
+        page_key: Key from make_page_cache_key()
+
+    Returns:
+        Markdown text, or None on a miss
+    """
+    cache = get_page_cache()
+    if cache is None:
+        return None
+    data = cache.get(page_key)
+    return data.decode("utf-8") if data is not None else None
+
+
+def store_cached_page(page_key: str, markdown: str):
+    """Store the markdown of a page.
+
+    Args:
+        page_key: Key from make_page_cache_key()
+        markdown: Markdown text of the page
+    """
+    cache = get_page_cache()
+    if cache is None:
+        return
+    cache.put(page_key, markdown.encode("utf-8"))
+
+
+def get_page_cache_stats() -> Dict[str, Any]:
+    """Get hit/miss counters of the page cache.
+
+    Returns:
+        Cache statistics, or ``{"enabled": False}``
+    """
+    cache = get_page_cache()
+    if cache is None:
+        return {"enabled": False}
+    return {"enabled": True, **cache.stats()}
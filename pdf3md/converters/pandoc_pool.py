@@ -0,0 +1,579 @@
+"""Pandoc execution through a pool of long-lived ``pandoc server`` processes.
+
+Every pypandoc call forks pandoc, and the process start plus Haskell runtime
+initialization dominate the latency of small documents. The pool keeps local
+``pandoc server`` instances (pandoc 3+) running and reaches them over
+kept-alive HTTP connections. When no server can be started, conversions run
+a pandoc subprocess instead.
+"""
+
+import os
+import json
+import time
+import atexit
+import base64
+import socket
+import logging
+import tempfile
+import subprocess
+import http.client
+from itertools import count
+from threading import BoundedSemaphore, Lock, Thread
+from typing import Any, Dict, Optional
+
+import pypandoc
+
+from ..config import get_pandoc_servers, get_pandoc_concurrency, get_pandoc_timeout
+
+logger = logging.getLogger(__name__)
+
+# Formats pandoc reads and writes as zip archives; they travel base64-encoded
+BINARY_FORMATS = ("docx", "odt", "epub", "epub2", "epub3", "pptx")
+
+# Seconds a starting server gets to answer its first request; a pandoc
+# whose server does not answer by then is not waited for any longer
+STARTUP_TIMEOUT = 1
+# Seconds between readiness probes of a starting server
+STARTUP_POLL_INTERVAL = 0.05
+# Seconds after a failed start before servers are tried again
+RETRY_INTERVAL = 60
+# Seconds a stopping server gets before it is killed
+STOP_TIMEOUT = 5
+
+
+class PandocError(RuntimeError):
+    """Raised when pandoc rejects a document or exceeds its time limit."""
+
+
+def _option_args(options):
+    args = []
+    for name, value in (options or {}).items():
+        if value is True:
+            args.append(f"--{name}")
+        elif value is not None and value is not False:
+            args.append(f"--{name}={value}")
+    return args
+
+
+def _run_command(command, data=None, timeout=None, cwd=None) -> bytes:
+    try:
+        completed = subprocess.run(
+            command, input=data, capture_output=True, timeout=timeout, cwd=cwd
+        )
+    except subprocess.TimeoutExpired:
+        raise PandocError(f"Pandoc timed out after {timeout}s") from None
+    if completed.returncode != 0:
+        message = completed.stderr.decode("utf-8", "replace").strip()
+        raise PandocError(message or f"Pandoc exited with code {completed.returncode}")
+    return completed.stdout
+
+
+def run_pandoc_subprocess(
+    executable,
+    from_format,
+    to_format,
+    text=None,
+    input_path=None,
+    options=None,
+    timeout=None,
+    files=None,
+) -> bytes:
+    """Convert a document with a one-off pandoc process.
+
+    Args:
+        executable: Path of the pandoc executable
+        from_format: Pandoc input format
+        to_format: Pandoc output format
+        text: Document as str or bytes, if no input_path is given
+        input_path: Path of the input file
+        options: Pandoc long options without leading dashes; True stands
+            for a flag
+        timeout: Seconds after which the process is killed
+        files: Optional {relative path: bytes} of files options refer to,
+            e.g. a reference document. They are written to a temporary
+            directory pandoc runs in.
+
+    Returns:
+        Output document as bytes
+
+    Raises:
+        PandocError: If pandoc fails or times out
+    """
+    command = [
+        executable,
+        f"--from={from_format}",
+        f"--to={to_format}",
+        "--output=-",
+        *_option_args(options),
+    ]
+    if input_path is not None:
+        command.append(os.path.abspath(input_path))
+    elif isinstance(text, str):
+        text = text.encode("utf-8")
+    data = text if input_path is None else None
+    if not files:
+        return _run_command(command, data, timeout)
+
+    with tempfile.TemporaryDirectory(prefix="pdf3md-pandoc-") as workdir:
+        for name, content in files.items():
+            path = os.path.join(workdir, name)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "wb") as f:
+                f.write(content)
+        return _run_command(command, data, timeout, cwd=workdir)
+
+
+def pandoc_data_file(name: str) -> bytes:
+    """Read one of pandoc's default data files.
+
+    Args:
+        name: Data file name, e.g. ``reference.docx``
+
+    Returns:
+        File content
+
+    Raises:
+        PandocError: If pandoc fails or times out
+        OSError: If pandoc cannot be executed
+    """
+    command = [pypandoc.get_pandoc_path(), f"--print-default-data-file={name}"]
+    return _run_command(command, timeout=get_pandoc_timeout())
+
+
+def _free_port() -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class PandocServer:
+    """One ``pandoc server`` process and its idle keep-alive connections."""
+
+    def __init__(self, executable: str, timeout: int):
+        """Initialize the server. It is started by start().
+
+        Args:
+            executable: Path of the pandoc executable
+            timeout: Seconds a conversion may take, enforced by the server
+                and on the HTTP connection
+        """
+        self.executable = executable
+        self.timeout = timeout
+        self.process = None
+        self.port = None
+        # Set by PandocPool while one caller starts or restarts the process
+        self.starting = False
+        self._idle = []
+        self._lock = Lock()
+
+    def start(self):
+        """Start the server process and wait until it answers.
+
+        Raises:
+            PandocError: If the server exits or does not answer in time
+            OSError: If pandoc cannot be executed
+        """
+        self.port = _free_port()
+        process = self.process = subprocess.Popen(
+            [
+                self.executable,
+                "server",
+                f"--port={self.port}",
+                f"--timeout={self.timeout}",
+            ],
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        deadline = time.monotonic() + STARTUP_TIMEOUT
+        while time.monotonic() < deadline:
+            if self.process is not process:
+                raise PandocError("pandoc server was stopped while starting")
+            exitcode = process.poll()
+            if exitcode is not None:
+                # pandoc before 3.0 has no server and exits at once
+                self.process = None
+                raise PandocError(f"pandoc server exited with code {exitcode}")
+            conn = http.client.HTTPConnection(
+                "127.0.0.1",
+                self.port,
+                timeout=max(STARTUP_POLL_INTERVAL, deadline - time.monotonic()),
+            )
+            try:
+                conn.request("GET", "/version")
+                response = conn.getresponse()
+                version = response.read().decode("utf-8", "replace").strip()
+                if response.status == 200:
+                    logger.info(
+                        f"Started pandoc server {version} on port {self.port} "
+                        f"(PID {process.pid})"
+                    )
+                    return
+            except OSError:
+                pass
+            finally:
+                conn.close()
+            time.sleep(STARTUP_POLL_INTERVAL)
+        self.stop()
+        raise PandocError(f"pandoc server did not start within {STARTUP_TIMEOUT}s")
+
+    def alive(self) -> bool:
+        """Check whether the server process is running."""
+        return self.process is not None and self.process.poll() is None
+
+    def _connect(self):
+        # Leave the server room to answer its own timeout first
+        return http.client.HTTPConnection(
+            "127.0.0.1", self.port, timeout=self.timeout + 5
+        )
+
+    def _send(self, conn, body):
+        try:
+            conn.request(
+                "POST",
+                "/",
+                body=body,
+                headers={
+                    "Content-Type": "application/json",
+                    "Accept": "application/json",
+                },
+            )
+            response = conn.getresponse()
+            data = response.read()
+        except BaseException:
+            conn.close()
+            raise
+        if response.will_close:
+            conn.close()
+        else:
+            with self._lock:
+                self._idle.append(conn)
+        return response.status, data
+
+    def post(self, payload: Dict[str, Any]):
+        """Send a conversion request over a pooled keep-alive connection.
+
+        Args:
+            payload: JSON request body
+
+        Returns:
+            Tuple of (HTTP status, response body)
+
+        Raises:
+            OSError: If the connection fails
+            http.client.HTTPException: If the response is malformed
+        """
+        body = json.dumps(payload).encode("utf-8")
+        with self._lock:
+            conn = self._idle.pop() if self._idle else None
+        if conn is not None:
+            try:
+                return self._send(conn, body)
+            except ConnectionError:
+                # The server closed the idle connection; retry on a new one
+                pass
+        return self._send(self._connect(), body)
+
+    def stop(self):
+        """Close idle connections and stop the server process."""
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for conn in idle:
+            conn.close()
+        if self.process is None:
+            return
+        self.process.terminate()
+        try:
+            self.process.wait(STOP_TIMEOUT)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+            self.process.wait()
+        self.process = None
+
+
+class PandocPool:
+    """Runs pandoc conversions on pooled servers with a subprocess fallback.
+
+    Servers are started in the background on first use and restarted when
+    they die; until a server answers, conversions run as subprocesses, so
+    no request waits for a server to start. If servers cannot be started,
+    e.g. with pandoc older than 3.0, starting is retried after
+    RETRY_INTERVAL seconds.
+    Servers and subprocesses share one concurrency limit.
+    """
+
+    def __init__(self, servers: int, concurrency: int, timeout: int):
+        """Initialize the pool.
+
+        Args:
+            servers: Number of server processes, 0 for subprocesses only
+            concurrency: Number of conversions that may run at once
+            timeout: Seconds a conversion may take
+        """
+        self.size = servers
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self._servers = []
+        self._next = count()
+        self._retry_at = 0.0
+        self._lock = Lock()
+        self._slots = BoundedSemaphore(concurrency)
+        self._counters = {
+            "server_calls": 0,
+            "subprocess_calls": 0,
+            "server_restarts": 0,
+            "server_failures": 0,
+        }
+
+    def _count(self, name):
+        with self._lock:
+            self._counters[name] += 1
+
+    def _disable(self, error):
+        """Stop all servers and use subprocesses for RETRY_INTERVAL seconds."""
+        logger.warning(
+            f"pandoc server unavailable, using subprocesses for "
+            f"{RETRY_INTERVAL}s: {error}"
+        )
+        with self._lock:
+            servers, self._servers = self._servers, []
+            self._retry_at = time.monotonic() + RETRY_INTERVAL
+        for server in servers:
+            server.stop()
+
+    def _start(self, server, restart):
+        """Start or restart a server claimed by _server(). Runs in a thread."""
+        try:
+            if restart:
+                logger.warning(f"pandoc server on port {server.port} died")
+                server.stop()
+            server.start()
+        except (OSError, PandocError) as e:
+            with self._lock:
+                # Servers stopped by a failed start elsewhere are gone already
+                current = server in self._servers
+            if current:
+                self._disable(e)
+        finally:
+            with self._lock:
+                server.starting = False
+
+    def _server(self) -> Optional[PandocServer]:
+        """Get the next running server, or None to use a subprocess.
+
+        The pool lock is only held to pick a server and claim its start. A
+        server that is not running is started in a background thread, and
+        callers use a subprocess until it answers.
+        """
+        with self._lock:
+            if not self.size or time.monotonic() < self._retry_at:
+                return None
+            create = not self._servers
+        if create:
+            try:
+                executable = pypandoc.get_pandoc_path()
+            except OSError as e:
+                self._disable(e)
+                return None
+            with self._lock:
+                if not self._servers:
+                    self._servers = [
+                        PandocServer(executable, self.timeout)
+                        for _ in range(self.size)
+                    ]
+
+        with self._lock:
+            if not self._servers:
+                # Disabled by a failed start in another thread
+                return None
+            server = self._servers[next(self._next) % len(self._servers)]
+            if server.starting:
+                return None
+            if server.alive():
+                return server
+            server.starting = True
+            restart = server.port is not None
+            if restart:
+                self._counters["server_restarts"] += 1
+
+        Thread(
+            target=self._start,
+            args=(server, restart),
+            name="pdf3md-pandoc-start",
+            daemon=True,
+        ).start()
+        return None
+
+    def _convert_on_server(
+        self, server, from_format, to_format, text, input_path, options, files
+    ):
+        if input_path is not None:
+            with open(input_path, "rb") as f:
+                text = f.read()
+        if from_format in BINARY_FORMATS:
+            if isinstance(text, str):
+                text = text.encode("utf-8")
+            text = base64.b64encode(text).decode("ascii")
+        elif isinstance(text, bytes):
+            text = text.decode("utf-8")
+
+        payload = {"from": from_format, "to": to_format, "text": text}
+        payload.update(options or {})
+        if files:
+            payload["files"] = {
+                name: base64.b64encode(content).decode("ascii")
+                for name, content in files.items()
+            }
+        status, body = server.post(payload)
+        if status != 200:
+            message = body.decode("utf-8", "replace").strip()
+            try:
+                message = json.loads(message).get("error") or message
+            except (ValueError, AttributeError):
+                pass
+            raise PandocError(message or f"pandoc server returned HTTP {status}")
+
+        result = json.loads(body)
+        output = result["output"]
+        if result.get("base64"):
+            return base64.b64decode(output)
+        return output.encode("utf-8")
+
+    def convert(
+        self,
+        from_format: str,
+        to_format: str,
+        text=None,
+        input_path: Optional[str] = None,
+        options: Optional[Dict[str, Any]] = None,
+        files: Optional[Dict[str, bytes]] = None,
+    ) -> bytes:
+        """Convert a document with pandoc.
+
+        Args:
+            from_format: Pandoc input format
+            to_format: Pandoc output format
+            text: Document as str or bytes, if no input_path is given
+            input_path: Path of the input file
+            options: Pandoc long options without leading dashes, as
+                accepted by both the command line and the server API
+            files: Optional {relative path: bytes} of files options refer
+                to, such as ``reference-doc``; sent in the server request
+                or written next to a subprocess
+
+        Returns:
+            Output document as bytes
+
+        Raises:
+            PandocError: If pandoc fails, times out or no slot frees up
+                within the timeout
+        """
+        if not self._slots.acquire(timeout=self.timeout):
+            raise PandocError("Pandoc is busy, please retry later")
+        try:
+            server = self._server()
+            if server is not None:
+                try:
+                    output = self._convert_on_server(
+                        server,
+                        from_format,
+                        to_format,
+                        text,
+                        input_path,
+                        options,
+                        files,
+                    )
+                    self._count("server_calls")
+                    return output
+                except socket.timeout:
+                    raise PandocError(
+                        f"Pandoc timed out after {self.timeout}s"
+                    ) from None
+                except (OSError, http.client.HTTPException, ValueError, KeyError) as e:
+                    self._count("server_failures")
+                    logger.warning(
+                        f"pandoc server on port {server.port} failed, "
+                        f"using a subprocess: {e}"
+                    )
+
+            self._count("subprocess_calls")
+            return run_pandoc_subprocess(
+                pypandoc.get_pandoc_path(),
+                from_format,
+                to_format,
+                text,
+                input_path,
+                options,
+                self.timeout,
+                files,
+            )
+        finally:
+            self._slots.release()
+
+    def stop(self):
+        """Stop all server processes."""
+        with self._lock:
+            servers, self._servers = self._servers, []
+        for server in servers:
+            server.stop()
+
+    def stats(self):
+        """Get pool counters.
+
+        Returns:
+            Dictionary with configuration, live servers and call counters
+        """
+        with self._lock:
+            return {
+                "servers": self.size,
+                "servers_alive": sum(server.alive() for server in self._servers),
+                "concurrency": self.concurrency,
+                "timeout_seconds": self.timeout,
+                **self._counters,
+            }
+
+
+_pandoc_pool = None
+_pandoc_pool_lock = Lock()
+
+
+def get_pandoc_pool() -> PandocPool:
+    """Get the global pandoc pool instance.
+
+    Returns:
+        PandocPool instance
+    """
+    global _pandoc_pool
+    with _pandoc_pool_lock:
+        if _pandoc_pool is None:
+            _pandoc_pool = PandocPool(
+                get_pandoc_servers(), get_pandoc_concurrency(), get_pandoc_timeout()
+            )
+            atexit.register(_pandoc_pool.stop)
+        return _pandoc_pool
+
+
+def run_pandoc(
+    from_format: str,
+    to_format: str,
+    text=None,
+    input_path: Optional[str] = None,
+    options: Optional[Dict[str, Any]] = None,
+    files: Optional[Dict[str, bytes]] = None,
+) -> bytes:
+    """Convert a document with the global pandoc pool.
+
+    Args:
+        from_format: Pandoc input format
+        to_format: Pandoc output format
+        text: Document as str or bytes, if no input_path is given
+        input_path: Path of the input file
+        options: Pandoc long options without leading dashes
+        files: Optional {relative path: bytes} of files options refer to
+
+    Returns:
+        Output document as bytes
+    """
+    return get_pandoc_pool().convert(
+        from_format, to_format, text, input_path, options, files
+    )
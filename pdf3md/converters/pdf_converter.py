@@ -1,143 +1,987 @@
 """PDF to Markdown conversion."""
 
-import os
 import sys
-import re
 import time
+import math
 import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
 from datetime import datetime
+from threading import Lock
 import pymupdf
 import pymupdf4llm
 
-from ..utils import format_file_size
+from ..config import (
+    get_pdf_workers,
+    get_parallel_min_pages,
+    is_table_prescan_enabled,
+    is_isolation_enabled,
+    get_worker_max_jobs,
+    get_job_memory_limit_bytes,
+    get_job_cpu_limit,
+)
+from ..jobs.isolation import get_worker_supervisor, job_limits
+from ..utils import format_file_size, format_page_ranges
+from .result_cache import store_cached_result
+from .page_cache import make_page_cache_key, load_cached_page, store_cached_page
+from .pdf_source import PdfSource, open_worker_source
+from .fast_text import FontSizeHeaders, page_to_markdown
+from .table_scan import find_tableless_pages, record_table_scan
+from .options import parse_options, extraction_kwargs, uses_layout
 
 logger = logging.getLogger(__name__)
 
+# Ranges per worker; more, smaller ranges even out pages of uneven cost
+RANGES_PER_WORKER = 4
 
-class ProgressCapture:
-    """Capture progress output from pymupdf4llm."""
+# Conversion engines: full pymupdf4llm layout analysis, or text spans only
+ENGINES = ("pymupdf4llm", "fast")
+DEFAULT_ENGINE = "pymupdf4llm"
 
-    def __init__(self, conversion_id, total_pages, progress_dict):
-        """Initialize progress capture.
+_process_pool = None
+_process_pool_workers = 0
+_process_pool_lock = Lock()
+# Per-task (memory, CPU) limits of a pool process, set by _init_pool_process
+_pool_job_limits = (0, 0)
+
+
+class ConversionCancelled(Exception):
+    """Raised inside a conversion whose job has been cancelled."""
+
+
+class JobProgress:
+    """Per-job progress callback for a PDF conversion.
+
+    The conversion loop reports every finished page directly, so concurrent
+    jobs never share state and no process-global streams are touched.
+    Pages passed to write() go straight to the result store, so the
+    finished markdown is never assembled in memory.
+    """
+
+    # Result variant written by this callback, see ResultStore.name()
+    variant = None
+
+    def __init__(self, conversion_id, job_store, result_store=None):
+        """Initialize job progress.
 
         Args:
             conversion_id: Unique ID for this conversion
-            total_pages: Total number of pages in PDF
-            progress_dict: Shared dictionary to store progress
+            job_store: JobStore holding the job state
+            result_store: Optional ResultStore the finished markdown is
+                spilled to instead of being kept in the job state
         """
         self.conversion_id = conversion_id
+        self.job_store = job_store
+        self.result_store = result_store
+        self.total_pages = 0
+        self.pages_done = 0
+        self.pages_reused = 0
+        self._lock = Lock()
+        self._writer = None
+        self._parts = []
+
+    def is_cancelled(self) -> bool:
+        """Check whether the job has been cancelled.
+
+        The flag is read from the job store, so a cancellation received by
+        another server process is seen as well.
+
+        Returns:
+            True once the job has been cancelled
+        """
+        return self.job_store.is_cancelled(self.conversion_id)
+
+    def check_cancelled(self):
+        """Stop the conversion if its job has been cancelled.
+
+        Raises:
+            ConversionCancelled: If the job has been cancelled
+        """
+        if self.is_cancelled():
+            raise ConversionCancelled(f"Conversion {self.conversion_id} cancelled")
+
+    def start(self, total_pages, **fields):
+        """Initialize the job entry at the start of a conversion.
+
+        Args:
+            total_pages: Number of pages to convert
+            **fields: Additional fields for the job entry
+
+        Raises:
+            ConversionCancelled: If the job has been cancelled
+        """
+        self.check_cancelled()
         self.total_pages = total_pages
-        self.progress_dict = progress_dict
-        self.original_stdout = sys.stdout
-        self.original_stderr = sys.stderr
-
-    def __enter__(self):
-        sys.stdout = self
-        sys.stderr = self
-        return self
-
-    def __exit__(self, exc_type, exc_val, exc_tb):
-        sys.stdout = self.original_stdout
-        sys.stderr = self.original_stderr
-
-    def write(self, text):
-        """Write output and parse progress."""
-        self.original_stdout.write(text)
-        self.original_stdout.flush()
-
-        if self.conversion_id in self.progress_dict:
-            progress_match = re.search(r"\(\s*(\d+)/(\d+)\)", text)
-            if progress_match:
-                current_page = int(progress_match.group(1))
-                total_pages = int(progress_match.group(2))
-
-                progress_percent = int((current_page / total_pages) * 85) + 10
-
-                self.progress_dict[self.conversion_id].update(
-                    {
-                        "progress": progress_percent,
-                        "stage": f"Processing page {current_page} of {total_pages}...",
-                        "current_page": current_page,
-                        "total_pages": total_pages,
-                    }
+        self.discard()
+        if self.result_store is not None:
+            self._writer = self.result_store.writer(
+                self.result_store.name(self.conversion_id, self.variant)
+            )
+        # Keep fields set at submission time, such as the cost estimate
+        self.job_store.put(
+            self.conversion_id,
+            {
+                **(self.job_store.get(self.conversion_id) or {}),
+                "progress": 0,
+                "stage": "Starting conversion...",
+                "total_pages": total_pages,
+                "current_page": 0,
+                "status": "processing",
+                "pages_reused": 0,
+                "pages_converted": 0,
+                **fields,
+            },
+        )
+
+    def update(self, **fields):
+        """Update fields of the job entry."""
+        self.job_store.update(self.conversion_id, **fields)
+
+    def page_done(self, page_number, markdown, reused=False):
+        """Record a finished page and publish it to streaming clients.
+
+        Args:
+            page_number: 1-based page number
+            markdown: Markdown text of the page
+            reused: Whether the page came from the page cache
+
+        Raises:
+            ConversionCancelled: If the job has been cancelled, which ends
+                the conversion between two pages
+        """
+        self.check_cancelled()
+        with self._lock:
+            self.pages_done += 1
+            if reused:
+                self.pages_reused += 1
+            done = self.pages_done
+            reused_count = self.pages_reused
+
+        self.job_store.append_chunk(
+            self.conversion_id, {"page": page_number, "markdown": markdown}
+        )
+        self.update(
+            progress=int((done / self.total_pages) * 85) + 10,
+            stage=f"Processed {done} of {self.total_pages} pages...",
+            current_page=done,
+            pages_reused=reused_count,
+            pages_converted=done - reused_count,
+        )
+
+    def write(self, markdown):
+        """Append the markdown of the next page, in document order.
+
+        Args:
+            markdown: Markdown text of the page
+        """
+        if self._writer is not None:
+            self._writer.write(markdown)
+        else:
+            self._parts.append(markdown)
+
+    def _finish(self, result):
+        """Attach the written markdown to a result payload.
+
+        Args:
+            result: Result payload from build_result()
+
+        Returns:
+            Payload spilled to the result store, or with ``markdown`` set
+        """
+        if self._writer is None:
+            result = {**result, "markdown": "".join(self._parts)}
+            self._parts = []
+            return result
+        writer, self._writer = self._writer, None
+        return self.result_store.spill(
+            self.conversion_id, result, variant=self.variant, writer=writer
+        )
+
+    def discard(self):
+        """Drop markdown written by an unfinished conversion."""
+        if self._writer is not None:
+            self._writer.abort()
+            self._writer = None
+        self._parts = []
+
+    def complete(self, result):
+        """Mark the job as completed.
+
+        Args:
+            result: Result payload from build_result(); its markdown is
+                the pages passed to write()
+        """
+        result = self._finish(result)
+        self.update(
+            progress=100,
+            stage="Conversion complete!",
+            status="completed",
+            result=result,
+        )
+
+    def fail(self, error):
+        """Mark the job as failed.
+
+        Args:
+            error: Error message
+        """
+        self.discard()
+        self.job_store.put(
+            self.conversion_id,
+            {
+                "progress": 0,
+                "stage": f"Error: {error}",
+                "status": "error",
+                "error": error,
+            },
+        )
+
+
+class PreviewProgress(JobProgress):
+    """Progress callback for the preview phase of a conversion.
+
+    Completing the preview publishes its markdown as the ``preview``
+    result and sets ``preview_ready``; the job itself stays in progress
+    until the full conversion finishes. Preview pages are only reused by
+    the full conversion through the page cache, whose keys include the
+    header mapping; in whole-document mode they are converted again, since
+    their headings depend on all selected pages.
+    """
+
+    variant = "preview"
+
+    def complete(self, result):
+        """Publish the preview result.
+
+        Args:
+            result: Result payload from build_result(); its markdown is
+                the pages passed to write()
+        """
+        result = self._finish(result)
+        self.update(
+            stage="Preview ready, converting remaining pages...",
+            preview_ready=True,
+            preview=result,
+        )
+
+
+def _init_pool_process(memory_limit, cpu_limit):
+    """Remember the per-task limits. Runs in each new pool process."""
+    global _pool_job_limits
+    _pool_job_limits = (memory_limit, cpu_limit)
+
+
+def get_process_pool(workers):
+    """Get the shared process pool used for page-parallel conversion.
+
+    Args:
+        workers: Number of worker processes
+
+    Returns:
+        ProcessPoolExecutor instance
+    """
+    global _process_pool, _process_pool_workers
+    with _process_pool_lock:
+        if _process_pool is None or _process_pool_workers != workers:
+            if _process_pool is not None:
+                _process_pool.shutdown(wait=False)
+            options = {}
+            if is_isolation_enabled():
+                # Page batches run under the limits of isolated workers
+                options["initializer"] = _init_pool_process
+                options["initargs"] = (
+                    get_job_memory_limit_bytes(),
+                    get_job_cpu_limit(),
                 )
+                if sys.version_info >= (3, 11):
+                    # Replace pool processes like isolated workers to bound RSS
+                    options["max_tasks_per_child"] = get_worker_max_jobs()
+            # MuPDF is not fork-safe in a threaded server; always spawn
+            _process_pool = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                **options,
+            )
+            _process_pool_workers = workers
+            logger.info(f"Started PDF conversion pool with {workers} workers")
+        return _process_pool
 
-    def flush(self):
-        """Flush output."""
-        self.original_stdout.flush()
 
+def _reset_process_pool():
+    """Drop a broken process pool so the next job starts a fresh one."""
+    global _process_pool
+    with _process_pool_lock:
+        if _process_pool is not None:
+            _process_pool.shutdown(wait=False)
+        _process_pool = None
 
-def convert_pdf_with_progress(temp_path, conversion_id, filename, progress_dict):
-    """Convert PDF with real progress tracking.
+
+def split_pages(page_numbers, workers):
+    """Split page numbers into contiguous batches for the worker pool.
 
     Args:
-        temp_path: Path to temporary PDF file
-        conversion_id: Unique conversion ID
-        filename: Original filename
-        progress_dict: Shared dictionary for progress tracking
+        page_numbers: Sorted 0-based page numbers to convert
+        workers: Number of worker processes
+
+    Returns:
+        List of page number lists covering all pages in order
+    """
+    chunk_count = max(1, min(len(page_numbers), workers * RANGES_PER_WORKER))
+    chunk_size = math.ceil(len(page_numbers) / chunk_count)
+    return [
+        page_numbers[start : start + chunk_size]
+        for start in range(0, len(page_numbers), chunk_size)
+    ]
+
+
+def identify_headers(doc, page_numbers=None, engine=DEFAULT_ENGINE):
+    """Compute header levels once for the whole document.
+
+    pymupdf4llm derives heading levels from font-size statistics over all
+    pages. Converting page ranges separately must reuse the same mapping,
+    otherwise headings would differ from a single whole-document call.
+
+    Args:
+        doc: Open pymupdf.Document
+        page_numbers: Optional 0-based pages the statistics are limited to,
+            matching what pymupdf4llm does for a ``pages=`` selection
+        engine: Conversion engine, one of ENGINES
+
+    Returns:
+        Header info object, or None if the installed pymupdf4llm does not
+        use one (layout mode)
+    """
+    if engine == "fast":
+        return FontSizeHeaders(doc, page_numbers)
+    header_class = getattr(pymupdf4llm, "IdentifyHeaders", None)
+    if header_class is None:
+        return None
+    if page_numbers is not None:
+        return header_class(doc, pages=list(page_numbers))
+    return header_class(doc)
+
+
+def analyze_pages(doc, selection=None, engine=DEFAULT_ENGINE, key_options=None):
+    """Compute the header info and page cache keys of a conversion.
+
+    Args:
+        doc: Open pymupdf.Document
+        selection: Optional 0-based pages to convert; all pages otherwise
+        engine: Conversion engine, one of ENGINES
+        key_options: Conversion options that are part of the page keys
 
     Returns:
-        None (updates progress_dict with results)
+        Tuple of (header info, page cache key per 0-based page). There are
+        no page keys when needs_whole_document() holds: a page of a
+        whole-document conversion depends on the other pages, so it can
+        neither be reused nor cached on its own.
     """
+    hdr_info = identify_headers(doc, selection, engine)
+    if needs_whole_document(engine, hdr_info):
+        return hdr_info, {}
+    page_numbers = selection if selection is not None else range(len(doc))
+    return hdr_info, {
+        pno: make_page_cache_key(doc, doc[pno], hdr_info, key_options)
+        for pno in page_numbers
+    }
+
+
+def _call_with_document(worker_source, fn, args):
+    """Call fn on a freshly opened document. Runs inside a worker process."""
+    doc = open_worker_source(worker_source)
     try:
-        doc = pymupdf.open(temp_path)
-        total_pages = len(doc)
-        file_size = os.path.getsize(temp_path)
+        return fn(doc, *args)
+    finally:
         doc.close()
+        pymupdf.TOOLS.store_shrink(100)
 
-        progress_dict[conversion_id] = {
-            "progress": 0,
-            "stage": "Starting conversion...",
-            "total_pages": total_pages,
-            "current_page": 0,
-            "filename": filename,
-            "file_size": file_size,
-            "status": "processing",
-        }
 
-        logger.info(f"Starting PDF conversion for {filename}")
+def run_on_document(source, fn, *args):
+    """Run a pre-pass such as the page count or a feature scan on a PDF.
+
+    With isolation enabled the pass runs in the calling thread's isolated
+    worker process under the per-job limits, so the server process never
+    parses the uploaded PDF itself.
+
+    Args:
+        source: PdfSource of the PDF
+        fn: Module-level function taking the open pymupdf.Document first
+        *args: Further arguments for fn
+
+    Returns:
+        Return value of fn
+
+    Raises:
+        WorkerCrashedError: If the pass exceeded a limit of its worker
+    """
+    if is_isolation_enabled():
+        return get_worker_supervisor().call(
+            _call_with_document, source.worker_source(), fn, args
+        )
+    return fn(source.open(), *args)
+
+
+def table_prescan_active(engine=DEFAULT_ENGINE, options=None):
+    """Check whether pages of a conversion are pre-scanned for table rulings.
+
+    Only the classic pymupdf4llm path runs ``find_tables`` per page; in
+    layout mode tables come from the layout model and the fast engine finds
+    no tables at all. The line-based table strategies need rulings, the
+    ``text`` strategy does not, and ``ignore_graphics`` turns table finding
+    off altogether.
+
+    Args:
+        engine: Conversion engine, one of ENGINES
+        options: Extraction options from parse_options()
+
+    Returns:
+        True if the pre-scan can skip table finding
+    """
+    options = options or {}
+    return (
+        engine != "fast"
+        and options.get("table_strategy", "lines_strict") in ("lines_strict", "lines")
+        and not options.get("ignore_graphics")
+        and is_table_prescan_enabled()
+        and not uses_layout()
+    )
+
+
+def convert_page(
+    doc, pno, hdr_info, engine=DEFAULT_ENGINE, find_tables=True, options=None
+):
+    """Convert a single page with the selected engine.
+
+    Args:
+        doc: Open pymupdf.Document
+        pno: 0-based page number
+        hdr_info: Header info computed by identify_headers() for this engine
+        engine: Conversion engine, one of ENGINES
+        find_tables: Whether pymupdf4llm looks for tables on the page
+        options: Extraction options from parse_options()
+
+    Returns:
+        Markdown text of the page
+    """
+    if engine == "fast":
+        return page_to_markdown(doc[pno], hdr_info)
+    kwargs = extraction_kwargs(options)
+    if not find_tables:
+        kwargs["table_strategy"] = None
+    return pymupdf4llm.to_markdown(
+        doc, pages=[pno], hdr_info=hdr_info, show_progress=False, **kwargs
+    )
+
+
+def needs_whole_document(engine=DEFAULT_ENGINE, hdr_info=None):
+    """Check whether pages must be converted in a single pymupdf4llm call.
+
+    Without a shared header mapping (layout mode has no IdentifyHeaders),
+    pymupdf4llm derives heading levels from the pages of each call, so
+    converting pages separately would change the document's headings.
+
+    Args:
+        engine: Conversion engine, one of ENGINES
+        hdr_info: Header info computed by identify_headers()
+
+    Returns:
+        True if the pages of a conversion cannot be split
+    """
+    return engine != "fast" and hdr_info is None
+
+
+def convert_document(doc, page_numbers, options=None):
+    """Convert pages with one ``pymupdf4llm.to_markdown`` call.
+
+    Heading levels come from all selected pages, exactly as in a
+    whole-document call; ``page_chunks`` still splits the output per page.
+
+    Args:
+        doc: Open pymupdf.Document
+        page_numbers: Sorted 0-based page numbers to convert
+        options: Extraction options from parse_options()
+
+    Returns:
+        List of (page number, markdown) tuples in page order
+    """
+    chunks = pymupdf4llm.to_markdown(
+        doc,
+        pages=list(page_numbers),
+        page_chunks=True,
+        show_progress=False,
+        **extraction_kwargs(options),
+    )
+    return [(chunk["metadata"]["page_number"] - 1, chunk["text"]) for chunk in chunks]
+
+
+def _convert_page_batch(
+    worker_source,
+    page_numbers,
+    hdr_info,
+    engine=DEFAULT_ENGINE,
+    tableless=(),
+    options=None,
+):
+    """Convert a batch of pages. Runs inside a worker process.
 
-        progress_dict[conversion_id].update(
-            {"progress": 5, "stage": "Initializing conversion..."}
+    With isolation enabled the batch runs under the per-job memory and CPU
+    limits; a batch exceeding them breaks the pool and fails its job.
+
+    Args:
+        worker_source: File path or bytes from PdfSource.worker_source()
+        page_numbers: 0-based page numbers to convert
+        hdr_info: Header info shared by all batches of the document
+        engine: Conversion engine, one of ENGINES
+        tableless: Pages of the batch that are converted without table finding
+        options: Extraction options from parse_options()
+
+    Returns:
+        List of (page number, markdown) tuples
+    """
+    with job_limits(*_pool_job_limits):
+        doc = open_worker_source(worker_source)
+        try:
+            return [
+                (
+                    pno,
+                    convert_page(
+                        doc, pno, hdr_info, engine, pno not in tableless, options
+                    ),
+                )
+                for pno in page_numbers
+            ]
+        finally:
+            doc.close()
+
+
+def convert_pdf_serial(
+    doc,
+    page_numbers,
+    hdr_info,
+    on_page,
+    engine=DEFAULT_ENGINE,
+    tableless=(),
+    options=None,
+):
+    """Convert PDF pages one by one in the calling thread.
+
+    Without shared header info all pages go through one whole-document
+    call, see needs_whole_document().
+
+    Args:
+        doc: Open pymupdf.Document
+        page_numbers: 0-based page numbers to convert
+        hdr_info: Header info computed by identify_headers()
+        on_page: Callback receiving (page number, markdown) per finished page
+        engine: Conversion engine, one of ENGINES
+        tableless: Pages that are converted without table finding
+        options: Extraction options from parse_options()
+    """
+    if needs_whole_document(engine, hdr_info):
+        for pno, markdown in convert_document(doc, page_numbers, options):
+            on_page(pno, markdown)
+        return
+    for pno in page_numbers:
+        markdown = convert_page(
+            doc, pno, hdr_info, engine, pno not in tableless, options
         )
+        on_page(pno, markdown)
+
+
+def iter_page_conversions(
+    worker_source,
+    page_numbers,
+    hdr_info,
+    engine=DEFAULT_ENGINE,
+    tableless=(),
+    options=None,
+):
+    """Convert pages one by one, yielding each as it finishes.
+
+    Runs inside an isolated worker process; MuPDF's object store is
+    emptied afterwards so the process does not keep the document's memory.
+    Without shared header info all pages come from one whole-document
+    call, see needs_whole_document().
+
+    Args:
+        worker_source: File path or bytes from PdfSource.worker_source()
+        page_numbers: 0-based page numbers to convert
+        hdr_info: Header info computed by identify_headers()
+        engine: Conversion engine, one of ENGINES
+        tableless: Pages that are converted without table finding
+        options: Extraction options from parse_options()
+
+    Yields:
+        Tuples of (page number, markdown)
+    """
+    doc = open_worker_source(worker_source)
+    try:
+        if needs_whole_document(engine, hdr_info):
+            yield from convert_document(doc, page_numbers, options)
+            return
+        for pno in page_numbers:
+            yield pno, convert_page(
+                doc, pno, hdr_info, engine, pno not in tableless, options
+            )
+    finally:
+        doc.close()
+        pymupdf.TOOLS.store_shrink(100)
+
+
+def convert_pdf_isolated(
+    worker_source,
+    page_numbers,
+    hdr_info,
+    on_page,
+    engine=DEFAULT_ENGINE,
+    tableless=(),
+    options=None,
+):
+    """Convert PDF pages in the calling thread's isolated worker process.
+
+    A PDF that exhausts the worker's memory or CPU limit only takes down
+    the worker; the job fails with WorkerCrashedError. If on_page raises,
+    the worker is killed instead of finishing the remaining pages.
+
+    Args:
+        worker_source: File path or bytes from PdfSource.worker_source()
+        page_numbers: 0-based page numbers to convert
+        hdr_info: Header info computed by identify_headers()
+        on_page: Callback receiving (page number, markdown) per finished page
+        engine: Conversion engine, one of ENGINES
+        tableless: Pages that are converted without table finding
+        options: Extraction options from parse_options()
+    """
+    conversions = get_worker_supervisor().run(
+        iter_page_conversions,
+        worker_source,
+        list(page_numbers),
+        hdr_info,
+        engine,
+        frozenset(tableless),
+        options,
+    )
+    try:
+        for pno, markdown in conversions:
+            on_page(pno, markdown)
+    finally:
+        # Stopping early, e.g. on cancellation, kills the busy worker at once
+        conversions.close()
+
 
-        with ProgressCapture(conversion_id, total_pages, progress_dict):
-            markdown = pymupdf4llm.to_markdown(temp_path)
+def convert_pdf_parallel(
+    worker_source,
+    page_numbers,
+    hdr_info,
+    on_page,
+    workers,
+    engine=DEFAULT_ENGINE,
+    tableless=(),
+    options=None,
+):
+    """Convert PDF pages by distributing batches over the process pool.
 
-        progress_dict[conversion_id].update(
-            {"progress": 95, "stage": "Finalizing conversion..."}
+    Pages complete out of order; the caller reassembles them by page number,
+    so joining them is identical to a single ``pymupdf4llm.to_markdown`` call.
+    That requires header info shared by all batches; without it
+    (needs_whole_document()) the caller converts serially instead.
+
+    Args:
+        worker_source: File path or bytes from PdfSource.worker_source()
+        page_numbers: 0-based page numbers to convert
+        hdr_info: Header info computed by identify_headers()
+        on_page: Callback receiving (page number, markdown) per finished page
+        workers: Number of worker processes
+        engine: Conversion engine, one of ENGINES
+        tableless: Pages that are converted without table finding
+        options: Extraction options from parse_options()
+    """
+    batches = split_pages(page_numbers, workers)
+    logger.info(
+        f"Converting {len(page_numbers)} pages in {len(batches)} batches "
+        f"across {workers} workers"
+    )
+
+    pool = get_process_pool(workers)
+    futures = [
+        pool.submit(
+            _convert_page_batch,
+            worker_source,
+            batch,
+            hdr_info,
+            engine,
+            frozenset(tableless.intersection(batch)),
+            options,
         )
+        for batch in batches
+    ]
 
-        time.sleep(0.5)
+    try:
+        for future in as_completed(futures):
+            for pno, markdown in future.result():
+                on_page(pno, markdown)
+    except BrokenProcessPool:
+        _reset_process_pool()
+        raise
+    finally:
+        for future in futures:
+            future.cancel()
 
-        result = {
-            "markdown": markdown,
-            "filename": filename,
-            "fileSize": format_file_size(file_size),
-            "pageCount": total_pages,
-            "timestamp": datetime.now().isoformat(),
-            "success": True,
-        }
 
-        progress_dict[conversion_id].update(
-            {
-                "progress": 100,
-                "stage": "Conversion complete!",
-                "status": "completed",
-                "result": result,
-            }
+def build_result(markdown, filename, file_size, page_count, **extra):
+    """Build the result payload of a finished conversion.
+
+    Args:
+        markdown: Markdown text of the document, or None if the progress
+            callback supplies it from the pages passed to write()
+        filename: Original filename
+        file_size: Size of the uploaded PDF in bytes
+        page_count: Number of converted pages
+        **extra: Additional fields to include
+
+    Returns:
+        Result dictionary as returned to clients
+    """
+    return {
+        "markdown": markdown,
+        "filename": filename,
+        "fileSize": format_file_size(file_size),
+        "pageCount": page_count,
+        "timestamp": datetime.now().isoformat(),
+        "success": True,
+        **extra,
+    }
+
+
+def convert_pdf(
+    source,
+    filename,
+    progress,
+    cache_key=None,
+    pages=None,
+    keep_open=False,
+    engine=DEFAULT_ENGINE,
+    options=None,
+):
+    """Convert a PDF page by page, reporting through a per-job callback.
+
+    Pre-passes run through run_on_document(), in the isolated worker when
+    isolation is enabled. The source is closed at the end, unless
+    ``keep_open`` is set.
+
+    Args:
+        source: PdfSource, or path to temporary PDF file
+        filename: Original filename
+        progress: JobProgress receiving stage and per-page updates
+        cache_key: Result cache key; the result is cached when given
+        pages: Optional sorted 0-based page numbers to convert; all pages
+            are converted when omitted
+        keep_open: Leave the source open for a follow-up conversion
+        engine: Conversion engine, one of ENGINES
+        options: Extraction options from parse_options(); defaults to the
+            default tier. Ignored by the fast engine.
+
+    Returns:
+        None (reports results through progress)
+    """
+    if not isinstance(source, PdfSource):
+        source = PdfSource.from_path(source)
+    if engine == "fast":
+        options = None
+    elif options is None:
+        options = parse_options()
+
+    try:
+        workers = get_pdf_workers()
+        document_pages = run_on_document(source, len)
+        selection = list(pages) if pages is not None else None
+        page_numbers = selection if selection is not None else range(document_pages)
+        total_pages = len(page_numbers)
+        file_size = source.size
+
+        progress.start(total_pages, filename=filename, file_size=file_size)
+        logger.info(f"Starting PDF conversion for {filename}")
+        progress.update(progress=5, stage="Initializing conversion...")
+
+        pages = {}
+        next_index = 0
+
+        def on_page(pno, markdown, reused=False):
+            nonlocal next_index
+            pages[pno] = markdown
+            if not reused and pno in page_keys:
+                store_cached_page(page_keys[pno], markdown)
+            progress.page_done(pno + 1, markdown, reused=reused)
+            # Write pages out as soon as all pages before them are done; only
+            # the result cache needs them afterwards
+            while next_index < total_pages and page_numbers[next_index] in pages:
+                written = page_numbers[next_index]
+                progress.write(pages[written] if cache_key else pages.pop(written))
+                next_index += 1
+
+        try:
+            # Keys of default-engine, default-option pages stay unchanged
+            key_options = extraction_kwargs(options)
+            if engine != DEFAULT_ENGINE:
+                key_options["engine"] = engine
+            hdr_info, page_keys = run_on_document(
+                source, analyze_pages, selection, engine, key_options
+            )
+
+            pending = []
+            for pno in page_numbers:
+                markdown = load_cached_page(page_keys[pno]) if page_keys else None
+                if markdown is None:
+                    pending.append(pno)
+                else:
+                    on_page(pno, markdown, reused=True)
+            if progress.pages_reused:
+                logger.info(
+                    f"Reusing {progress.pages_reused} of {total_pages} cached pages "
+                    f"for {filename}"
+                )
+
+            tableless = set()
+            if pending and table_prescan_active(engine, options):
+                tableless = run_on_document(source, find_tableless_pages, pending)
+                record_table_scan(len(pending), len(tableless))
+                progress.update(tables_skipped=len(tableless))
+                logger.debug(
+                    f"Table finding skipped on {len(tableless)} of {len(pending)} "
+                    f"pages of {filename}"
+                )
+
+            if pending:
+                # Fast pages take milliseconds; shipping them to workers costs
+                # more. Without shared header info pages cannot be split.
+                if (
+                    engine != "fast"
+                    and not needs_whole_document(engine, hdr_info)
+                    and workers > 1
+                    and len(pending) >= get_parallel_min_pages()
+                ):
+                    convert_pdf_parallel(
+                        source.worker_source(),
+                        pending,
+                        hdr_info,
+                        on_page,
+                        workers,
+                        engine,
+                        tableless,
+                        options,
+                    )
+                elif is_isolation_enabled():
+                    convert_pdf_isolated(
+                        source.worker_source(),
+                        pending,
+                        hdr_info,
+                        on_page,
+                        engine,
+                        tableless,
+                        options,
+                    )
+                else:
+                    convert_pdf_serial(
+                        source.open(),
+                        pending,
+                        hdr_info,
+                        on_page,
+                        engine,
+                        tableless,
+                        options,
+                    )
+        finally:
+            if not keep_open:
+                source.close()
+
+        progress.update(progress=95, stage="Finalizing conversion...")
+
+        if cache_key:
+            store_cached_result(
+                cache_key,
+                [pages.pop(pno) for pno in page_numbers],
+                [pno + 1 for pno in page_numbers],
+            )
+
+        time.sleep(0.5)
+        progress.check_cancelled()
+
+        extra = {"engine": engine}
+        if options is not None:
+            extra["options"] = options
+        if selection is not None:
+            extra.update(
+                pages=format_page_ranges(selection),
+                documentPageCount=document_pages,
+            )
+        progress.complete(
+            build_result(None, filename, file_size, total_pages, **extra)
         )
 
         logger.info("Conversion successful")
 
     except Exception as e:
-        logger.error(f"Conversion error: {str(e)}")
-        import traceback
-
-        logger.error(traceback.format_exc())
-        progress_dict[conversion_id] = {
-            "progress": 0,
-            "stage": f"Error: {str(e)}",
-            "status": "error",
-            "error": str(e),
-        }
+        progress.discard()
+        if progress.is_cancelled():
+            # Errors of a cancelled job (e.g. its deleted scratch file) are
+            # expected; the job state is already gone, so nothing is reported
+            logger.info(f"Conversion of {filename} cancelled")
+        else:
+            logger.error(f"Conversion error: {str(e)}")
+            import traceback
+
+            logger.error(traceback.format_exc())
+            progress.fail(str(e))
+        if not keep_open:
+            source.close()
+
+
+def convert_pdf_with_progress(
+    source,
+    conversion_id,
+    filename,
+    job_store,
+    cache_key=None,
+    result_store=None,
+    pages=None,
+    preview=False,
+    engine=DEFAULT_ENGINE,
+    options=None,
+):
+    """Convert PDF with real progress tracking.
+
+    In preview mode the selected pages are published as the ``preview``
+    result and the source stays open for the full conversion.
+
+    Args:
+        source: PdfSource, or path to temporary PDF file
+        conversion_id: Unique conversion ID
+        filename: Original filename
+        job_store: JobStore holding the job state
+        cache_key: Result cache key; the result is cached when given
+        result_store: Optional ResultStore receiving the finished markdown
+        pages: Optional sorted 0-based page numbers to convert
+        preview: Whether this is the preview phase of a conversion
+        engine: Conversion engine, one of ENGINES
+        options: Extraction options from parse_options()
+
+    Returns:
+        None (updates the job store with results)
+    """
+    if preview:
+        progress = PreviewProgress(conversion_id, job_store, result_store)
+        convert_pdf(
+            source,
+            filename,
+            progress,
+            pages=pages,
+            keep_open=True,
+            engine=engine,
+            options=options,
+        )
+        return
+    progress = JobProgress(conversion_id, job_store, result_store)
+    convert_pdf(
+        source, filename, progress, cache_key, pages, engine=engine, options=options
+    )
@@ -0,0 +1,143 @@
+"""Uploaded PDFs kept on disk, in memory or in a memory-mapped spool file."""
+
+import os
+import io
+import mmap
+import logging
+import tempfile
+import pymupdf
+
+from ..utils import save_upload
+
+logger = logging.getLogger(__name__)
+
+UPLOAD_MODES = ("disk", "memory", "spool")
+
+
+class PdfSource:
+    """A PDF to convert, opened at most once for the whole pipeline.
+
+    ``disk`` sources are a file path, ``memory`` sources hold the uploaded
+    bytes and ``spool`` sources memory-map a temporary file that is deleted
+    on close. All of them hand out one shared ``pymupdf.Document`` that is
+    used for the pre-scan, the page fingerprints and serial conversion.
+    """
+
+    def __init__(self, path=None, data=None, size=0, digest=None, spool=None):
+        """Initialize the source. Use from_path() or from_upload() instead.
+
+        Args:
+            path: File path of the PDF (disk and spool sources)
+            data: PDF bytes or memoryview (memory and spool sources)
+            size: Size of the PDF in bytes
+            digest: SHA-256 hex digest of the PDF bytes
+            spool: Spool file object backing a memory mapping
+        """
+        self.path = path
+        self.data = data
+        self.size = size
+        self.digest = digest
+        self._spool = spool
+        self._mapping = None
+        self._doc = None
+
+    @classmethod
+    def from_path(cls, path: str) -> "PdfSource":
+        """Create a source for a PDF file on disk.
+
+        Args:
+            path: Path to the PDF file
+
+        Returns:
+            PdfSource instance
+        """
+        return cls(path=path, size=os.path.getsize(path))
+
+    @classmethod
+    def from_upload(cls, file_storage, mode: str, temp_path: str) -> "PdfSource":
+        """Receive an uploaded PDF, hashing it on the way.
+
+        Args:
+            file_storage: Werkzeug FileStorage from the request
+            mode: One of UPLOAD_MODES
+            temp_path: Destination path for ``disk`` mode; ``spool`` files
+                are created in the same directory
+
+        Returns:
+            PdfSource instance
+        """
+        if mode == "memory":
+            buffer = io.BytesIO()
+            digest, size = save_upload(file_storage, buffer)
+            return cls(data=buffer.getvalue(), size=size, digest=digest)
+
+        if mode == "spool":
+            spool = tempfile.NamedTemporaryFile(
+                prefix="spool_", suffix=".pdf", dir=os.path.dirname(temp_path)
+            )
+            digest, size = save_upload(file_storage, spool)
+            spool.flush()
+            source = cls(path=spool.name, size=size, digest=digest, spool=spool)
+            if size:
+                source._mapping = mmap.mmap(
+                    spool.fileno(), 0, access=mmap.ACCESS_READ
+                )
+                source.data = memoryview(source._mapping)
+            return source
+
+        digest, size = save_upload(file_storage, temp_path)
+        return cls(path=temp_path, size=size, digest=digest)
+
+    def open(self) -> pymupdf.Document:
+        """Get the shared document, opening it on first use.
+
+        Returns:
+            Open pymupdf.Document
+        """
+        if self._doc is None:
+            if self.data is not None:
+                self._doc = pymupdf.open(stream=self.data, filetype="pdf")
+            else:
+                self._doc = pymupdf.open(self.path)
+        return self._doc
+
+    def worker_source(self):
+        """Get a picklable handle for worker processes.
+
+        Returns:
+            File path when the PDF exists on disk, otherwise the PDF bytes
+        """
+        if self.path is not None:
+            return self.path
+        return bytes(self.data)
+
+    def close(self):
+        """Close the document and release memory and spool resources.
+
+        Files of ``disk`` sources are left in place for the caller to remove.
+        """
+        if self._doc is not None:
+            self._doc.close()
+            self._doc = None
+        if self._mapping is not None:
+            self.data.release()
+            self._mapping.close()
+            self._mapping = None
+        self.data = None
+        if self._spool is not None:
+            self._spool.close()
+            self._spool = None
+
+
+def open_worker_source(source) -> pymupdf.Document:
+    """Open a document from the handle returned by PdfSource.worker_source().
+
+    Args:
+        source: File path or PDF bytes
+
+    Returns:
+        Open pymupdf.Document
+    """
+    if isinstance(source, (bytes, bytearray)):
+        return pymupdf.open(stream=source, filetype="pdf")
+    return pymupdf.open(source)
@@ -0,0 +1,130 @@
+"""Content-addressed cache of PDF to Markdown conversion results."""
+
+import os
+import json
+import hashlib
+import logging
+from threading import Lock
+from typing import Any, Dict, List, Optional
+import pymupdf
+import pymupdf4llm
+
+from ..config import is_cache_enabled, get_cache_dir, get_cache_max_bytes
+from ..utils import DiskCache
+
+logger = logging.getLogger(__name__)
+
+_result_cache = None
+_result_cache_lock = Lock()
+
+
+def get_result_cache() -> Optional[DiskCache]:
+    """Get the global conversion result cache.
+
+    Returns:
+        DiskCache instance, or None if caching is disabled
+    """
+    global _result_cache
+    if not is_cache_enabled():
+        return None
+    with _result_cache_lock:
+        if _result_cache is None:
+            _result_cache = DiskCache(
+                os.path.join(get_cache_dir(), "results"), get_cache_max_bytes()
+            )
+        return _result_cache
+
+
+def library_versions() -> Dict[str, str]:
+    """Get the versions of the libraries that produce the markdown.
+
+    Returns:
+        Dictionary with pymupdf and pymupdf4llm versions
+    """
+    return {
+        "pymupdf": pymupdf.__version__,
+        "pymupdf4llm": getattr(pymupdf4llm, "__version__", None)
+        or getattr(pymupdf4llm, "version", "unknown"),
+    }
+
+
+def make_cache_key(file_digest: str, options: Optional[Dict[str, Any]] = None) -> str:
+    """Build the cache key of a conversion.
+
+    The key covers the uploaded bytes, the conversion options and the
+    library versions, so upgrading pymupdf/pymupdf4llm invalidates old entries.
+
+    Args:
+        file_digest: SHA-256 hex digest of the uploaded PDF
+        options: Conversion options affecting the output
+
+    Returns:
+        Hex digest used as cache key
+    """
+    payload = {
+        "file": file_digest,
+        "options": options or {},
+        **library_versions(),
+    }
+    encoded = json.dumps(payload, sort_keys=True).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()
+
+
+def load_cached_result(cache_key: str) -> Optional[Dict[str, Any]]:
+    """Look up a cached conversion.
+
+    Args:
+        cache_key: Key from make_cache_key()
+
+    Returns:
+        Dictionary with ``pages`` (per-page markdown), ``pageCount`` and
+        ``pageNumbers`` (1-based, absent in older entries), or None on a
+        miss
+    """
+    cache = get_result_cache()
+    if cache is None:
+        return None
+
+    data = cache.get(cache_key)
+    if data is None:
+        return None
+    try:
+        return json.loads(data.decode("utf-8"))
+    except ValueError as e:
+        logger.warning(f"Discarding unreadable cache entry {cache_key}: {e}")
+        return None
+
+
+def store_cached_result(
+    cache_key: str, pages: List[str], page_numbers: Optional[List[int]] = None
+):
+    """Store a finished conversion.
+
+    Args:
+        cache_key: Key from make_cache_key()
+        pages: Per-page markdown in page order
+        page_numbers: 1-based document page numbers of ``pages``; defaults
+            to 1..len(pages)
+    """
+    cache = get_result_cache()
+    if cache is None:
+        return
+
+    payload = {
+        "pages": pages,
+        "pageCount": len(pages),
+        "pageNumbers": list(page_numbers or range(1, len(pages) + 1)),
+    }
+    cache.put(cache_key, json.dumps(payload).encode("utf-8"))
+
+
+def get_cache_stats() -> Dict[str, Any]:
+    """Get hit/miss counters of the result cache.
+
+    Returns:
+        Cache statistics, or ``{"enabled": False}``
+    """
+    cache = get_result_cache()
+    if cache is None:
+        return {"enabled": False}
+    return {"enabled": True, **cache.stats()}
@@ -0,0 +1,122 @@
+"""Cheap pre-scan for the vector rulings that ruled tables are made of.
+
+pymupdf4llm looks for tables with ``find_tables(strategy="lines_strict")``,
+which only builds cells from vector line art. A page without at least two
+horizontal and two vertical rulings cannot yield such a table, so table
+finding can be switched off for it without changing the output.
+"""
+
+from threading import Lock
+from typing import Any, Dict, Iterable, Set, Tuple
+
+# Largest deviation, in points, of a segment still counted as axis-aligned
+AXIS_TOLERANCE = 1.0
+# Shortest segment, in points, that can be a table edge
+MIN_RULING_LENGTH = 3.0
+# Rulings needed in each direction to enclose at least one cell
+MIN_RULINGS = 2
+
+
+def _add_segment(counts, dx, dy):
+    if dy <= AXIS_TOLERANCE and dx >= MIN_RULING_LENGTH:
+        counts[0] += 1
+    elif dx <= AXIS_TOLERANCE and dy >= MIN_RULING_LENGTH:
+        counts[1] += 1
+
+
+def count_rulings(page) -> Tuple[int, int]:
+    """Count axis-aligned line segments on a page.
+
+    Rectangles count with all four edges, thin rectangles as a single line.
+    The count is an upper bound of what table finding can use, so it never
+    hides a table.
+
+    Args:
+        page: pymupdf.Page
+
+    Returns:
+        Tuple of (horizontal, vertical) ruling counts
+    """
+    counts = [0, 0]
+    for path in page.get_cdrawings():
+        for item in path["items"]:
+            kind = item[0]
+            if kind == "l":
+                (x0, y0), (x1, y1) = item[1], item[2]
+                _add_segment(counts, abs(x1 - x0), abs(y1 - y0))
+            elif kind in ("re", "qu"):
+                points = item[1]
+                if kind == "qu":
+                    xs = [point[0] for point in points]
+                    ys = [point[1] for point in points]
+                    width, height = max(xs) - min(xs), max(ys) - min(ys)
+                else:
+                    width, height = points[2] - points[0], points[3] - points[1]
+                if width <= AXIS_TOLERANCE or height <= AXIS_TOLERANCE:
+                    _add_segment(counts, width, height)
+                else:
+                    counts[0] += 2
+                    counts[1] += 2
+    return counts[0], counts[1]
+
+
+def may_contain_table(page) -> bool:
+    """Check whether a page has enough rulings for a ruled table.
+
+    Args:
+        page: pymupdf.Page
+
+    Returns:
+        False if table finding can be skipped for the page
+    """
+    horizontal, vertical = count_rulings(page)
+    return horizontal >= MIN_RULINGS and vertical >= MIN_RULINGS
+
+
+_stats_lock = Lock()
+_stats = {"pages_scanned": 0, "tables_skipped": 0}
+
+
+def find_tableless_pages(doc, page_numbers: Iterable[int]) -> Set[int]:
+    """Pre-scan pages and collect those that cannot contain a ruled table.
+
+    The scan may run in a worker process; record_table_scan() counts it in
+    the statistics of the server process.
+
+    Args:
+        doc: Open pymupdf.Document
+        page_numbers: 0-based pages to scan
+
+    Returns:
+        Set of 0-based pages for which table finding can be skipped
+    """
+    return {pno for pno in page_numbers if not may_contain_table(doc[pno])}
+
+
+def record_table_scan(scanned: int, skipped: int):
+    """Count a finished pre-scan in the table scan statistics.
+
+    Args:
+        scanned: Number of scanned pages
+        skipped: Number of pages whose table finding is skipped
+    """
+    with _stats_lock:
+        _stats["pages_scanned"] += scanned
+        _stats["tables_skipped"] += skipped
+
+
+def get_table_scan_stats() -> Dict[str, Any]:
+    """Get counters of the table pre-scan.
+
+    Returns:
+        Dictionary with scanned pages, pages whose table finding was
+        skipped and the skip ratio
+    """
+    with _stats_lock:
+        scanned = _stats["pages_scanned"]
+        skipped = _stats["tables_skipped"]
+    return {
+        "pages_scanned": scanned,
+        "tables_skipped": skipped,
+        "skip_ratio": round(skipped / scanned, 3) if scanned else 0.0,
+    }
@@ -6,7 +6,13 @@ from .docx_cleaners import (
     remove_horizontal_rules,
     remove_shape_lines,
 )
+from .docx_walk import ParagraphVisitor, ParagraphWalk, walk_paragraphs
 from .profile_manager import ProfileManager, get_profile_manager
+from .reference_doc import (
+    REFERENCE_DOC_NAME,
+    get_reference_doc,
+    get_reference_doc_stats,
+)
 from .profile_schema import DEFAULT_PROFILE, validate_profile, get_profile_template
 
 __all__ = [
@@ -14,8 +20,14 @@ __all__ = [
     "remove_leading_metadata",
     "remove_horizontal_rules",
     "remove_shape_lines",
+    "ParagraphVisitor",
+    "ParagraphWalk",
+    "walk_paragraphs",
     "ProfileManager",
     "get_profile_manager",
+    "REFERENCE_DOC_NAME",
+    "get_reference_doc",
+    "get_reference_doc_stats",
     "DEFAULT_PROFILE",
     "validate_profile",
     "get_profile_template",
@@ -2,6 +2,11 @@
 
 from docx.oxml.ns import qn
 
+from .docx_walk import ParagraphVisitor, walk_paragraphs
+
+# Leading paragraphs checked for front matter left over from the markdown
+LEADING_METADATA_PARAGRAPHS = 5
+
 
 def delete_paragraph(paragraph):
     """Delete a paragraph from the document.
@@ -14,16 +19,8 @@ def delete_paragraph(paragraph):
     paragraph._p = paragraph._element = None
 
 
-def has_horizontal_rule(paragraph):
-    """Check if a paragraph contains a horizontal rule.
-
-    Args:
-        paragraph: Paragraph to check
-
-    Returns:
-        True if paragraph has a horizontal rule
-    """
-    p_pr = paragraph._element.find(qn("w:pPr"))
+def _has_horizontal_rule(p):
+    p_pr = p.find(qn("w:pPr"))
     if p_pr is None:
         return False
     p_borders = p_pr.find(qn("w:pBdr"))
@@ -36,42 +33,63 @@ def has_horizontal_rule(paragraph):
     return False
 
 
-def remove_leading_metadata(doc):
-    """Remove leading metadata from the document.
+def has_horizontal_rule(paragraph):
+    """Check if a paragraph contains a horizontal rule.
 
     Args:
-        doc: Document object
+        paragraph: Paragraph to check
+
+    Returns:
+        True if paragraph has a horizontal rule
     """
-    paragraphs = list(doc.paragraphs)
-    if not paragraphs:
-        return
+    return _has_horizontal_rule(paragraph._element)
+
+
+class LeadingMetadataRemover(ParagraphVisitor):
+    """Deletes link anchors and rules among the first paragraphs."""
 
-    to_delete = []
-    for paragraph in paragraphs[:5]:
-        text = paragraph.text.strip()
+    def visit(self, p, style_name, index):
+        if index >= LEADING_METADATA_PARAGRAPHS:
+            return False
+        text = p.text.strip()
         if text.startswith("[[") and "#" in text:
-            to_delete.append(paragraph)
-            continue
-        if text in {"---", "***", "___"}:
-            to_delete.append(paragraph)
-            continue
-        if has_horizontal_rule(paragraph):
-            to_delete.append(paragraph)
+            return True
+        return text in {"---", "***", "___"} or _has_horizontal_rule(p)
 
-    for paragraph in to_delete:
-        delete_paragraph(paragraph)
 
+class HorizontalRuleRemover(ParagraphVisitor):
+    """Deletes paragraphs that draw a horizontal rule."""
+
+    def visit(self, p, style_name, index):
+        return _has_horizontal_rule(p)
+
+
+class ShapeLineRemover(ParagraphVisitor):
+    """Deletes empty paragraphs that only hold shapes or drawings."""
+
+    def visit(self, p, style_name, index):
+        if not p.xpath(".//w:drawing | .//w:pict"):
+            return False
+        return not p.text.strip()
 
-def remove_horizontal_rules(doc):
-    """Remove all horizontal rules from document.
+
+def remove_leading_metadata(doc):
+    """Remove leading metadata from the document.
 
     Args:
         doc: Document object
     """
-    for paragraph in list(doc.paragraphs):
-        if has_horizontal_rule(paragraph):
-            delete_paragraph(paragraph)
+    walk_paragraphs(doc, [LeadingMetadataRemover()])
+
+
+def remove_header_footer_rules(doc):
+    """Unlink headers and footers and remove their horizontal rules.
+
+    Header paragraphs without a rule are cleared.
 
+    Args:
+        doc: Document object
+    """
     for section in doc.sections:
         try:
             section.header.is_linked_to_previous = False
@@ -90,20 +108,20 @@ def remove_horizontal_rules(doc):
             continue
 
 
+def remove_horizontal_rules(doc):
+    """Remove all horizontal rules from document.
+
+    Args:
+        doc: Document object
+    """
+    walk_paragraphs(doc, [HorizontalRuleRemover()])
+    remove_header_footer_rules(doc)
+
+
 def remove_shape_lines(doc):
     """Remove empty paragraphs containing only shapes/drawings.
 
     Args:
         doc: Document object
     """
-    for paragraph in list(doc.paragraphs):
-        if paragraph.text.strip():
-            continue
-        has_drawing = paragraph._element.findall(
-            ".//w:drawing", namespaces=paragraph._element.nsmap
-        )
-        has_pict = paragraph._element.findall(
-            ".//w:pict", namespaces=paragraph._element.nsmap
-        )
-        if has_drawing or has_pict:
-            delete_paragraph(paragraph)
+    walk_paragraphs(doc, [ShapeLineRemover()])
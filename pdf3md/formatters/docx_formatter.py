@@ -5,16 +5,38 @@ from typing import Dict, Any, Optional
 from docx.shared import Pt, Inches, Emu
 from docx.enum.text import WD_ALIGN_PARAGRAPH
 from docx.enum.table import WD_ALIGN_VERTICAL
+from docx.enum.style import WD_STYLE_TYPE
 from docx.oxml import OxmlElement
 from docx.oxml.ns import qn
+from docx.text.parfmt import ParagraphFormat
 
 from .docx_cleaners import (
-    remove_leading_metadata,
-    remove_horizontal_rules,
-    remove_shape_lines,
+    LeadingMetadataRemover,
+    HorizontalRuleRemover,
+    ShapeLineRemover,
+    remove_header_footer_rules,
+)
+from .docx_walk import (
+    ParagraphVisitor,
+    ParagraphWalk,
+    paragraph_style_names,
+    walk_paragraphs,
 )
 from .profile_schema import DEFAULT_PROFILE
 
+# "direct" also stamps fonts and sizes onto every run; "styles" applies the
+# profile through the Normal, Heading N and table styles only
+FORMATTING_MODES = ("direct", "styles")
+
+DEFAULT_HEADING_SIZES = {1: 14, 2: 12, 3: 11, 4: 10, 5: 9, 6: 9}
+
+# Paragraph styles table cell text is moved to in "styles" mode
+TABLE_HEADER_STYLE = "Table Header"
+TABLE_TEXT_STYLE = "Table Text"
+
+# Theme font attributes win over explicit font names in Word
+_THEME_FONT_ATTRIBUTES = ("w:asciiTheme", "w:hAnsiTheme", "w:cstheme")
+
 
 def _coerce_float(value, default, minimum=None):
     try:
@@ -26,41 +48,242 @@ def _coerce_float(value, default, minimum=None):
     return number
 
 
-def apply_docx_formatting(docx_path: str, profile: Optional[Dict[str, Any]] = None):
+def get_formatting_mode(profile: Dict[str, Any]) -> str:
+    """Get the formatting mode of a profile.
+
+    Args:
+        profile: Profile dictionary
+
+    Returns:
+        One of FORMATTING_MODES, "direct" if unset or unknown
+    """
+    mode = profile.get("formatting", {}).get("mode", "direct")
+    return mode if mode in FORMATTING_MODES else "direct"
+
+
+def apply_docx_formatting(
+    docx,
+    profile: Optional[Dict[str, Any]] = None,
+    output=None,
+    styles_applied: bool = False,
+):
     """Apply all formatting to a DOCX document using the specified profile.
 
     Args:
-        docx_path: Path to the DOCX file
+        docx: Path to the DOCX file, or a binary file object such as BytesIO
         profile: Profile dictionary. If None, uses DEFAULT_PROFILE
+        output: Optional path or binary file object the formatted document
+            is saved to. If None, it replaces ``docx``.
+        styles_applied: Whether the document was generated from the
+            profile's reference document, so its styles and page setup
+            already match the profile. Only cleanup, run formatting in
+            "direct" mode, page numbers and tables are then applied.
     """
     from docx import Document
 
     if profile is None:
         profile = DEFAULT_PROFILE
+    styles_only = get_formatting_mode(profile) == "styles"
 
-    doc = Document(docx_path)
+    doc = Document(docx)
 
-    apply_page_margins(doc, profile)
-    remove_leading_metadata(doc)
+    if not styles_applied:
+        apply_page_margins(doc, profile)
+    if styles_only and styles_applied:
+        formatters = []
+    else:
+        formatters = [
+            HeadingFormatter(profile, styles_only),
+            BodyFontFormatter(profile, styles_only),
+            ParagraphSpacingFormatter(profile, styles_only),
+        ]
+    # Cleanup and formatting share one walk; a deleted paragraph is not
+    # formatted
+    walk = ParagraphWalk(
+        doc,
+        [
+            LeadingMetadataRemover(),
+            HorizontalRuleRemover(),
+            ShapeLineRemover(),
+            *formatters,
+        ],
+    )
+    walk.run(prepare=not styles_applied)
     try:
-        remove_horizontal_rules(doc)
+        remove_header_footer_rules(doc)
     except FileNotFoundError:
         pass
-    remove_shape_lines(doc)
     try:
-        add_profile_debug_header(doc, profile)
+        debug_paragraph = add_profile_debug_header(doc, profile, styles_only)
+        walk.visit(debug_paragraph._p, visitors=formatters)
     except FileNotFoundError:
         pass
     try:
         add_page_numbers(doc, profile)
     except FileNotFoundError:
         pass
-    apply_heading_sizes(doc, profile)
-    apply_body_font(doc, profile)
-    apply_paragraph_formatting(doc, profile)
     format_tables(doc, profile)
 
-    doc.save(docx_path)
+    if output is None and hasattr(docx, "seek"):
+        docx.seek(0)
+        docx.truncate()
+    doc.save(output if output is not None else docx)
+
+
+def apply_profile_styles(doc, profile: Dict[str, Any]):
+    """Apply the profile settings that styles and page setup can express.
+
+    Writes page size and margins, the Normal and Heading N fonts, paragraph
+    spacing and the table styles, without touching the document body.
+
+    Args:
+        doc: Document object
+        profile: Profile dictionary
+    """
+    apply_page_margins(doc, profile)
+    for formatter in (
+        HeadingFormatter(profile, styles_only=True),
+        BodyFontFormatter(profile, styles_only=True),
+        ParagraphSpacingFormatter(profile, styles_only=True),
+    ):
+        formatter.prepare(doc)
+    apply_table_styles(doc, profile)
+
+
+def _format_runs(p, font_name, size, bold=False):
+    """Set font name, size and optionally bold on every run of a paragraph."""
+    for r in p.r_lst:
+        rPr = r.get_or_add_rPr()
+        rPr.sz_val = size
+        rFonts = rPr.get_or_add_rFonts()
+        rFonts.set(qn("w:ascii"), font_name)
+        rFonts.set(qn("w:hAnsi"), font_name)
+        rFonts.set(qn("w:cs"), font_name)
+        if bold:
+            rPr.get_or_add_b().val = True
+
+
+def _strip_run_formatting(p, font_name, size, bold=False):
+    """Remove direct run fonts, sizes and bold that repeat the style's values.
+
+    Runs with a character style are left alone, since their direct
+    formatting overrides that style rather than the paragraph style.
+
+    Args:
+        p: ``w:p`` element
+        font_name: Font name of the paragraph style, or None to keep fonts
+        size: Font size of the paragraph style
+        bold: Whether the paragraph style is bold
+    """
+    half_points = str(int(round(size.pt * 2)))
+    for r in p.r_lst:
+        rPr = r.rPr
+        if rPr is None or rPr.rStyle is not None:
+            continue
+        if font_name is not None and rPr.rFonts is not None:
+            rFonts = rPr.rFonts
+            for attribute in ("w:ascii", "w:hAnsi", "w:cs"):
+                if rFonts.get(qn(attribute)) == font_name:
+                    del rFonts.attrib[qn(attribute)]
+            if not rFonts.attrib:
+                rPr._remove_rFonts()
+        if rPr.sz is not None and rPr.sz.get(qn("w:val")) == half_points:
+            rPr._remove_sz()
+            szCs = rPr.find(qn("w:szCs"))
+            if szCs is not None and szCs.get(qn("w:val")) == half_points:
+                rPr.remove(szCs)
+        if bold and rPr.b is not None and rPr.b.val:
+            rPr._remove_b()
+        if len(rPr) == 0:
+            r.remove(rPr)
+
+
+def _set_style_font(style, font_name, size, bold=False, clear_theme=False):
+    """Set the font name, size and optionally bold of a style.
+
+    Args:
+        style: Style object
+        font_name: Font name
+        size: Font size
+        bold: Whether to make the style bold
+        clear_theme: Whether to drop theme fonts, so the name also applies
+            to text without direct run fonts
+    """
+    style.font.size = size
+    style.font.name = font_name
+    if bold:
+        style.font.bold = True
+
+    # Explicitly set rFonts to ensure it overrides defaults
+    if style.element.rPr is None:
+        style.element.get_or_add_rPr()
+
+    rFonts = style.element.rPr.find(qn('w:rFonts'))
+    if rFonts is None:
+        rFonts = OxmlElement('w:rFonts')
+        style.element.rPr.append(rFonts)
+
+    rFonts.set(qn('w:ascii'), font_name)
+    rFonts.set(qn('w:hAnsi'), font_name)
+    rFonts.set(qn('w:cs'), font_name)
+    if clear_theme:
+        for attribute in _THEME_FONT_ATTRIBUTES:
+            rFonts.attrib.pop(qn(attribute), None)
+
+
+def _inherits_normal_font(style, normal) -> bool:
+    """Check whether a paragraph style takes its font and size from Normal."""
+    while style is not None and style != normal:
+        rPr = style.element.rPr
+        if rPr is not None and (rPr.rFonts is not None or rPr.sz is not None):
+            return False
+        style = style.base_style
+    return style is not None
+
+
+class BodyFontFormatter(ParagraphVisitor):
+    """Applies the body font to the Normal style and its paragraphs' runs."""
+
+    def __init__(self, profile: Dict[str, Any], styles_only: bool = False):
+        """Initialize the formatter.
+
+        Args:
+            profile: Profile dictionary
+            styles_only: Apply the font through the Normal style only and
+                remove run fonts and sizes that repeat it
+        """
+        body_font = profile.get("fonts", {}).get("body", {})
+        self.font_name = body_font.get("name", "Calibri")
+        self.font_size = _coerce_float(body_font.get("size", 11), 11, minimum=1)
+        self.size = Pt(self.font_size)
+        self.styles_only = styles_only
+        # Names of the paragraph styles that use the Normal font and size
+        self.body_styles = set()
+
+    def prepare(self, doc):
+        # Update Normal style which affects most text
+        if 'Normal' in doc.styles:
+            normal = doc.styles['Normal']
+            _set_style_font(
+                normal, self.font_name, self.size, clear_theme=self.styles_only
+            )
+            if self.styles_only:
+                self.body_styles = {
+                    style.name
+                    for style in doc.styles
+                    if style.type == WD_STYLE_TYPE.PARAGRAPH
+                    and _inherits_normal_font(style, normal)
+                }
+
+    def visit(self, p, style_name, index):
+        if self.styles_only:
+            if style_name in self.body_styles:
+                _strip_run_formatting(p, self.font_name, self.size)
+        # Runs of Normal paragraphs get the font as direct formatting too, so
+        # it wins over formatting carried over from the markdown conversion
+        elif style_name == 'Normal':
+            _format_runs(p, self.font_name, self.size)
+        return False
 
 
 def apply_body_font(doc, profile: Dict[str, Any]):
@@ -70,56 +293,8 @@ def apply_body_font(doc, profile: Dict[str, Any]):
         doc: Document object
         profile: Profile dictionary
     """
-    fonts_config = profile.get("fonts", {})
-    body_font = fonts_config.get("body", {})
-    
-    font_name = body_font.get("name", "Calibri")
-    font_size = _coerce_float(body_font.get("size", 11), 11, minimum=1)
-
-    # Update Normal style which affects most text
-    if 'Normal' in doc.styles:
-        style = doc.styles['Normal']
-        style.font.name = font_name
-        style.font.size = Pt(font_size)
-        
-        # Explicitly set rFonts to ensure it overrides defaults
-        if style.element.rPr is None:
-            style.element.get_or_add_rPr()
-        
-        rFonts = style.element.rPr.find(qn('w:rFonts'))
-        if rFonts is None:
-            rFonts = OxmlElement('w:rFonts')
-            style.element.rPr.append(rFonts)
-            
-        rFonts.set(qn('w:ascii'), font_name)
-        rFonts.set(qn('w:hAnsi'), font_name)
-        rFonts.set(qn('w:cs'), font_name)
-
-    # Also iterate through all paragraphs to ensure those without explicit style 
-    # or with direct formatting overrides get the correct font, IF they are using Normal style
-    # or are just plain paragraphs.
-    for paragraph in doc.paragraphs:
-        # Check if paragraph is using Normal style or no style
-        if paragraph.style.name == 'Normal':
-            paragraph.style.font.name = font_name
-            paragraph.style.font.size = Pt(font_size)
-            for run in paragraph.runs:
-                # Only override if run doesn't have its own distinct formatting
-                # (This is a heuristic, blindly overriding everything might be too aggressive,
-                # but for MD conversion usually desired).
-                run.font.name = font_name
-                run.font.size = Pt(font_size)
-                
-                # Apply rFonts to runs as well
-                if run._element.rPr is None:
-                    run._element.get_or_add_rPr()
-                rFonts = run._element.rPr.find(qn('w:rFonts'))
-                if rFonts is None:
-                    rFonts = OxmlElement('w:rFonts')
-                    run._element.rPr.append(rFonts)
-                rFonts.set(qn('w:ascii'), font_name)
-                rFonts.set(qn('w:hAnsi'), font_name)
-                rFonts.set(qn('w:cs'), font_name)
+    styles_only = get_formatting_mode(profile) == "styles"
+    walk_paragraphs(doc, [BodyFontFormatter(profile, styles_only)])
 
 
 def apply_page_margins(doc, profile: Dict[str, Any]):
@@ -158,7 +333,6 @@ def apply_page_margins(doc, profile: Dict[str, Any]):
         )
 
 
-
 def add_page_numbers(doc, profile: Dict[str, Any]):
     """Add page numbers to document footer based on profile.
 
@@ -231,8 +405,18 @@ def add_page_numbers(doc, profile: Dict[str, Any]):
             append_field(paragraph, "PAGE")
 
 
-def add_profile_debug_header(doc, profile: Dict[str, Any]):
-    """Write active profile info into the header for debugging."""
+def add_profile_debug_header(doc, profile: Dict[str, Any], styles_only: bool = False):
+    """Write active profile info into the header for debugging.
+
+    Args:
+        doc: Document object
+        profile: Profile dictionary
+        styles_only: Size the text through a "Profile Debug" paragraph
+            style instead of formatting its runs
+
+    Returns:
+        Paragraph inserted at the top of the document body
+    """
     page = profile.get("page", {})
     fonts = profile.get("fonts", {})
     headings = profile.get("headings", {})
@@ -270,14 +454,28 @@ def add_profile_debug_header(doc, profile: Dict[str, Any]):
         pn_fmt=page_numbers.get("format", "PAGE"),
     )
 
+    def set_small_text(paragraph):
+        if styles_only:
+            paragraph.style = style
+            return
+        for run in paragraph.runs:
+            run.font.size = Pt(8)
+
+    if styles_only:
+        if "Profile Debug" in doc.styles:
+            style = doc.styles["Profile Debug"]
+        else:
+            style = doc.styles.add_style("Profile Debug", WD_STYLE_TYPE.PARAGRAPH)
+            style.base_style = doc.styles["Normal"]
+        style.font.size = Pt(8)
+
     # Insert at top of document body for visibility
     if doc.paragraphs:
         first_para = doc.paragraphs[0]
         debug_para = first_para.insert_paragraph_before(header_text)
     else:
         debug_para = doc.add_paragraph(header_text)
-    for run in debug_para.runs:
-        run.font.size = Pt(8)
+    set_small_text(debug_para)
 
     # Also write to header (best effort)
     for section in doc.sections:
@@ -287,8 +485,60 @@ def add_profile_debug_header(doc, profile: Dict[str, Any]):
             continue
         paragraph = header.paragraphs[0] if header.paragraphs else header.add_paragraph()
         paragraph.text = header_text
-        for run in paragraph.runs:
-            run.font.size = Pt(8)
+        set_small_text(paragraph)
+    return debug_para
+
+
+class HeadingFormatter(ParagraphVisitor):
+    """Applies heading fonts and sizes to the Heading N styles and runs."""
+
+    def __init__(self, profile: Dict[str, Any], styles_only: bool = False):
+        """Initialize the formatter.
+
+        Args:
+            profile: Profile dictionary
+            styles_only: Apply fonts through the Heading N styles only and
+                remove run fonts, sizes and bold that repeat them
+        """
+        headings_config = profile.get("headings", {})
+        fonts_config = profile.get("fonts", {})
+        body_font_name = fonts_config.get("body", {}).get("name", "Calibri")
+
+        self.styles_only = styles_only
+        self.bold = headings_config.get("bold", True)
+        # {style name: (font name, size in points)}
+        self.fonts = {
+            f"Heading {level}": (
+                fonts_config.get(f"heading{level}", {}).get("name", body_font_name),
+                _coerce_float(
+                    headings_config.get(f"h{level}_size", default), default, minimum=1
+                ),
+            )
+            for level, default in DEFAULT_HEADING_SIZES.items()
+        }
+
+    def prepare(self, doc):
+        for style_name, (font_name, size_pt) in self.fonts.items():
+            if style_name in doc.styles:
+                style = doc.styles[style_name]
+                if style and style.font:
+                    _set_style_font(
+                        style,
+                        font_name,
+                        Pt(size_pt),
+                        bold=self.bold,
+                        clear_theme=self.styles_only,
+                    )
+
+    def visit(self, p, style_name, index):
+        font = self.fonts.get(style_name)
+        if font is None:
+            return False
+        if self.styles_only:
+            _strip_run_formatting(p, font[0], Pt(font[1]), self.bold)
+        else:
+            _format_runs(p, font[0], Pt(font[1]), self.bold)
+        return False
 
 
 def apply_heading_sizes(doc, profile: Dict[str, Any]):
@@ -298,87 +548,72 @@ def apply_heading_sizes(doc, profile: Dict[str, Any]):
         doc: Document object
         profile: Profile dictionary
     """
-    headings_config = profile.get("headings", {})
-    fonts_config = profile.get("fonts", {})
-    body_font_name = fonts_config.get("body", {}).get("name", "Calibri")
-    
-    heading_sizes = {
-        "Heading 1": _coerce_float(headings_config.get("h1_size", 14), 14, minimum=1),
-        "Heading 2": _coerce_float(headings_config.get("h2_size", 12), 12, minimum=1),
-        "Heading 3": _coerce_float(headings_config.get("h3_size", 11), 11, minimum=1),
-        "Heading 4": _coerce_float(headings_config.get("h4_size", 10), 10, minimum=1),
-        "Heading 5": _coerce_float(headings_config.get("h5_size", 9), 9, minimum=1),
-        "Heading 6": _coerce_float(headings_config.get("h6_size", 9), 9, minimum=1),
-    }
+    styles_only = get_formatting_mode(profile) == "styles"
+    walk_paragraphs(doc, [HeadingFormatter(profile, styles_only)])
 
-    bold = headings_config.get("bold", True)
 
-    heading_fonts = {
-        "Heading 1": fonts_config.get("heading1", {}).get("name", body_font_name),
-        "Heading 2": fonts_config.get("heading2", {}).get("name", body_font_name),
-        "Heading 3": fonts_config.get("heading3", {}).get("name", body_font_name),
-        "Heading 4": fonts_config.get("heading4", {}).get("name", body_font_name),
-        "Heading 5": fonts_config.get("heading5", {}).get("name", body_font_name),
-        "Heading 6": fonts_config.get("heading6", {}).get("name", body_font_name),
-    }
+class ParagraphSpacingFormatter(ParagraphVisitor):
+    """Applies line spacing and paragraph spacing to Normal and all paragraphs."""
 
-    for style_name, size_pt in heading_sizes.items():
-        if style_name in doc.styles:
-            style = doc.styles[style_name]
-            if style and style.font:
-                font_name = heading_fonts.get(style_name, body_font_name)
-                style.font.size = Pt(size_pt)
-                style.font.name = font_name
-                if bold:
-                    style.font.bold = True
-                if style.element.rPr is None:
-                    style.element.get_or_add_rPr()
-                rFonts = style.element.rPr.find(qn("w:rFonts"))
-                if rFonts is None:
-                    rFonts = OxmlElement("w:rFonts")
-                    style.element.rPr.append(rFonts)
-                rFonts.set(qn("w:ascii"), font_name)
-                rFonts.set(qn("w:hAnsi"), font_name)
-                rFonts.set(qn("w:cs"), font_name)
-
-    for paragraph in doc.paragraphs:
-        if paragraph.style and paragraph.style.name in heading_sizes:
-            size_pt = heading_sizes[paragraph.style.name]
-            font_name = heading_fonts.get(paragraph.style.name, body_font_name)
-            for run in paragraph.runs:
-                run.font.size = Pt(size_pt)
-                run.font.name = font_name
-                if bold:
-                    run.bold = True
-                if run._element.rPr is None:
-                    run._element.get_or_add_rPr()
-                rFonts = run._element.rPr.find(qn("w:rFonts"))
-                if rFonts is None:
-                    rFonts = OxmlElement("w:rFonts")
-                    run._element.rPr.append(rFonts)
-                rFonts.set(qn("w:ascii"), font_name)
-                rFonts.set(qn("w:hAnsi"), font_name)
-                rFonts.set(qn("w:cs"), font_name)
+    def __init__(self, profile: Dict[str, Any], styles_only: bool = False):
+        """Initialize the formatter.
+
+        Args:
+            profile: Profile dictionary
+            styles_only: Apply spacing through the paragraph styles only and
+                remove direct spacing that repeats it
+        """
+        paragraph_config = profile.get("paragraph", {})
+        self.line_spacing = _coerce_float(
+            paragraph_config.get("line_spacing", 1.0), 1.0, minimum=0.1
+        )
+        self.space_before = Pt(
+            _coerce_float(paragraph_config.get("space_before", 0), 0, minimum=0)
+        )
+        self.space_after = Pt(
+            _coerce_float(paragraph_config.get("space_after", 0), 0, minimum=0)
+        )
+        self.styles_only = styles_only
+        # Attributes of the w:spacing element the settings produce
+        reference = OxmlElement("w:p")
+        self._apply(ParagraphFormat(reference))
+        self._spacing = dict(reference.pPr.spacing.attrib)
+
+    def _apply(self, paragraph_format):
+        paragraph_format.line_spacing = self.line_spacing
+        paragraph_format.space_before = self.space_before
+        paragraph_format.space_after = self.space_after
+
+    def prepare(self, doc):
+        if "Normal" in doc.styles:
+            self._apply(doc.styles["Normal"].paragraph_format)
+        if self.styles_only:
+            # Styles with their own spacing would override Normal's
+            for style in doc.styles:
+                if style.type != WD_STYLE_TYPE.PARAGRAPH:
+                    continue
+                pPr = style.element.pPr
+                if pPr is not None and pPr.spacing is not None:
+                    self._apply(style.paragraph_format)
+
+    def visit(self, p, style_name, index):
+        if not self.styles_only:
+            self._apply(ParagraphFormat(p))
+            return False
+        pPr = p.pPr
+        if (
+            pPr is not None
+            and pPr.spacing is not None
+            and dict(pPr.spacing.attrib) == self._spacing
+        ):
+            pPr._remove_spacing()
+        return False
 
 
 def apply_paragraph_formatting(doc, profile: Dict[str, Any]):
     """Apply paragraph spacing settings based on profile."""
-    paragraph_config = profile.get("paragraph", {})
-    line_spacing = _coerce_float(paragraph_config.get("line_spacing", 1.0), 1.0, minimum=0.1)
-    space_before = _coerce_float(paragraph_config.get("space_before", 0), 0, minimum=0)
-    space_after = _coerce_float(paragraph_config.get("space_after", 0), 0, minimum=0)
-
-    if "Normal" in doc.styles:
-        style = doc.styles["Normal"]
-        style.paragraph_format.line_spacing = line_spacing
-        style.paragraph_format.space_before = Pt(space_before)
-        style.paragraph_format.space_after = Pt(space_after)
-
-    for paragraph in doc.paragraphs:
-        paragraph.paragraph_format.line_spacing = line_spacing
-        paragraph.paragraph_format.space_before = Pt(space_before)
-        paragraph.paragraph_format.space_after = Pt(space_after)
-
+    styles_only = get_formatting_mode(profile) == "styles"
+    walk_paragraphs(doc, [ParagraphSpacingFormatter(profile, styles_only)])
 
 
 def format_tables(doc, profile: Dict[str, Any]):
@@ -411,6 +646,9 @@ def format_tables(doc, profile: Dict[str, Any]):
         _coerce_float(tables_config.get("max_col_width", 3.0), 3.0, minimum=0.1)
     )
     auto_width = tables_config.get("auto_width", True)
+    styles_only = get_formatting_mode(profile) == "styles"
+    if styles_only:
+        text_styles = apply_table_styles(doc, profile)
 
     section = doc.sections[0]
     available_width = section.page_width - section.left_margin - section.right_margin
@@ -418,11 +656,21 @@ def format_tables(doc, profile: Dict[str, Any]):
     for table in doc.tables:
         table.style = "Table"
         table.autofit = not auto_width
-        set_table_borders(table, tables_config)
+        if styles_only:
+            _remove_profile_borders(table._tbl.tblPr, "w:tblBorders", tables_config)
+        else:
+            set_table_borders(table, tables_config)
 
         header_row = table.rows[0] if table.rows else None
 
         for row_index, row in enumerate(table.rows):
+            if styles_only:
+                is_header = bool(header_row) and row_index == 0
+                for cell in row.cells:
+                    text_styles.apply(cell, is_header)
+                    if is_header:
+                        cell.vertical_alignment = WD_ALIGN_VERTICAL.CENTER
+                continue
             for cell in row.cells:
                 set_cell_borders(cell, tables_config)
                 for paragraph in cell.paragraphs:
@@ -439,7 +687,7 @@ def format_tables(doc, profile: Dict[str, Any]):
                     cell.vertical_alignment = WD_ALIGN_VERTICAL.CENTER
 
         if header_row:
-            normalize_header_labels(header_row)
+            normalize_header_labels(header_row, direct_formatting=not styles_only)
 
         align_table_columns(table)
         if auto_width:
@@ -448,6 +696,140 @@ def format_tables(doc, profile: Dict[str, Any]):
             )
 
 
+class TableTextStyles:
+    """Moves table cell text to the table header and text paragraph styles."""
+
+    def __init__(self, doc, header_style, text_style, header_bold, tables_config):
+        """Initialize the styles.
+
+        Args:
+            doc: Document object
+            header_style: Paragraph style for header row text
+            text_style: Paragraph style for the other rows
+            header_bold: Whether the header style is bold
+            tables_config: Tables configuration from profile
+        """
+        # (style ID, font size, bold) for header and other rows
+        self.header = (header_style.style_id, header_style.font.size, header_bold)
+        self.text = (text_style.style_id, text_style.font.size, False)
+        self.tables_config = tables_config
+        self._names, self._default = paragraph_style_names(doc)
+        # Cell paragraphs in these styles are restyled; others, such as
+        # lists, keep their style and formatting
+        base = text_style.base_style
+        self.replaceable = {
+            self._default,
+            "Normal",
+            base.name if base is not None else None,
+        }
+
+    def apply(self, cell, is_header):
+        """Restyle the paragraphs of a cell and strip repeated run formatting.
+
+        Args:
+            cell: Cell object
+            is_header: Whether the cell is in the header row
+        """
+        style_id, size, bold = self.header if is_header else self.text
+        tc_pr = cell._tc.tcPr
+        if tc_pr is not None:
+            _remove_profile_borders(tc_pr, "w:tcBorders", self.tables_config)
+        for p in cell._tc.p_lst:
+            if self._names.get(p.style, self._default) in self.replaceable:
+                p.style = style_id
+                _strip_run_formatting(p, None, size, bold)
+
+
+def _table_paragraph_style(doc, name, base, size, bold=False, center=False):
+    """Get or add a paragraph style for table text.
+
+    Args:
+        doc: Document object
+        name: Style name
+        base: Style the new style is based on
+        size: Font size
+        bold: Whether the text is bold
+        center: Whether the text is centered
+
+    Returns:
+        Paragraph style
+    """
+    if name in doc.styles:
+        style = doc.styles[name]
+    else:
+        style = doc.styles.add_style(name, WD_STYLE_TYPE.PARAGRAPH)
+        style.base_style = base
+    style.font.size = size
+    bold = True if bold else None
+    if style.font.bold != bold:
+        style.font.bold = bold
+    alignment = WD_ALIGN_PARAGRAPH.CENTER if center else None
+    if style.paragraph_format.alignment != alignment:
+        style.paragraph_format.alignment = alignment
+    return style
+
+
+def apply_table_styles(doc, profile: Dict[str, Any]):
+    """Put table borders and cell text formatting into styles.
+
+    Borders go to the ``Table`` table style instead of every table and cell.
+    Cell text sizes, header bold and centering go to the table header and
+    table text paragraph styles, because paragraph styles take precedence
+    over table styles in Word.
+
+    Args:
+        doc: Document object
+        profile: Profile dictionary
+
+    Returns:
+        TableTextStyles for restyling cell paragraphs
+    """
+    tables_config = profile.get("tables", {})
+    fonts_config = profile.get("fonts", {})
+    table_header_font = fonts_config.get("table_header", {})
+    table_body_font = fonts_config.get("table_body", {})
+    header_font_size = Pt(_coerce_float(table_header_font.get("size", 10), 10, minimum=1))
+    body_font_size = Pt(_coerce_float(table_body_font.get("size", 10), 10, minimum=1))
+    header_bold = tables_config.get("header_bold", True)
+    header_center = tables_config.get("header_center", True)
+
+    if "Table" in doc.styles:
+        style = doc.styles["Table"].element
+    else:
+        style = doc.styles.add_style("Table", WD_STYLE_TYPE.TABLE).element
+
+    tbl_pr = style.find(qn("w:tblPr"))
+    if tbl_pr is None:
+        tbl_pr = OxmlElement("w:tblPr")
+        style.insert_element_before(tbl_pr, "w:trPr", "w:tcPr", "w:tblStylePr")
+    borders = tbl_pr.find(qn("w:tblBorders"))
+    if borders is None:
+        borders = OxmlElement("w:tblBorders")
+        tbl_pr.insert_element_before(
+            borders, "w:shd", "w:tblLayout", "w:tblCellMar", "w:tblLook"
+        )
+    _set_border_edges(borders, tables_config)
+    # Conditional cell borders, e.g. under the header row, would override
+    # the table borders
+    for cell_borders in style.iter(qn("w:tcBorders")):
+        _set_border_edges(cell_borders, tables_config, list(cell_borders))
+
+    base = None
+    for name in ("Compact", "Normal"):
+        if name in doc.styles:
+            base = doc.styles[name]
+            break
+    header_style = _table_paragraph_style(
+        doc,
+        TABLE_HEADER_STYLE,
+        base,
+        header_font_size,
+        bold=header_bold,
+        center=header_center,
+    )
+    text_style = _table_paragraph_style(doc, TABLE_TEXT_STYLE, base, body_font_size)
+    return TableTextStyles(doc, header_style, text_style, header_bold, tables_config)
+
 
 def adjust_table_column_widths(
     table, available_width, min_col_width, max_col_width, header_row
@@ -603,12 +985,22 @@ def is_numeric_like(text):
     return False
 
 
-def normalize_header_labels(header_row):
+def normalize_header_labels(header_row, direct_formatting=True):
     """Normalize and format table header labels.
 
     Args:
         header_row: Header row object
+        direct_formatting: Whether to set size and bold on the new runs
+            instead of leaving them to the header paragraph style
     """
+
+    def add_label(paragraph, text):
+        run = paragraph.add_run(text)
+        if direct_formatting:
+            run.font.size = Pt(10)
+            run.bold = True
+        return run
+
     for cell in header_row.cells:
         for paragraph in cell.paragraphs:
             text = paragraph.text.strip()
@@ -616,33 +1008,21 @@ def normalize_header_labels(header_row):
                 continue
             if "Блок" in text:
                 paragraph.clear()
-                run = paragraph.add_run("Блок")
-                run.font.size = Pt(10)
-                run.bold = True
+                run = add_label(paragraph, "Блок")
             if "Устройство" in text:
                 paragraph.clear()
-                run = paragraph.add_run("Устройство")
-                run.font.size = Pt(10)
-                run.bold = True
+                run = add_label(paragraph, "Устройство")
             if "1-й" in text and "байт" in text:
                 paragraph.clear()
-                run = paragraph.add_run("1-й байт")
-                run.font.size = Pt(10)
-                run.bold = True
+                run = add_label(paragraph, "1-й байт")
             if "2-й" in text and "байт" in text:
                 paragraph.clear()
-                run = paragraph.add_run("2-й байт")
-                run.font.size = Pt(10)
-                run.bold = True
+                run = add_label(paragraph, "2-й байт")
             if "4-7" in text and "Data" in text:
                 paragraph.clear()
-                run = paragraph.add_run("4-7 ?байт")
-                run.font.size = Pt(10)
-                run.bold = True
+                run = add_label(paragraph, "4-7 ?байт")
                 run.add_break()
-                run2 = paragraph.add_run("(Data)")
-                run2.font.size = Pt(10)
-                run2.bold = True
+                add_label(paragraph, "(Data)")
 
 
 def get_header_min_width(header_text):
@@ -686,10 +1066,6 @@ def set_table_borders(table, tables_config: Dict[str, Any]):
         table: Table object
         tables_config: Tables configuration from profile
     """
-    border_style = tables_config.get("border_style", "single")
-    border_width = str(tables_config.get("border_width", 8))
-    border_color = tables_config.get("border_color", "000000")
-
     tbl = table._tbl
     tbl_pr = tbl.tblPr
     borders = tbl_pr.find(qn("w:tblBorders"))
@@ -697,17 +1073,57 @@ def set_table_borders(table, tables_config: Dict[str, Any]):
         borders = OxmlElement("w:tblBorders")
         tbl_pr.append(borders)
 
-    for edge in ("top", "left", "bottom", "right", "insideH", "insideV"):
-        element = borders.find(qn(f"w:{edge}"))
-        if element is None:
-            element = OxmlElement(f"w:{edge}")
-            borders.append(element)
+    _set_border_edges(borders, tables_config)
+
+
+def _set_border_edges(borders, tables_config: Dict[str, Any], edges=None):
+    """Set the profile border on the edges of a borders element.
+
+    Args:
+        borders: ``w:tblBorders`` or ``w:tcBorders`` element
+        tables_config: Tables configuration from profile
+        edges: Optional edge elements to update instead of all six edges
+    """
+    border_style = tables_config.get("border_style", "single")
+    border_width = str(tables_config.get("border_width", 8))
+    border_color = tables_config.get("border_color", "000000")
+
+    if edges is None:
+        edges = []
+        for edge in ("top", "left", "bottom", "right", "insideH", "insideV"):
+            element = borders.find(qn(f"w:{edge}"))
+            if element is None:
+                element = OxmlElement(f"w:{edge}")
+                borders.append(element)
+            edges.append(element)
+    for element in edges:
         element.set(qn("w:val"), border_style)
         element.set(qn("w:sz"), border_width)
         element.set(qn("w:space"), "0")
         element.set(qn("w:color"), border_color)
 
 
+def _remove_profile_borders(parent, tag, tables_config: Dict[str, Any]):
+    """Remove a direct borders element that only repeats the profile border.
+
+    Args:
+        parent: ``w:tblPr`` or ``w:tcPr`` element
+        tag: ``w:tblBorders`` or ``w:tcBorders``
+        tables_config: Tables configuration from profile
+    """
+    borders = parent.find(qn(tag))
+    if borders is None:
+        return
+    expected = {
+        qn("w:val"): tables_config.get("border_style", "single"),
+        qn("w:sz"): str(tables_config.get("border_width", 8)),
+        qn("w:space"): "0",
+        qn("w:color"): tables_config.get("border_color", "000000"),
+    }
+    if all(dict(edge.attrib) == expected for edge in borders):
+        parent.remove(borders)
+
+
 def set_cell_borders(cell, tables_config: Dict[str, Any]):
     """Set borders for a table cell based on profile.
 
@@ -715,10 +1131,6 @@ def set_cell_borders(cell, tables_config: Dict[str, Any]):
         cell: Cell object
         tables_config: Tables configuration from profile
     """
-    border_style = tables_config.get("border_style", "single")
-    border_width = str(tables_config.get("border_width", 8))
-    border_color = tables_config.get("border_color", "000000")
-
     tc = cell._tc
     tc_pr = tc.get_or_add_tcPr()
     borders = tc_pr.find(qn("w:tcBorders"))
@@ -726,17 +1138,7 @@ def set_cell_borders(cell, tables_config: Dict[str, Any]):
         borders = OxmlElement("w:tcBorders")
         tc_pr.append(borders)
 
-    for edge in ("top", "left", "bottom", "right", "insideH", "insideV"):
-        edge_tag = qn(f"w:{edge}")
-        element = borders.find(edge_tag)
-        if element is None:
-            element = OxmlElement(f"w:{edge}")
-            borders.append(element)
-        element.set(qn("w:val"), border_style)
-        element.set(qn("w:sz"), border_width)
-        element.set(qn("w:space"), "0")
-        element.set(qn("w:color"), border_color)
-
+    _set_border_edges(borders, tables_config)
 
 
 def get_cell_text(cell):
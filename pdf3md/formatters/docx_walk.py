@@ -0,0 +1,125 @@
+"""Single-pass paragraph walk over the body of a DOCX document.
+
+Cleanup and formatting steps are written as paragraph visitors and run
+together in one walk of the body XML. The walk resolves every paragraph
+style name once per document and hands visitors the raw ``w:p`` element,
+instead of each step rebuilding ``doc.paragraphs`` and looking up the style
+of every paragraph again.
+"""
+
+from abc import ABC, abstractmethod
+from typing import Dict, Iterable, Optional, Tuple
+
+from docx.enum.style import WD_STYLE_TYPE
+
+
+class ParagraphVisitor(ABC):
+    """One cleanup or formatting step of a paragraph walk."""
+
+    def prepare(self, doc):
+        """Apply document-level settings, such as styles, before the walk.
+
+        Args:
+            doc: Document object
+        """
+
+    @abstractmethod
+    def visit(self, p, style_name: Optional[str], index: int) -> bool:
+        """Process one body paragraph.
+
+        Args:
+            p: ``w:p`` element
+            style_name: Name of the paragraph style (e.g. ``Heading 1``),
+                resolved like ``Paragraph.style``
+            index: Position of the paragraph among the body paragraphs as
+                they were before the walk
+
+        Returns:
+            True to delete the paragraph; later visitors do not see it
+        """
+
+
+def paragraph_style_names(doc) -> Tuple[Dict[str, str], Optional[str]]:
+    """Map the paragraph style IDs of a document to style names.
+
+    Args:
+        doc: Document object
+
+    Returns:
+        Tuple of ({style ID: name}, name of the default paragraph style)
+    """
+    names = {
+        style.style_id: style.name
+        for style in doc.styles
+        if style.type == WD_STYLE_TYPE.PARAGRAPH
+    }
+    default = doc.styles.default(WD_STYLE_TYPE.PARAGRAPH)
+    return names, default.name if default is not None else None
+
+
+class ParagraphWalk:
+    """Dispatches paragraph visitors in a single walk of the document body."""
+
+    def __init__(self, doc, visitors: Iterable[ParagraphVisitor]):
+        """Initialize the walk.
+
+        Args:
+            doc: Document object
+            visitors: Visitors in the order they run on each paragraph
+        """
+        self.doc = doc
+        self.visitors = list(visitors)
+        self._names, self._default = paragraph_style_names(doc)
+
+    def style_name(self, p) -> Optional[str]:
+        """Get the style name of a paragraph, falling back to the default.
+
+        Args:
+            p: ``w:p`` element
+
+        Returns:
+            Paragraph style name
+        """
+        return self._names.get(p.style, self._default)
+
+    def visit(self, p, index: int = 0, visitors=None) -> bool:
+        """Run the visitors on one paragraph.
+
+        Args:
+            p: ``w:p`` element
+            index: Position of the paragraph in the body
+            visitors: Optional subset of the visitors to run, e.g. for a
+                paragraph inserted after the walk
+
+        Returns:
+            True if a visitor deleted the paragraph
+        """
+        style_name = self.style_name(p)
+        for visitor in self.visitors if visitors is None else visitors:
+            if visitor.visit(p, style_name, index):
+                p.getparent().remove(p)
+                return True
+        return False
+
+    def run(self, prepare: bool = True):
+        """Prepare all visitors, then visit every body paragraph once.
+
+        Args:
+            prepare: Whether to apply the visitors' document-level settings
+                first; False if the document already has them
+        """
+        if prepare:
+            for visitor in self.visitors:
+                visitor.prepare(self.doc)
+        for index, p in enumerate(self.doc.element.body.p_lst):
+            self.visit(p, index)
+
+
+def walk_paragraphs(doc, visitors: Iterable[ParagraphVisitor]):
+    """Run visitors over all body paragraphs of a document in one pass.
+
+    Args:
+        doc: Document object
+        visitors: Visitors in the order they run on each paragraph
+    """
+    ParagraphWalk(doc, visitors).run()
@@ -58,6 +58,9 @@ DEFAULT_PROFILE = {
         "space_before": 0,
         "space_after": 0,
     },
+    "formatting": {
+        "mode": "direct",  # direct, styles
+    },
 }
 
 
@@ -191,6 +194,11 @@ def validate_profile(
     ):
         return False, "page_numbers.custom_text must be string"
 
+    # Validate formatting mode
+    formatting = profile_data.get("formatting", {})
+    if "mode" in formatting and formatting["mode"] not in ["direct", "styles"]:
+        return False, "formatting.mode must be 'direct' or 'styles'"
+
     return True, None
 
 
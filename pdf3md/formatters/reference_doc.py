@@ -0,0 +1,200 @@
+"""Per-profile pandoc reference documents.
+
+The profile settings that styles and page setup can express (fonts, heading
+sizes, paragraph spacing, margins and table styles) are compiled into a copy
+of pandoc's default ``reference.docx``. Pandoc takes its styles and page
+setup from that document, so a Word export comes out of pandoc already
+styled and the python-docx pass only handles what styles cannot express.
+
+Compiled documents are cached on disk under a hash of the profile content,
+the default reference document and REFERENCE_DOC_VERSION.
+"""
+
+import os
+import json
+import time
+import hashlib
+import logging
+from collections import OrderedDict
+from io import BytesIO
+from threading import Lock
+from typing import Any, Dict, Optional
+
+from ..config import is_cache_enabled, is_reference_doc_enabled, get_cache_dir
+from ..utils import DiskCache
+from .docx_formatter import apply_profile_styles
+
+logger = logging.getLogger(__name__)
+
+# File name of the reference document in pandoc requests
+REFERENCE_DOC_NAME = "reference.docx"
+# Bump when compile_reference_doc changes what it writes
+REFERENCE_DOC_VERSION = 1
+# Size limit of the on-disk cache of compiled documents
+CACHE_MAX_BYTES = 16 * 1024 * 1024
+# Compiled documents kept in memory
+MEMORY_ENTRIES = 16
+# Seconds before loading pandoc's default reference document is retried
+RETRY_INTERVAL = 60
+
+# Profile fields that do not affect the compiled document
+_IGNORED_FIELDS = ("name", "description", "version")
+
+_reference_cache = None
+_reference_lock = Lock()
+_memory = OrderedDict()
+# (content, SHA-256) of pandoc's default reference.docx once loaded
+_default_reference = None
+# Monotonic time before which a failed load is not retried
+_default_reference_retry_at = 0.0
+
+
+def get_reference_doc_cache() -> Optional[DiskCache]:
+    """Get the global on-disk cache of compiled reference documents.
+
+    Returns:
+        DiskCache instance, or None if caching is disabled
+    """
+    global _reference_cache
+    if not is_cache_enabled():
+        return None
+    with _reference_lock:
+        if _reference_cache is None:
+            _reference_cache = DiskCache(
+                os.path.join(get_cache_dir(), "reference-docs"), CACHE_MAX_BYTES
+            )
+        return _reference_cache
+
+
+def _load_default_reference():
+    """Get pandoc's default reference.docx and its digest.
+
+    A successful load is kept for the process; after a failure, e.g. while
+    pandoc is still being installed, loading is retried after
+    RETRY_INTERVAL seconds.
+
+    Returns:
+        Tuple of (content, SHA-256), or (None, None) if unavailable
+    """
+    global _default_reference, _default_reference_retry_at
+    with _reference_lock:
+        if _default_reference is not None:
+            return _default_reference
+        if time.monotonic() < _default_reference_retry_at:
+            return None, None
+    from ..converters.pandoc_pool import PandocError, pandoc_data_file
+
+    try:
+        data = pandoc_data_file(REFERENCE_DOC_NAME)
+    except (OSError, PandocError) as e:
+        logger.warning(
+            f"Pandoc reference document unavailable, retrying in "
+            f"{RETRY_INTERVAL}s: {e}"
+        )
+        with _reference_lock:
+            _default_reference_retry_at = time.monotonic() + RETRY_INTERVAL
+        return None, None
+    loaded = (data, hashlib.sha256(data).hexdigest())
+    with _reference_lock:
+        _default_reference = loaded
+    return loaded
+
+
+def profile_hash(profile: Dict[str, Any], base_digest: str) -> str:
+    """Hash everything that influences a compiled reference document.
+
+    Args:
+        profile: Profile dictionary
+        base_digest: SHA-256 of the default reference document
+
+    Returns:
+        SHA-256 hex digest
+    """
+    content = {k: v for k, v in profile.items() if k not in _IGNORED_FIELDS}
+    key = json.dumps(
+        [REFERENCE_DOC_VERSION, base_digest, content], sort_keys=True, default=str
+    )
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+
+def compile_reference_doc(profile: Dict[str, Any], base: bytes) -> bytes:
+    """Compile a profile into a pandoc reference document.
+
+    Args:
+        profile: Profile dictionary
+        base: Default reference document to start from
+
+    Returns:
+        Reference document as bytes
+    """
+    from docx import Document
+
+    doc = Document(BytesIO(base))
+    apply_profile_styles(doc, profile)
+    output = BytesIO()
+    doc.save(output)
+    return output.getvalue()
+
+
+def get_reference_doc(profile: Dict[str, Any]) -> Optional[bytes]:
+    """Get the compiled reference document of a profile.
+
+    Args:
+        profile: Profile dictionary
+
+    Returns:
+        Reference document as bytes, or None if reference documents are
+        disabled or cannot be compiled
+    """
+    if not is_reference_doc_enabled():
+        return None
+    base, base_digest = _load_default_reference()
+    if base is None:
+        return None
+
+    key = profile_hash(profile, base_digest)
+    with _reference_lock:
+        data = _memory.get(key)
+        if data is not None:
+            _memory.move_to_end(key)
+            return data
+
+    cache = get_reference_doc_cache()
+    data = cache.get(key) if cache is not None else None
+    if data is None:
+        try:
+            data = compile_reference_doc(profile, base)
+        except Exception as e:
+            logger.warning(
+                f"Could not compile reference document for profile "
+                f"'{profile.get('name', 'default')}': {e}"
+            )
+            return None
+        logger.info(
+            f"Compiled reference document for profile "
+            f"'{profile.get('name', 'default')}' ({key[:12]})"
+        )
+        if cache is not None:
+            cache.put(key, data)
+
+    with _reference_lock:
+        _memory[key] = data
+        while len(_memory) > MEMORY_ENTRIES:
+            _memory.popitem(last=False)
+    return data
+
+
+def get_reference_doc_stats() -> Dict[str, Any]:
+    """Get reference document counters.
+
+    Returns:
+        Dictionary with the on-disk cache statistics and in-memory entries
+    """
+    cache = get_reference_doc_cache()
+    with _reference_lock:
+        memory_entries = len(_memory)
+    return {
+        "enabled": is_reference_doc_enabled(),
+        "memory_entries": memory_entries,
+        **(cache.stats() if cache is not None else {}),
+    }
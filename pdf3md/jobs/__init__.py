@@ -0,0 +1,50 @@
+"""Conversion job scheduling for pdf3md."""
+
+from .executor import (
+    JobExecutor,
+    QueueFullError,
+    JobFailedError,
+    FollowUp,
+    PRIORITY_HIGH,
+    PRIORITY_NORMAL,
+    PRIORITY_LOW,
+    get_job_executor,
+)
+from .cost_model import CostModel, scan_pdf_features, get_cost_model
+from .store import JobStore, MemoryJobStore, SQLiteJobStore, get_job_store
+from .results import ResultStore, ResultWriter, get_result_store
+from .isolation import WorkerSupervisor, WorkerCrashedError, get_worker_supervisor
+from .workspace import (
+    Workspace,
+    WorkspaceManager,
+    InsufficientSpaceError,
+    get_workspace_manager,
+)
+
+__all__ = [
+    "JobExecutor",
+    "QueueFullError",
+    "JobFailedError",
+    "FollowUp",
+    "PRIORITY_HIGH",
+    "PRIORITY_NORMAL",
+    "PRIORITY_LOW",
+    "get_job_executor",
+    "CostModel",
+    "scan_pdf_features",
+    "get_cost_model",
+    "JobStore",
+    "MemoryJobStore",
+    "SQLiteJobStore",
+    "get_job_store",
+    "WorkerSupervisor",
+    "WorkerCrashedError",
+    "get_worker_supervisor",
+    "ResultStore",
+    "ResultWriter",
+    "get_result_store",
+    "Workspace",
+    "WorkspaceManager",
+    "InsufficientSpaceError",
+    "get_workspace_manager",
+]
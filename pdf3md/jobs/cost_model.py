@@ -0,0 +1,136 @@
+"""Conversion cost model used for ETAs and shortest-job-first scheduling."""
+
+import logging
+from threading import Lock
+from typing import Any, Dict, Optional
+
+import pymupdf
+
+logger = logging.getLogger(__name__)
+
+# Pages whose drawings and text are inspected; other pages are extrapolated
+SAMPLE_PAGES = 8
+
+# Seconds of conversion time per unit of each feature
+DEFAULT_COEFFICIENTS = {
+    "pages": 0.3,
+    "images": 0.05,
+    "drawings": 0.0005,
+    "text_kchars": 0.02,
+}
+
+# Relative cost of conversion engines other than pymupdf4llm
+ENGINE_FACTORS = {"fast": 0.02}
+
+# Weight of the latest observation when calibrating the model
+CALIBRATION_SMOOTHING = 0.2
+MIN_SCALE = 0.1
+MAX_SCALE = 10.0
+
+
+def scan_pdf_features(doc, page_numbers=None) -> Dict[str, Any]:
+    """Collect cheap document features for cost prediction.
+
+    Page and image counts come from the page resources of every page.
+    Drawings and text are counted on evenly spaced sample pages only and
+    extrapolated, so the scan stays fast for documents with thousands of
+    pages.
+
+    Args:
+        doc: Open pymupdf.Document, or path to the PDF file
+        page_numbers: Optional 0-based pages to be converted; only these
+            are scanned, so the cost follows the selection size
+
+    Returns:
+        Dictionary with pages, images, drawings and text_kchars
+    """
+    owned = not isinstance(doc, pymupdf.Document)
+    if owned:
+        doc = pymupdf.open(doc)
+    try:
+        if page_numbers is None:
+            page_numbers = range(len(doc))
+        page_count = len(page_numbers)
+        images = sum(len(doc[pno].get_images()) for pno in page_numbers)
+
+        step = max(1, page_count // SAMPLE_PAGES)
+        samples = list(page_numbers[::step])[:SAMPLE_PAGES]
+        drawings = 0
+        text_chars = 0
+        for pno in samples:
+            page = doc[pno]
+            drawings += len(page.get_cdrawings())
+            text_chars += len(page.get_text("text"))
+    finally:
+        if owned:
+            doc.close()
+
+    factor = page_count / len(samples) if samples else 0
+    return {
+        "pages": page_count,
+        "images": images,
+        "drawings": int(drawings * factor),
+        "text_kchars": round(text_chars * factor / 1000, 1),
+    }
+
+
+class CostModel:
+    """Linear model predicting conversion time from document features.
+
+    A global scale factor is calibrated from observed job durations, which
+    absorbs differences in host speed and pymupdf4llm mode.
+    """
+
+    def __init__(self, coefficients=None):
+        """Initialize the cost model.
+
+        Args:
+            coefficients: Seconds per feature unit. Defaults to DEFAULT_COEFFICIENTS
+        """
+        self.coefficients = dict(coefficients or DEFAULT_COEFFICIENTS)
+        self.scale = 1.0
+        self._lock = Lock()
+
+    def predict(self, features: Dict[str, Any], engine: Optional[str] = None) -> float:
+        """Predict the conversion time of a document.
+
+        Args:
+            features: Features from scan_pdf_features()
+            engine: Optional conversion engine; defaults to pymupdf4llm
+
+        Returns:
+            Predicted conversion time in seconds
+        """
+        base = ENGINE_FACTORS.get(engine, 1.0) * sum(
+            weight * float(features.get(name, 0))
+            for name, weight in self.coefficients.items()
+        )
+        with self._lock:
+            return round(base * self.scale, 2)
+
+    def observe(self, predicted: float, actual: float):
+        """Calibrate the model with the actual duration of a finished job.
+
+        Args:
+            predicted: Prediction made for the job
+            actual: Measured job duration in seconds
+        """
+        if predicted <= 0 or actual <= 0:
+            return
+        with self._lock:
+            target = self.scale * actual / predicted
+            self.scale += CALIBRATION_SMOOTHING * (target - self.scale)
+            self.scale = min(MAX_SCALE, max(MIN_SCALE, self.scale))
+            logger.debug(f"Cost model scale calibrated to {self.scale:.3f}")
+
+
+_cost_model = CostModel()
+
+
+def get_cost_model() -> CostModel:
+    """Get the global cost model instance.
+
+    Returns:
+        CostModel instance
+    """
+    return _cost_model
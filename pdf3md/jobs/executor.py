@@ -0,0 +1,342 @@
+"""Bounded conversion job executor with admission control."""
+
+import time
+import logging
+from itertools import count
+from threading import Condition, Lock, Thread
+from typing import Optional
+
+from ..config import get_job_workers, get_job_queue_size
+from .cost_model import get_cost_model
+
+logger = logging.getLogger(__name__)
+
+# Weight of the latest job in the moving average of job durations
+DURATION_SMOOTHING = 0.2
+
+# Seconds of predicted cost forgiven per second a job waits. Short jobs go
+# first, but a long job overtakes new short ones once it has waited about
+# as long as it is expected to run.
+AGING_RATE = 1.0
+
+# Scheduling classes; a waiting job of a lower value always starts first
+PRIORITY_HIGH = 0
+PRIORITY_NORMAL = 1
+PRIORITY_LOW = 2
+
+
+class QueueFullError(Exception):
+    """Raised when a job is submitted while the queue is full."""
+
+    def __init__(self, retry_after):
+        super().__init__("Conversion queue is full")
+        self.retry_after = retry_after
+
+
+class JobFailedError(Exception):
+    """Raised by a job that did not succeed and has reported why itself.
+
+    The executor logs it quietly, and the job's duration is not used to
+    calibrate the cost model.
+    """
+
+
+class FollowUp:
+    """Continuation returned by a job to queue more work under its job ID.
+
+    The follow-up is queued once the returning job has been accounted for,
+    so it never races with the bookkeeping of the job that created it.
+    """
+
+    def __init__(self, fn, args=(), kwargs=None, cost=None, priority=PRIORITY_NORMAL):
+        """Initialize the follow-up.
+
+        Args:
+            fn: Callable running the follow-up
+            args: Positional arguments for fn
+            kwargs: Keyword arguments for fn
+            cost: Predicted run time in seconds, used for scheduling
+            priority: Scheduling class (PRIORITY_*)
+        """
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs or {}
+        self.cost = cost
+        self.priority = priority
+
+
+class JobExecutor:
+    """Fixed-size pool of worker threads fed by a bounded queue.
+
+    Waiting jobs are ordered by priority class, then shortest-job-first on
+    their predicted cost, with aging so that long jobs cannot starve within
+    their class. A job may return a FollowUp to queue more work under the
+    same job ID. Jobs can be cancelled while waiting or running. Only jobs
+    that succeeded and were not cancelled calibrate the cost model.
+    """
+
+    def __init__(self, workers: int, max_queue: int):
+        """Initialize the executor and start its worker threads.
+
+        Args:
+            workers: Number of jobs that run concurrently
+            max_queue: Number of jobs that may wait for a worker
+        """
+        self.workers = workers
+        self.max_queue = max_queue
+        self._pending = []
+        self._running = {}
+        self._cancelled = set()
+        self._sequence = count()
+        self._cond = Condition()
+        self._avg_duration = None
+        self.completed = 0
+        self.rejected = 0
+        self.cancelled = 0
+
+        for index in range(workers):
+            Thread(
+                target=self._work, name=f"pdf3md-job-{index}", daemon=True
+            ).start()
+        logger.info(
+            f"Started job executor with {workers} workers, queue size {max_queue}"
+        )
+
+    def check_capacity(self):
+        """Check that the queue has a free slot.
+
+        Raises:
+            QueueFullError: If the queue is full
+        """
+        with self._cond:
+            if len(self._pending) >= self.max_queue:
+                self.rejected += 1
+                raise QueueFullError(max(1, int(self._backlog_seconds())))
+
+    def submit(
+        self,
+        job_id: str,
+        fn,
+        args=(),
+        kwargs=None,
+        cost=None,
+        bounded=True,
+        priority=PRIORITY_NORMAL,
+    ):
+        """Queue a job.
+
+        Args:
+            job_id: Unique job ID
+            fn: Callable running the job
+            args: Positional arguments for fn
+            kwargs: Keyword arguments for fn
+            cost: Predicted run time in seconds, used for scheduling
+            bounded: Whether the queue limit applies. Batches are admitted
+                once as a whole and then queue all of their files.
+            priority: Scheduling class (PRIORITY_*)
+
+        Raises:
+            QueueFullError: If the queue has no free slot
+        """
+        with self._cond:
+            if bounded and len(self._pending) >= self.max_queue:
+                self.rejected += 1
+                raise QueueFullError(max(1, int(self._backlog_seconds())))
+            self._enqueue(job_id, fn, args, kwargs, cost, priority)
+
+    def _enqueue(self, job_id, fn, args, kwargs, cost, priority):
+        self._pending.append(
+            {
+                "job_id": job_id,
+                "fn": fn,
+                "args": args,
+                "kwargs": kwargs or {},
+                "cost": cost,
+                "priority": priority,
+                "queued_at": time.monotonic(),
+                "sequence": next(self._sequence),
+            }
+        )
+        self._cond.notify()
+
+    def _job_cost(self, job) -> float:
+        if job["cost"] is not None:
+            return job["cost"]
+        return self._avg_duration if self._avg_duration is not None else 10.0
+
+    def _schedule_order(self):
+        """Return waiting jobs in the order they will be started."""
+        now = time.monotonic()
+        return sorted(
+            self._pending,
+            key=lambda job: (
+                job["priority"],
+                self._job_cost(job) - AGING_RATE * (now - job["queued_at"]),
+                job["sequence"],
+            ),
+        )
+
+    def _running_remaining(self, job, fraction_done=None) -> float:
+        elapsed = time.monotonic() - job["started_at"]
+        if fraction_done:
+            return elapsed * (1 - fraction_done) / fraction_done
+        return max(self._job_cost(job) - elapsed, 0.0)
+
+    def _backlog_seconds(self) -> float:
+        work = sum(self._running_remaining(job) for job in self._running.values())
+        work += sum(self._job_cost(job) for job in self._pending)
+        return work / self.workers
+
+    def queue_position(self, job_id: str) -> Optional[int]:
+        """Get the 1-based queue position of a waiting job.
+
+        Args:
+            job_id: Job ID
+
+        Returns:
+            Position in the queue, or None if the job is not waiting
+        """
+        with self._cond:
+            for position, job in enumerate(self._schedule_order(), start=1):
+                if job["job_id"] == job_id:
+                    return position
+        return None
+
+    def eta(self, job_id: str, fraction_done=None) -> Optional[float]:
+        """Estimate the seconds until a job finishes.
+
+        Args:
+            job_id: Job ID
+            fraction_done: Share of the job already done (running jobs only)
+
+        Returns:
+            Estimated seconds, or None if the job is unknown to the executor
+        """
+        with self._cond:
+            if job_id in self._running:
+                if not fraction_done or not 0 < fraction_done < 1:
+                    fraction_done = None
+                job = self._running[job_id]
+                return round(self._running_remaining(job, fraction_done), 1)
+
+            work_ahead = sum(
+                self._running_remaining(job) for job in self._running.values()
+            )
+            for job in self._schedule_order():
+                if job["job_id"] == job_id:
+                    wait = work_ahead / self.workers
+                    return round(wait + self._job_cost(job), 1)
+                work_ahead += self._job_cost(job)
+        return None
+
+    def cancel(self, job_id: str):
+        """Cancel a waiting or running job.
+
+        A waiting job is removed from the queue. A running job is only
+        flagged, so that a follow-up it returns is dropped; the job itself
+        stops once it sees the cancellation in the job store.
+
+        Args:
+            job_id: Job ID
+
+        Returns:
+            Tuple of (state, job): state is "queued", "running" or None if
+            the executor does not know the job; job is the removed entry
+            of a waiting job (with its fn, args and kwargs), so the caller
+            can release what it holds, else None
+        """
+        with self._cond:
+            for job in self._pending:
+                if job["job_id"] == job_id:
+                    self._pending.remove(job)
+                    self.cancelled += 1
+                    return "queued", job
+            if job_id in self._running:
+                if job_id not in self._cancelled:
+                    self._cancelled.add(job_id)
+                    self.cancelled += 1
+                return "running", None
+        return None, None
+
+    def _work(self):
+        while True:
+            with self._cond:
+                while not self._pending:
+                    self._cond.wait()
+                job = self._schedule_order()[0]
+                self._pending.remove(job)
+                job["started_at"] = time.monotonic()
+                self._running[job["job_id"]] = job
+
+            follow_up = None
+            succeeded = False
+            try:
+                follow_up = job["fn"](*job["args"], **job["kwargs"])
+                succeeded = True
+            except JobFailedError as e:
+                logger.debug(f"Job {job['job_id']} did not complete: {e}")
+            except Exception as e:
+                logger.error(f"Job {job['job_id']} failed: {e}")
+            finally:
+                duration = time.monotonic() - job["started_at"]
+                with self._cond:
+                    self._running.pop(job["job_id"], None)
+                    if job["job_id"] in self._cancelled:
+                        self._cancelled.discard(job["job_id"])
+                        succeeded = False
+                        follow_up = None
+                    self.completed += 1
+                    # Failed and cancelled jobs say nothing about run times
+                    if succeeded and self._avg_duration is None:
+                        self._avg_duration = duration
+                    elif succeeded:
+                        self._avg_duration += DURATION_SMOOTHING * (
+                            duration - self._avg_duration
+                        )
+                    if isinstance(follow_up, FollowUp):
+                        self._enqueue(
+                            job["job_id"],
+                            follow_up.fn,
+                            follow_up.args,
+                            follow_up.kwargs,
+                            follow_up.cost,
+                            follow_up.priority,
+                        )
+                if succeeded and job["cost"] is not None:
+                    get_cost_model().observe(job["cost"], duration)
+
+    def stats(self):
+        """Get executor counters.
+
+        Returns:
+            Dictionary with queue and worker utilisation
+        """
+        with self._cond:
+            return {
+                "workers": self.workers,
+                "running": len(self._running),
+                "queued": len(self._pending),
+                "max_queue": self.max_queue,
+                "completed": self.completed,
+                "rejected": self.rejected,
+                "cancelled": self.cancelled,
+                "backlog_seconds": round(self._backlog_seconds(), 1),
+                "cost_scale": round(get_cost_model().scale, 3),
+            }
+
+
+_job_executor = None
+_job_executor_lock = Lock()
+
+
+def get_job_executor() -> JobExecutor:
+    """Get the global job executor instance.
+
+    Returns:
+        JobExecutor instance
+    """
+    global _job_executor
+    with _job_executor_lock:
+        if _job_executor is None:
+            _job_executor = JobExecutor(get_job_workers(), get_job_queue_size())
+        return _job_executor
@@ -0,0 +1,403 @@
+"""Recycled worker processes with per-job memory and CPU limits."""
+
+import os
+import signal
+import logging
+import multiprocessing
+from contextlib import contextmanager
+from threading import Lock, local
+
+from ..config import (
+    get_worker_max_jobs,
+    get_worker_max_rss_bytes,
+    get_job_memory_limit_bytes,
+    get_job_cpu_limit,
+)
+
+try:
+    import resource
+except ImportError:  # Not available on Windows; limits are not enforced
+    resource = None
+
+logger = logging.getLogger(__name__)
+
+# Seconds between liveness checks while waiting for a worker message
+POLL_INTERVAL = 1.0
+# Seconds a stopping worker gets before it is killed
+STOP_TIMEOUT = 5
+
+
+class WorkerCrashedError(RuntimeError):
+    """Raised when a worker process dies while running a job."""
+
+    def __init__(self, message, exitcode=None):
+        super().__init__(message)
+        self.exitcode = exitcode
+
+
+def _process_memory():
+    """Get the (address space, resident set) size of this process in bytes."""
+    try:
+        with open("/proc/self/statm") as f:
+            size, resident = f.read().split()[:2]
+        page_size = os.sysconf("SC_PAGE_SIZE")
+        return int(size) * page_size, int(resident) * page_size
+    except (OSError, ValueError):
+        return 0, 0
+
+
+def _set_soft_limit(kind, soft):
+    _, hard = resource.getrlimit(kind)
+    if soft is None:
+        soft = hard
+    elif hard != resource.RLIM_INFINITY:
+        soft = min(soft, hard)
+    resource.setrlimit(kind, (soft, hard))
+
+
+def _apply_job_limits(memory_limit, cpu_limit):
+    """Limit the address space and CPU time the next job may add."""
+    if resource is None:
+        return
+    address_space = _process_memory()[0]
+    if memory_limit and address_space:
+        _set_soft_limit(resource.RLIMIT_AS, address_space + memory_limit)
+    if cpu_limit:
+        usage = resource.getrusage(resource.RUSAGE_SELF)
+        used = usage.ru_utime + usage.ru_stime
+        _set_soft_limit(resource.RLIMIT_CPU, int(used + cpu_limit) + 1)
+
+
+def _clear_job_limits():
+    if resource is None:
+        return
+    _set_soft_limit(resource.RLIMIT_AS, None)
+    _set_soft_limit(resource.RLIMIT_CPU, None)
+
+
+@contextmanager
+def job_limits(memory_limit, cpu_limit):
+    """Run one job of a worker process under per-job limits.
+
+    Exceeding the CPU limit kills the process with SIGXCPU; exceeding the
+    memory limit makes allocations in it fail.
+
+    Args:
+        memory_limit: Address space in bytes the job may add, 0 for no limit
+        cpu_limit: CPU seconds the job may use, 0 for no limit
+    """
+    _apply_job_limits(memory_limit, cpu_limit)
+    try:
+        yield
+    finally:
+        _clear_job_limits()
+
+
+def _call(fn, args, kwargs):
+    yield fn(*args, **kwargs)
+
+
+def _worker_main(conn, memory_limit, cpu_limit):
+    """Serve jobs sent by the parent until told to stop. Runs in the child.
+
+    Each job is a generator function and its arguments; every item it
+    yields is sent back as soon as it is produced.
+    """
+    # Interrupts are handled by the server, which stops its workers
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    while True:
+        try:
+            message = conn.recv()
+        except (EOFError, OSError):
+            break
+        if message is None:
+            break
+
+        fn, args, kwargs = message
+        try:
+            with job_limits(memory_limit, cpu_limit):
+                for item in fn(*args, **kwargs):
+                    conn.send(("item", item))
+            reply = ("done", None)
+        except Exception as e:
+            error = type(e).__name__
+            reply = ("error", f"{error}: {e}" if str(e) else error)
+        conn.send((*reply, _process_memory()[1]))
+    conn.close()
+
+
+def describe_exit(exitcode, cpu_limit):
+    """Describe why a worker process ended.
+
+    Args:
+        exitcode: multiprocessing exit code (negative for signals)
+        cpu_limit: Configured CPU limit in seconds
+
+    Returns:
+        Human readable reason
+    """
+    if exitcode == -getattr(signal, "SIGXCPU", 0):
+        return f"Conversion exceeded the CPU time limit of {cpu_limit}s"
+    if exitcode == -getattr(signal, "SIGKILL", 0):
+        return "Conversion worker was killed, most likely out of memory"
+    return f"Conversion worker exited unexpectedly (exit code {exitcode})"
+
+
+class IsolatedWorker:
+    """One worker process running jobs for one server thread.
+
+    The process is started on first use and replaced after ``max_jobs``
+    jobs, when its resident memory passes ``max_rss_bytes``, after a job
+    failed or after it died.
+    """
+
+    def __init__(self, supervisor):
+        """Initialize the worker. Use WorkerSupervisor.worker() instead.
+
+        Args:
+            supervisor: Owning WorkerSupervisor
+        """
+        self.supervisor = supervisor
+        self.process = None
+        self.conn = None
+        self.jobs = 0
+
+    def _start(self):
+        context = multiprocessing.get_context("spawn")
+        parent_conn, child_conn = context.Pipe()
+        process = context.Process(
+            target=_worker_main,
+            args=(
+                child_conn,
+                self.supervisor.memory_limit,
+                self.supervisor.cpu_limit,
+            ),
+            name="pdf3md-worker",
+            daemon=True,
+        )
+        try:
+            process.start()
+        except BaseException:
+            parent_conn.close()
+            raise
+        finally:
+            child_conn.close()
+        self.process = process
+        self.conn = parent_conn
+        self.jobs = 0
+        self.supervisor._count("started")
+        logger.debug(f"Started worker process {self.process.pid}")
+
+    def stop(self, reason=None):
+        """Stop the worker process; the next job starts a fresh one.
+
+        Args:
+            reason: Optional recycling reason counted in the statistics
+        """
+        if self.process is None:
+            return
+        try:
+            self.conn.send(None)
+        except OSError:
+            pass
+        self.process.join(STOP_TIMEOUT)
+        if self.process.is_alive():
+            self.process.kill()
+            self.process.join()
+        self.conn.close()
+        if reason:
+            self.supervisor._count(f"recycled_{reason}")
+            logger.debug(f"Recycled worker process {self.process.pid} ({reason})")
+        self.process = None
+        self.conn = None
+
+    def _kill(self):
+        if self.process is None:
+            return
+        self.process.kill()
+        self.process.join()
+        self.conn.close()
+        self.process = None
+        self.conn = None
+
+    def _receive(self):
+        while not self.conn.poll(POLL_INTERVAL):
+            if not self.process.is_alive():
+                break
+        try:
+            return self.conn.recv()
+        except (EOFError, OSError):
+            self.process.join(STOP_TIMEOUT)
+            exitcode = self.process.exitcode
+            self._kill()
+            self.supervisor._count("crashed")
+            message = describe_exit(exitcode, self.supervisor.cpu_limit)
+            logger.error(message)
+            raise WorkerCrashedError(message, exitcode) from None
+
+    def run(self, fn, *args, **kwargs):
+        """Run a generator function in the worker process.
+
+        Args:
+            fn: Module-level generator function
+            *args: Positional arguments for fn
+            **kwargs: Keyword arguments for fn
+
+        Yields:
+            Items yielded by fn, as they are produced
+
+        Raises:
+            WorkerCrashedError: If the worker process died
+            RuntimeError: If fn raised an exception in the worker
+        """
+        if self.process is None or not self.process.is_alive():
+            if self.process is not None:
+                self._kill()
+            self._start()
+
+        self.conn.send((fn, args, kwargs))
+        finished = False
+        try:
+            while True:
+                kind, payload, *rest = self._receive()
+                if kind == "item":
+                    yield payload
+                    continue
+
+                finished = True
+                self.jobs += 1
+                if kind == "error":
+                    self.stop("error")
+                    raise RuntimeError(payload)
+                if self.jobs >= self.supervisor.max_jobs:
+                    self.stop("jobs")
+                elif rest and rest[0] > self.supervisor.max_rss_bytes:
+                    self.stop("rss")
+                return
+        finally:
+            if not finished:
+                # Abandoned mid-job: the process may still be busy with it
+                self._kill()
+
+
+class WorkerSupervisor:
+    """Hands each server thread its own isolated worker process."""
+
+    def __init__(self, max_jobs, max_rss_bytes, memory_limit, cpu_limit):
+        """Initialize the supervisor.
+
+        Args:
+            max_jobs: Jobs after which a worker is recycled
+            max_rss_bytes: Resident memory after which a worker is recycled
+            memory_limit: Address space in bytes a job may add, 0 for no limit
+            cpu_limit: CPU seconds a job may use, 0 for no limit
+        """
+        self.max_jobs = max_jobs
+        self.max_rss_bytes = max_rss_bytes
+        self.memory_limit = memory_limit
+        self.cpu_limit = cpu_limit
+        self._local = local()
+        self._workers = []
+        self._lock = Lock()
+        self._counters = {}
+        if resource is None:
+            logger.warning("Per-job memory and CPU limits are not supported here")
+
+    def _count(self, name):
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + 1
+
+    def worker(self) -> IsolatedWorker:
+        """Get the worker of the calling thread.
+
+        Returns:
+            IsolatedWorker instance
+        """
+        worker = getattr(self._local, "worker", None)
+        if worker is None:
+            worker = IsolatedWorker(self)
+            self._local.worker = worker
+            with self._lock:
+                self._workers.append(worker)
+        return worker
+
+    def run(self, fn, *args, **kwargs):
+        """Run a generator function in the calling thread's worker.
+
+        Args:
+            fn: Module-level generator function
+            *args: Positional arguments for fn
+            **kwargs: Keyword arguments for fn
+
+        Returns:
+            Iterator over the items yielded by fn
+        """
+        return self.worker().run(fn, *args, **kwargs)
+
+    def call(self, fn, *args, **kwargs):
+        """Call a function in the calling thread's worker.
+
+        Args:
+            fn: Module-level function
+            *args: Positional arguments for fn
+            **kwargs: Keyword arguments for fn
+
+        Returns:
+            Return value of fn
+
+        Raises:
+            WorkerCrashedError: If the worker process died
+            RuntimeError: If fn raised an exception in the worker
+        """
+        (result,) = self.run(_call, fn, args, kwargs)
+        return result
+
+    def stop(self):
+        """Stop all worker processes."""
+        with self._lock:
+            workers = list(self._workers)
+        for worker in workers:
+            worker.stop()
+
+    def stats(self):
+        """Get worker process counters.
+
+        Returns:
+            Dictionary with limits, live workers and counters
+        """
+        with self._lock:
+            alive = sum(
+                worker.process is not None and worker.process.is_alive()
+                for worker in self._workers
+            )
+            return {
+                "workers_alive": alive,
+                "max_jobs": self.max_jobs,
+                "max_rss_bytes": self.max_rss_bytes,
+                "job_memory_limit_bytes": self.memory_limit,
+                "job_cpu_limit_seconds": self.cpu_limit,
+                "limits_enforced": resource is not None,
+                **self._counters,
+            }
+
+
+_worker_supervisor = None
+_worker_supervisor_lock = Lock()
+
+
+def get_worker_supervisor() -> WorkerSupervisor:
+    """Get the global worker supervisor instance.
+
+    Returns:
+        WorkerSupervisor instance
+    """
+    global _worker_supervisor
+    with _worker_supervisor_lock:
+        if _worker_supervisor is None:
+            _worker_supervisor = WorkerSupervisor(
+                get_worker_max_jobs(),
+                get_worker_max_rss_bytes(),
+                get_job_memory_limit_bytes(),
+                get_job_cpu_limit(),
+            )
+        return _worker_supervisor
@@ -0,0 +1,328 @@
+"""On-disk store of finished conversion results."""
+
+import os
+import gzip
+import time
+import hashlib
+import logging
+import tempfile
+from threading import Event, Lock, Thread
+from typing import Any, Dict, Optional
+
+from ..config import get_result_dir, get_job_ttl
+
+try:
+    import zstandard
+except ImportError:  # Optional dependency, enables zstd responses
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+# Content codings stored next to each result, in order of preference
+ENCODINGS = ("zstd", "gzip", "identity") if zstandard else ("gzip", "identity")
+
+FILE_SUFFIXES = {"identity": ".md", "gzip": ".md.gz", "zstd": ".md.zst"}
+
+GZIP_LEVEL = 6
+ZSTD_LEVEL = 10
+
+# Bounds of the interval between reaper runs, in seconds
+MIN_REAP_INTERVAL = 5
+MAX_REAP_INTERVAL = 60
+
+
+class ResultWriter:
+    """Writes a result in every encoding while its markdown is produced.
+
+    Markdown is encoded and compressed piece by piece into temporary files,
+    so the whole document never has to be held in memory. commit() moves
+    the files into place; abort() removes them.
+    """
+
+    def __init__(self, store: "ResultStore", job_id: str):
+        """Open temporary files for every encoding of the store.
+
+        Args:
+            store: ResultStore the result belongs to
+            job_id: Storage name from ResultStore.name()
+        """
+        self.store = store
+        self.job_id = job_id
+        self.size = 0
+        self._hasher = hashlib.sha256()
+        # Tuples of (encoding, temporary path, file, compressing stream)
+        self._outputs = []
+        try:
+            for encoding in store.encodings:
+                fd, tmp_path = tempfile.mkstemp(prefix=".", dir=store.root)
+                f = os.fdopen(fd, "wb")
+                if encoding == "gzip":
+                    stream = gzip.GzipFile(
+                        fileobj=f, mode="wb", compresslevel=GZIP_LEVEL
+                    )
+                elif encoding == "zstd":
+                    compressor = zstandard.ZstdCompressor(level=ZSTD_LEVEL)
+                    stream = compressor.stream_writer(f, closefd=False)
+                else:
+                    stream = f
+                self._outputs.append((encoding, tmp_path, f, stream))
+        except Exception:
+            self.abort()
+            raise
+
+    def write(self, markdown: str):
+        """Append markdown to the result.
+
+        Args:
+            markdown: Next piece of the markdown, in document order
+        """
+        data = markdown.encode("utf-8")
+        self.size += len(data)
+        self._hasher.update(data)
+        for _encoding, _tmp_path, _f, stream in self._outputs:
+            stream.write(data)
+
+    def _close(self):
+        for _encoding, _tmp_path, f, stream in self._outputs:
+            if stream is not f:
+                stream.close()
+            f.close()
+
+    def commit(self) -> Dict[str, Any]:
+        """Finish all encodings and move them into place.
+
+        Returns:
+            Dictionary with ``size`` in bytes and the content ``digest``
+        """
+        try:
+            self._close()
+            # The uncompressed file is the last of the outputs; its presence
+            # marks the result as complete
+            for encoding, tmp_path, _f, _stream in self._outputs:
+                os.replace(tmp_path, self.store.path(self.job_id, encoding))
+        except OSError:
+            self.abort()
+            raise
+        self._outputs = []
+        with self.store._lock:
+            self.store.saved += 1
+        return {"size": self.size, "digest": self._hasher.hexdigest()}
+
+    def abort(self):
+        """Discard the result written so far."""
+        for _encoding, tmp_path, f, stream in self._outputs:
+            try:
+                if stream is not f:
+                    stream.close()
+                f.close()
+            except (OSError, ValueError):
+                pass
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        self._outputs = []
+
+
+class ResultStore:
+    """Spills finished markdown to disk, precompressed for every encoding.
+
+    Results are written once when a job finishes and served straight from
+    the files, so the markdown is neither kept in the job store nor
+    re-serialized on every progress poll. Files expire with their job after
+    ``ttl`` seconds.
+    """
+
+    def __init__(self, root: str, ttl: int):
+        """Initialize the store and start its reaper thread.
+
+        Args:
+            root: Directory holding result files
+            ttl: Seconds a result is kept after it was written
+        """
+        self.root = root
+        self.ttl = ttl
+        self.encodings = ENCODINGS
+        self._stop = Event()
+        self._lock = Lock()
+        self.saved = 0
+        self.expired = 0
+
+        os.makedirs(self.root, exist_ok=True)
+        interval = min(MAX_REAP_INTERVAL, max(MIN_REAP_INTERVAL, ttl // 4))
+        Thread(
+            target=self._reaper, args=(interval,), name="pdf3md-results", daemon=True
+        ).start()
+
+    @staticmethod
+    def name(job_id: str, variant: Optional[str] = None) -> str:
+        """Get the storage name of a result.
+
+        Args:
+            job_id: Job ID
+            variant: Optional result variant, such as ``preview``
+
+        Returns:
+            Name to pass to path(), exists() and delete()
+        """
+        return f"{job_id}.{variant}" if variant else job_id
+
+    def path(self, job_id: str, encoding: str = "identity") -> str:
+        """Get the file path of a result.
+
+        Args:
+            job_id: Job ID
+            encoding: Content coding, one of ENCODINGS
+
+        Returns:
+            File path (which may not exist)
+        """
+        return os.path.join(self.root, job_id + FILE_SUFFIXES[encoding])
+
+    def writer(self, job_id: str) -> ResultWriter:
+        """Start writing a result piece by piece.
+
+        Args:
+            job_id: Storage name from name()
+
+        Returns:
+            ResultWriter; commit() it once all markdown has been written
+        """
+        return ResultWriter(self, job_id)
+
+    def save(self, job_id: str, markdown: str) -> Dict[str, Any]:
+        """Write the result of a job in every supported encoding.
+
+        Args:
+            job_id: Job ID
+            markdown: Converted markdown
+
+        Returns:
+            Dictionary with ``size`` in bytes and the content ``digest``
+        """
+        writer = self.writer(job_id)
+        try:
+            writer.write(markdown)
+        except Exception:
+            writer.abort()
+            raise
+        return writer.commit()
+
+    def spill(
+        self,
+        job_id: str,
+        result: Dict[str, Any],
+        variant: Optional[str] = None,
+        writer: Optional[ResultWriter] = None,
+    ) -> Dict[str, Any]:
+        """Move the markdown of a result payload to disk.
+
+        Args:
+            job_id: Job ID
+            result: Result payload from build_result()
+            variant: Optional result variant, such as ``preview``
+            writer: Optional ResultWriter that already holds the markdown;
+                it is committed and the payload's ``markdown`` is ignored
+
+        Returns:
+            Copy of the payload without ``markdown``, with ``result_url``,
+            ``resultSize`` and ``digest``
+        """
+        result = dict(result)
+        markdown = result.pop("markdown", None) or ""
+        if writer is not None:
+            saved = writer.commit()
+        else:
+            saved = self.save(self.name(job_id, variant), markdown)
+        result_url = f"/result/{job_id}"
+        if variant:
+            result_url += f"?variant={variant}"
+        result.update(
+            result_url=result_url,
+            resultSize=saved["size"],
+            digest=saved["digest"],
+        )
+        return result
+
+    def exists(self, job_id: str) -> bool:
+        """Check whether a job has a stored result.
+
+        Args:
+            job_id: Job ID
+
+        Returns:
+            True if the result can be served
+        """
+        return os.path.exists(self.path(job_id))
+
+    def delete(self, job_id: str):
+        """Remove all files of a result.
+
+        Args:
+            job_id: Job ID
+        """
+        for encoding in FILE_SUFFIXES:
+            try:
+                os.remove(self.path(job_id, encoding))
+            except FileNotFoundError:
+                pass
+
+    def reap(self) -> int:
+        """Remove results older than the TTL.
+
+        Returns:
+            Number of files removed
+        """
+        deadline = time.time() - self.ttl
+        removed = 0
+        for entry in os.scandir(self.root):
+            try:
+                if entry.stat().st_mtime < deadline:
+                    os.remove(entry.path)
+                    removed += 1
+            except OSError:
+                continue
+        with self._lock:
+            self.expired += removed
+        return removed
+
+    def _reaper(self, interval: int):
+        while not self._stop.wait(interval):
+            try:
+                self.reap()
+            except Exception as e:
+                logger.error(f"Result reaper failed: {e}")
+
+    def stop(self):
+        """Stop the reaper thread."""
+        self._stop.set()
+
+    def stats(self):
+        """Get result store counters.
+
+        Returns:
+            Dictionary with location, encodings and counters
+        """
+        with self._lock:
+            return {
+                "root": self.root,
+                "encodings": list(self.encodings),
+                "saved": self.saved,
+                "expired_files": self.expired,
+                "ttl_seconds": self.ttl,
+            }
+
+
+_result_store = None
+_result_store_lock = Lock()
+
+
+def get_result_store() -> ResultStore:
+    """Get the global result store instance.
+
+    Returns:
+        ResultStore instance
+    """
+    global _result_store
+    with _result_store_lock:
+        if _result_store is None:
+            _result_store = ResultStore(get_result_dir(), get_job_ttl())
+        return _result_store
@@ -0,0 +1,690 @@
+"""Job state stores shared by the web routes and the conversion jobs."""
+
+import os
+import json
+import time
+import sqlite3
+import logging
+import threading
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from threading import Condition, Event, Lock, Thread
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..config import (
+    get_job_store_backend,
+    get_job_store_path,
+    get_job_ttl,
+    get_job_store_max_bytes,
+)
+
+logger = logging.getLogger(__name__)
+
+# Statuses after which a job no longer changes and may expire
+FINISHED_STATUSES = ("completed", "error")
+
+# Bounds of the interval between reaper runs, in seconds
+MIN_REAP_INTERVAL = 5
+MAX_REAP_INTERVAL = 60
+
+# Rough per-entry bookkeeping overhead used by the memory budget
+ENTRY_OVERHEAD_BYTES = 512
+
+
+def estimate_size(value) -> int:
+    """Estimate the memory held by a JSON-like value.
+
+    Args:
+        value: Dict, list, string or scalar
+
+    Returns:
+        Approximate size in bytes
+    """
+    if isinstance(value, str):
+        return len(value)
+    if isinstance(value, dict):
+        return sum(len(key) + estimate_size(item) for key, item in value.items())
+    if isinstance(value, (list, tuple)):
+        return sum(estimate_size(item) for item in value)
+    return 8
+
+
+class JobStore(ABC):
+    """Interface of job state stores.
+
+    A job has a dictionary of fields (status, progress, stage, result, ...)
+    and an append-only list of page chunks for streaming clients. Every
+    change bumps the job's version and wakes threads blocked in wait(), so
+    clients are pushed updates instead of re-reading the store. Finished
+    jobs expire ``ttl`` seconds after their last update.
+
+    Cancellations are recorded in the store as well, so a job notices
+    them in whichever server process runs it.
+    """
+
+    # Seconds between version checks while waiting; None relies on
+    # notifications alone, which only works if all writers share the process
+    poll_interval = None
+
+    def __init__(self, ttl: int):
+        """Initialize the store and start its reaper thread.
+
+        Args:
+            ttl: Seconds a finished job is kept after its last update
+        """
+        self.ttl = ttl
+        self.expired = 0
+        self._waiters = {}
+        self._waiters_lock = Lock()
+        self._stop = Event()
+        interval = min(MAX_REAP_INTERVAL, max(MIN_REAP_INTERVAL, ttl // 4))
+        Thread(
+            target=self._reaper, args=(interval,), name="pdf3md-job-reaper", daemon=True
+        ).start()
+
+    @abstractmethod
+    def put(self, job_id: str, fields: Dict[str, Any], chunks=None):
+        """Create or replace a job, dropping its previous page chunks.
+
+        Cancelled jobs are not created again.
+
+        Args:
+            job_id: Job ID
+            fields: Job fields
+            chunks: Optional initial page chunks
+        """
+
+    @abstractmethod
+    def snapshot(self, job_id: str) -> Tuple[Optional[Dict[str, Any]], Optional[int]]:
+        """Get a copy of the fields of a job together with its version.
+
+        Args:
+            job_id: Job ID
+
+        Returns:
+            Tuple of (job fields, version), or (None, None) if the job is
+            unknown or expired
+        """
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Get a copy of the fields of a job.
+
+        Args:
+            job_id: Job ID
+
+        Returns:
+            Job fields, or None if the job is unknown or expired
+        """
+        return self.snapshot(job_id)[0]
+
+    def version(self, job_id: str) -> Optional[int]:
+        """Get the version of a job, bumped on every change.
+
+        Args:
+            job_id: Job ID
+
+        Returns:
+            Version number, or None if the job is unknown or expired
+        """
+        return self.snapshot(job_id)[1]
+
+    def wait(self, job_id: str, version: Optional[int], timeout: float):
+        """Block until the version of a job differs from ``version``.
+
+        Args:
+            job_id: Job ID
+            version: Version the caller has already seen
+            timeout: Maximum seconds to wait
+
+        Returns:
+            Current version (None once the job is gone)
+        """
+        deadline = time.monotonic() + timeout
+        with self._waiters_lock:
+            entry = self._waiters.setdefault(job_id, [Condition(), 0])
+            entry[1] += 1
+        cond = entry[0]
+        try:
+            with cond:
+                while True:
+                    current = self.version(job_id)
+                    remaining = deadline - time.monotonic()
+                    if current != version or remaining <= 0:
+                        return current
+                    if self.poll_interval is not None:
+                        remaining = min(remaining, self.poll_interval)
+                    cond.wait(remaining)
+        finally:
+            with self._waiters_lock:
+                entry[1] -= 1
+                if entry[1] == 0:
+                    self._waiters.pop(job_id, None)
+
+    def _notify(self, job_id: str):
+        """Wake threads waiting for changes of a job."""
+        with self._waiters_lock:
+            entry = self._waiters.get(job_id)
+        if entry is not None:
+            with entry[0]:
+                entry[0].notify_all()
+
+    @abstractmethod
+    def update(self, job_id: str, **fields) -> bool:
+        """Merge fields into an existing job.
+
+        Args:
+            job_id: Job ID
+            **fields: Fields to set
+
+        Returns:
+            False if the job is unknown
+        """
+
+    @abstractmethod
+    def delete(self, job_id: str):
+        """Remove a job and its chunks.
+
+        Args:
+            job_id: Job ID
+        """
+
+    @abstractmethod
+    def cancel(self, job_id: str):
+        """Remove a job and its chunks and mark it as cancelled.
+
+        The mark outlives the job by ``ttl`` seconds.
+
+        Args:
+            job_id: Job ID
+        """
+
+    @abstractmethod
+    def is_cancelled(self, job_id: str) -> bool:
+        """Check whether a job has been cancelled.
+
+        Args:
+            job_id: Job ID
+
+        Returns:
+            True once cancel() has been called for the job
+        """
+
+    @abstractmethod
+    def append_chunk(self, job_id: str, chunk: Dict[str, Any]) -> Optional[int]:
+        """Append a page chunk to a job.
+
+        Args:
+            job_id: Job ID
+            chunk: Chunk payload
+
+        Returns:
+            Index of the chunk, or None if the job is unknown
+        """
+
+    @abstractmethod
+    def get_chunks(self, job_id: str, start: int = 0) -> List[Dict[str, Any]]:
+        """Get the page chunks of a job.
+
+        Args:
+            job_id: Job ID
+            start: Index of the first chunk to return
+
+        Returns:
+            Chunks from ``start`` on, in append order
+        """
+
+    @abstractmethod
+    def reap(self) -> int:
+        """Remove finished jobs and cancellation marks older than the TTL.
+
+        Returns:
+            Number of jobs removed
+        """
+
+    @abstractmethod
+    def stats(self) -> Dict[str, Any]:
+        """Get store counters.
+
+        Returns:
+            Dictionary with backend name, job count and counters
+        """
+
+    def __contains__(self, job_id: str) -> bool:
+        return self.get(job_id) is not None
+
+    def _reaper(self, interval: int):
+        while not self._stop.wait(interval):
+            try:
+                self.reap()
+            except Exception as e:
+                logger.error(f"Job store reaper failed: {e}")
+
+    def stop(self):
+        """Stop the reaper thread."""
+        self._stop.set()
+
+
+class MemoryJobStore(JobStore):
+    """In-process job store with a TTL reaper and a memory budget.
+
+    When the estimated size of all jobs exceeds the budget, the least
+    recently updated finished jobs are evicted first. Queued and running
+    jobs are never evicted; their number is bounded by the job executor.
+
+    Page chunks are dropped as soon as a job finishes: by then its markdown
+    is in the result store, and keeping the pages until the job expires
+    would hold a second copy of every document in memory.
+    """
+
+    def __init__(self, ttl: int, max_bytes: int):
+        """Initialize the store.
+
+        Args:
+            ttl: Seconds a finished job is kept after its last update
+            max_bytes: Memory budget for all jobs
+        """
+        self.max_bytes = max_bytes
+        self._jobs = OrderedDict()
+        self._cancelled = {}
+        self._lock = Lock()
+        self._total_bytes = 0
+        self.evicted = 0
+        super().__init__(ttl)
+
+    def _resize(self, job):
+        size = ENTRY_OVERHEAD_BYTES + estimate_size(job["fields"]) + job["chunk_bytes"]
+        self._total_bytes += size - job["size"]
+        job["size"] = size
+
+    @staticmethod
+    def _release_chunks(job):
+        if job["fields"].get("status") in FINISHED_STATUSES:
+            job["chunks"] = []
+            job["chunk_bytes"] = 0
+
+    def _touch(self, job_id, job):
+        job["updated"] = time.monotonic()
+        self._jobs.move_to_end(job_id)
+
+    def _drop(self, job_id):
+        job = self._jobs.pop(job_id, None)
+        if job is not None:
+            self._total_bytes -= job["size"]
+
+    def _evict(self):
+        if self._total_bytes <= self.max_bytes:
+            return
+        for job_id in list(self._jobs):
+            if self._total_bytes <= self.max_bytes:
+                break
+            if self._jobs[job_id]["fields"].get("status") in FINISHED_STATUSES:
+                self._drop(job_id)
+                self.evicted += 1
+                logger.debug(f"Evicted job {job_id} from job store")
+
+    def put(self, job_id, fields, chunks=None):
+        chunks = list(chunks or [])
+        job = {
+            "fields": dict(fields),
+            "chunks": chunks,
+            "chunk_bytes": estimate_size(chunks),
+            "size": 0,
+        }
+        with self._lock:
+            if job_id in self._cancelled:
+                return
+            previous = self._jobs.get(job_id)
+            job["version"] = previous["version"] + 1 if previous else 1
+            self._release_chunks(job)
+            self._drop(job_id)
+            self._jobs[job_id] = job
+            self._touch(job_id, job)
+            self._resize(job)
+            self._evict()
+        self._notify(job_id)
+
+    def snapshot(self, job_id):
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return None, None
+            return dict(job["fields"]), job["version"]
+
+    def update(self, job_id, **fields):
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return False
+            job["fields"].update(fields)
+            job["version"] += 1
+            self._release_chunks(job)
+            self._touch(job_id, job)
+            self._resize(job)
+            self._evict()
+        self._notify(job_id)
+        return True
+
+    def delete(self, job_id):
+        with self._lock:
+            self._drop(job_id)
+        self._notify(job_id)
+
+    def cancel(self, job_id):
+        with self._lock:
+            self._drop(job_id)
+            self._cancelled[job_id] = time.monotonic()
+        self._notify(job_id)
+
+    def is_cancelled(self, job_id):
+        with self._lock:
+            return job_id in self._cancelled
+
+    def append_chunk(self, job_id, chunk):
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return None
+            job["chunks"].append(chunk)
+            job["chunk_bytes"] += estimate_size(chunk)
+            job["version"] += 1
+            self._touch(job_id, job)
+            self._resize(job)
+            index = len(job["chunks"]) - 1
+        self._notify(job_id)
+        return index
+
+    def get_chunks(self, job_id, start=0):
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return job["chunks"][start:] if job is not None else []
+
+    def reap(self):
+        deadline = time.monotonic() - self.ttl
+        with self._lock:
+            expired = [
+                job_id
+                for job_id, job in self._jobs.items()
+                if job["updated"] < deadline
+                and job["fields"].get("status") in FINISHED_STATUSES
+            ]
+            for job_id in expired:
+                self._drop(job_id)
+            self.expired += len(expired)
+            for job_id, cancelled in list(self._cancelled.items()):
+                if cancelled < deadline:
+                    del self._cancelled[job_id]
+        for job_id in expired:
+            self._notify(job_id)
+        if expired:
+            logger.debug(f"Expired {len(expired)} finished jobs")
+        return len(expired)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "backend": "memory",
+                "jobs": len(self._jobs),
+                "bytes": self._total_bytes,
+                "max_bytes": self.max_bytes,
+                "expired": self.expired,
+                "evicted": self.evicted,
+                "ttl_seconds": self.ttl,
+            }
+
+
+class SQLiteJobStore(JobStore):
+    """Job store in a SQLite database shared by several server processes.
+
+    Each thread uses its own connection. The database runs in WAL mode so
+    that progress polls in one process do not block conversions writing
+    from another. Waiters are notified of changes made in this process
+    immediately and check for changes made by other processes every
+    ``poll_interval`` seconds. As in MemoryJobStore, the page chunks of a
+    job are deleted as soon as it finishes.
+    """
+
+    poll_interval = 0.5
+
+    def __init__(self, path: str, ttl: int):
+        """Initialize the store and create its tables.
+
+        Args:
+            path: Database file path
+            ttl: Seconds a finished job is kept after its last update
+        """
+        self.path = path
+        self._local = threading.local()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with self._connection() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS jobs ("
+                "job_id TEXT PRIMARY KEY, fields TEXT NOT NULL, "
+                "status TEXT, updated REAL NOT NULL, version INTEGER NOT NULL)"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS chunks ("
+                "job_id TEXT NOT NULL, idx INTEGER NOT NULL, data TEXT NOT NULL, "
+                "PRIMARY KEY (job_id, idx))"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS jobs_expiry ON jobs (status, updated)"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS cancelled ("
+                "job_id TEXT PRIMARY KEY, cancelled REAL NOT NULL)"
+            )
+        logger.info(f"Job store database: {path}")
+        super().__init__(ttl)
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _write(self, statements):
+        """Run write statements in one immediate transaction.
+
+        Args:
+            statements: Callable receiving the connection
+
+        Returns:
+            Return value of ``statements``
+        """
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            value = statements(conn)
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+        return value
+
+    def put(self, job_id, fields, chunks=None):
+        def statements(conn):
+            if conn.execute(
+                "SELECT 1 FROM cancelled WHERE job_id = ?", (job_id,)
+            ).fetchone():
+                return
+            conn.execute("DELETE FROM chunks WHERE job_id = ?", (job_id,))
+            row = conn.execute(
+                "SELECT version FROM jobs WHERE job_id = ?", (job_id,)
+            ).fetchone()
+            conn.execute(
+                "INSERT OR REPLACE INTO jobs VALUES (?, ?, ?, ?, ?)",
+                (
+                    job_id,
+                    json.dumps(fields),
+                    fields.get("status"),
+                    time.time(),
+                    row[0] + 1 if row else 1,
+                ),
+            )
+            if fields.get("status") in FINISHED_STATUSES:
+                return
+            conn.executemany(
+                "INSERT INTO chunks VALUES (?, ?, ?)",
+                [
+                    (job_id, index, json.dumps(chunk))
+                    for index, chunk in enumerate(chunks or [])
+                ],
+            )
+
+        self._write(statements)
+        self._notify(job_id)
+
+    def snapshot(self, job_id):
+        row = (
+            self._connection()
+            .execute("SELECT fields, version FROM jobs WHERE job_id = ?", (job_id,))
+            .fetchone()
+        )
+        return (json.loads(row[0]), row[1]) if row else (None, None)
+
+    def version(self, job_id):
+        row = (
+            self._connection()
+            .execute("SELECT version FROM jobs WHERE job_id = ?", (job_id,))
+            .fetchone()
+        )
+        return row[0] if row else None
+
+    def update(self, job_id, **fields):
+        def statements(conn):
+            row = conn.execute(
+                "SELECT fields FROM jobs WHERE job_id = ?", (job_id,)
+            ).fetchone()
+            if row is None:
+                return False
+            merged = {**json.loads(row[0]), **fields}
+            conn.execute(
+                "UPDATE jobs SET fields = ?, status = ?, updated = ?, "
+                "version = version + 1 WHERE job_id = ?",
+                (json.dumps(merged), merged.get("status"), time.time(), job_id),
+            )
+            if merged.get("status") in FINISHED_STATUSES:
+                conn.execute("DELETE FROM chunks WHERE job_id = ?", (job_id,))
+            return True
+
+        updated = self._write(statements)
+        if updated:
+            self._notify(job_id)
+        return updated
+
+    def delete(self, job_id):
+        def statements(conn):
+            conn.execute("DELETE FROM chunks WHERE job_id = ?", (job_id,))
+            conn.execute("DELETE FROM jobs WHERE job_id = ?", (job_id,))
+
+        self._write(statements)
+        self._notify(job_id)
+
+    def cancel(self, job_id):
+        def statements(conn):
+            conn.execute("DELETE FROM chunks WHERE job_id = ?", (job_id,))
+            conn.execute("DELETE FROM jobs WHERE job_id = ?", (job_id,))
+            conn.execute(
+                "INSERT OR REPLACE INTO cancelled VALUES (?, ?)", (job_id, time.time())
+            )
+
+        self._write(statements)
+        self._notify(job_id)
+
+    def is_cancelled(self, job_id):
+        row = (
+            self._connection()
+            .execute("SELECT 1 FROM cancelled WHERE job_id = ?", (job_id,))
+            .fetchone()
+        )
+        return row is not None
+
+    def append_chunk(self, job_id, chunk):
+        def statements(conn):
+            if not conn.execute(
+                "SELECT 1 FROM jobs WHERE job_id = ?", (job_id,)
+            ).fetchone():
+                return None
+            index = conn.execute(
+                "SELECT COUNT(*) FROM chunks WHERE job_id = ?", (job_id,)
+            ).fetchone()[0]
+            conn.execute(
+                "INSERT INTO chunks VALUES (?, ?, ?)",
+                (job_id, index, json.dumps(chunk)),
+            )
+            conn.execute(
+                "UPDATE jobs SET updated = ?, version = version + 1 WHERE job_id = ?",
+                (time.time(), job_id),
+            )
+            return index
+
+        index = self._write(statements)
+        if index is not None:
+            self._notify(job_id)
+        return index
+
+    def get_chunks(self, job_id, start=0):
+        rows = (
+            self._connection()
+            .execute(
+                "SELECT data FROM chunks WHERE job_id = ? AND idx >= ? ORDER BY idx",
+                (job_id, start),
+            )
+            .fetchall()
+        )
+        return [json.loads(row[0]) for row in rows]
+
+    def reap(self):
+        deadline = time.time() - self.ttl
+        placeholders = ", ".join("?" for _ in FINISHED_STATUSES)
+
+        def statements(conn):
+            condition = f"status IN ({placeholders}) AND updated < ?"
+            params = (*FINISHED_STATUSES, deadline)
+            conn.execute(
+                f"DELETE FROM chunks WHERE job_id IN "
+                f"(SELECT job_id FROM jobs WHERE {condition})",
+                params,
+            )
+            conn.execute("DELETE FROM cancelled WHERE cancelled < ?", (deadline,))
+            return conn.execute(f"DELETE FROM jobs WHERE {condition}", params).rowcount
+
+        removed = self._write(statements)
+        self.expired += removed
+        if removed:
+            logger.debug(f"Expired {removed} finished jobs")
+        return removed
+
+    def stats(self):
+        conn = self._connection()
+        return {
+            "backend": "sqlite",
+            "path": self.path,
+            "jobs": conn.execute("SELECT COUNT(*) FROM jobs").fetchone()[0],
+            "chunks": conn.execute("SELECT COUNT(*) FROM chunks").fetchone()[0],
+            "expired": self.expired,
+            "ttl_seconds": self.ttl,
+        }
+
+
+_job_store = None
+_job_store_lock = Lock()
+
+
+def get_job_store() -> JobStore:
+    """Get the global job store configured by PDF3MD_JOB_STORE.
+
+    Returns:
+        JobStore instance
+    """
+    global _job_store
+    with _job_store_lock:
+        if _job_store is None:
+            if get_job_store_backend() == "sqlite":
+                _job_store = SQLiteJobStore(get_job_store_path(), get_job_ttl())
+            else:
+                _job_store = MemoryJobStore(get_job_ttl(), get_job_store_max_bytes())
+        return _job_store
@@ -0,0 +1,235 @@
+"""Per-job scratch workspaces with a background janitor."""
+
+import os
+import time
+import shutil
+import logging
+from threading import Event, Lock, Thread
+from typing import Optional
+
+from ..config import get_scratch_dir, get_scratch_ttl, get_scratch_min_free_bytes
+
+logger = logging.getLogger(__name__)
+
+# Bounds of the interval between janitor runs, in seconds
+MIN_JANITOR_INTERVAL = 10
+MAX_JANITOR_INTERVAL = 300
+
+
+class InsufficientSpaceError(Exception):
+    """Raised when the scratch volume is too full to accept a job."""
+
+    def __init__(self, free_bytes):
+        super().__init__("Not enough free space for a new job")
+        self.free_bytes = free_bytes
+
+
+class Workspace:
+    """Scratch directory owned by one job, removed as a whole when released."""
+
+    def __init__(self, manager, job_id: str, path: str):
+        """Initialize the workspace. Use WorkspaceManager.create() instead.
+
+        Args:
+            manager: Owning WorkspaceManager
+            job_id: Job ID
+            path: Directory of the workspace
+        """
+        self.manager = manager
+        self.job_id = job_id
+        self.path = path
+
+    def file(self, name: str) -> str:
+        """Get the path of a file inside the workspace.
+
+        Args:
+            name: File name
+
+        Returns:
+            Absolute file path
+        """
+        return os.path.join(self.path, name)
+
+    def release(self):
+        """Remove the workspace and everything in it."""
+        self.manager.release(self.job_id)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.release()
+
+
+class WorkspaceManager:
+    """Creates job workspaces under a dedicated scratch root.
+
+    Released workspaces are deleted immediately. A janitor thread removes
+    workspaces that no job of this process holds (e.g. left behind by a
+    crash) once they are older than the TTL. Only the scratch root is
+    listed, never the system temp directory.
+    """
+
+    def __init__(self, root: str, ttl: int, min_free_bytes: int):
+        """Initialize the manager and start the janitor thread.
+
+        Args:
+            root: Scratch root directory (may be on tmpfs)
+            ttl: Seconds after which an unreleased workspace is reaped
+            min_free_bytes: Free space that must remain on the scratch volume
+        """
+        self.root = root
+        self.ttl = ttl
+        self.min_free_bytes = min_free_bytes
+        self._active = {}
+        self._lock = Lock()
+        self._stop = Event()
+        self.created = 0
+        self.reaped = 0
+        self.rejected = 0
+
+        os.makedirs(self.root, exist_ok=True)
+        interval = min(MAX_JANITOR_INTERVAL, max(MIN_JANITOR_INTERVAL, ttl // 4))
+        Thread(
+            target=self._janitor, args=(interval,), name="pdf3md-janitor", daemon=True
+        ).start()
+        logger.info(f"Scratch workspaces in {self.root} (TTL {ttl}s)")
+
+    def free_bytes(self) -> int:
+        """Get the free space on the scratch volume.
+
+        Returns:
+            Free bytes
+        """
+        return shutil.disk_usage(self.root).free
+
+    def create(self, job_id: str, expected_bytes: int = 0) -> Workspace:
+        """Create the workspace of a job.
+
+        Args:
+            job_id: Job ID, used as directory name
+            expected_bytes: Bytes the job is expected to write
+
+        Returns:
+            Workspace instance
+
+        Raises:
+            InsufficientSpaceError: If the job would leave less than the
+                configured free space on the scratch volume
+        """
+        free = self.free_bytes()
+        if free - (expected_bytes or 0) < self.min_free_bytes:
+            with self._lock:
+                self.rejected += 1
+            logger.warning(f"Scratch volume low on space ({free} bytes free)")
+            raise InsufficientSpaceError(free)
+
+        path = os.path.join(self.root, job_id)
+        os.makedirs(path)
+        with self._lock:
+            self._active[job_id] = path
+            self.created += 1
+        return Workspace(self, job_id, path)
+
+    def release(self, job_id: str):
+        """Remove the workspace of a job.
+
+        Args:
+            job_id: Job ID
+        """
+        with self._lock:
+            path = self._active.pop(job_id, None)
+        if path is None:
+            return
+        shutil.rmtree(path, ignore_errors=True)
+        logger.debug(f"Released workspace {path}")
+
+    def reap(self, now: Optional[float] = None) -> int:
+        """Remove orphaned workspaces older than the TTL.
+
+        Args:
+            now: Current time (defaults to time.time())
+
+        Returns:
+            Number of workspaces removed
+        """
+        now = now if now is not None else time.time()
+        removed = 0
+        try:
+            entries = list(os.scandir(self.root))
+        except OSError as e:
+            logger.debug(f"Could not list scratch root {self.root}: {e}")
+            return 0
+
+        for entry in entries:
+            with self._lock:
+                if entry.name in self._active:
+                    continue
+            try:
+                expired = now - entry.stat().st_mtime > self.ttl
+            except OSError:
+                continue
+            if not expired:
+                continue
+            if entry.is_dir(follow_symlinks=False):
+                shutil.rmtree(entry.path, ignore_errors=True)
+            else:
+                try:
+                    os.remove(entry.path)
+                except OSError:
+                    continue
+            removed += 1
+            logger.info(f"Reaped expired workspace {entry.path}")
+
+        with self._lock:
+            self.reaped += removed
+        return removed
+
+    def _janitor(self, interval: int):
+        self.reap()
+        while not self._stop.wait(interval):
+            try:
+                self.reap()
+            except Exception as e:
+                logger.error(f"Workspace janitor failed: {e}")
+
+    def stop(self):
+        """Stop the janitor thread."""
+        self._stop.set()
+
+    def stats(self):
+        """Get workspace counters.
+
+        Returns:
+            Dictionary with active workspaces, free space and counters
+        """
+        with self._lock:
+            return {
+                "root": self.root,
+                "active": len(self._active),
+                "created": self.created,
+                "reaped": self.reaped,
+                "rejected": self.rejected,
+                "free_bytes": self.free_bytes(),
+                "min_free_bytes": self.min_free_bytes,
+                "ttl_seconds": self.ttl,
+            }
+
+
+_workspace_manager = None
+_workspace_manager_lock = Lock()
+
+
+def get_workspace_manager() -> WorkspaceManager:
+    """Get the global workspace manager instance.
+
+    Returns:
+        WorkspaceManager instance
+    """
+    global _workspace_manager
+    with _workspace_manager_lock:
+        if _workspace_manager is None:
+            _workspace_manager = WorkspaceManager(
+                get_scratch_dir(), get_scratch_ttl(), get_scratch_min_free_bytes()
+            )
+        return _workspace_manager
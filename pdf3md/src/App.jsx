@@ -11,6 +11,9 @@ import './components/ProfileSelector.css'
 import './components/ProfileManager.css'
 import './components/ProfileEditor.css'
 
+// Pages converted first on long PDFs, so something shows up right away
+const PREVIEW_PAGES = 3;
+
 function App() {
   const [markdown, setMarkdown] = useState('')
   const [isLoading, setIsLoading] = useState(false)
@@ -40,6 +43,7 @@ function App() {
   const fileInputRef = useRef(null)
   const isInitialMount = useRef(true);
   const activeConversionId = useRef(null);
+  const previewConversionId = useRef(null); // Conversion whose preview is displayed
 
   // Check if device is mobile
   useEffect(() => {
@@ -188,90 +192,150 @@ function App() {
     fetchVersionInfo();
   }, []);
 
-  const pollProgress = async (conversionId, fileName) => {
-    activeConversionId.current = conversionId;
-    const pollInterval = setInterval(async () => {
-      if (activeConversionId.current !== conversionId) {
-        clearInterval(pollInterval); // Stop polling if a new conversion has started
-        return;
-      }
+  const resetGlobalProgress = () => {
+    if (uploadQueue.length === 0) {
+      setLoadingProgress(0);
+      setLoadingStage('');
+      setTotalPages(0);
+      setCurrentPage(0);
+    }
+  };
+
+  // The markdown itself is not part of the progress payload; fetch it from the result endpoint
+  const completeConversion = async (result, fileName) => {
+    try {
+      const response = await fetch(`${getBackendUrl()}${result.result_url}`);
+      if (!response.ok) throw new Error(`HTTP error! status: ${response.status}`);
+      const markdown = await response.text();
+      const completedResult = { ...result, markdown };
+
+      setMarkdown(markdown); // Display the latest markdown
+      addToHistory(completedResult);
+      updateFileStatus(fileName, { status: 'Completed', markdown, progress: 100 });
+
+      // Reset for next file or finish
+      setIsLoading(false); // This will trigger the useEffect to process next file in queue
+      setCurrentFile(null);
+      // Don't reset global loading progress/stage here if queue has items
+      resetGlobalProgress();
+    } catch (error) {
+      failProgress(fileName, error);
+    }
+  };
+
+  // Show the first pages of a long PDF while the rest is still converting
+  const showPreview = async (conversionId, preview) => {
+    previewConversionId.current = conversionId;
+    try {
+      const response = await fetch(`${getBackendUrl()}${preview.result_url}`);
+      if (!response.ok) throw new Error(`HTTP error! status: ${response.status}`);
+      const markdown = await response.text();
+      if (activeConversionId.current === conversionId) setMarkdown(markdown);
+    } catch (error) {
+      console.warn(`Could not load preview for ${conversionId}:`, error.message);
+    }
+  };
+
+  // Apply a progress payload; returns true once the conversion has finished
+  const applyProgress = (progressData, fileName) => {
+    setLoadingProgress(progressData.progress || 0);
+    setLoadingStage(progressData.stage || 'Processing...');
+    setTotalPages(progressData.total_pages || 0);
+    setCurrentPage(progressData.current_page || 0);
+    updateFileStatus(fileName, {
+      progress: progressData.progress || 0,
+      stage: progressData.stage || 'Processing...',
+      totalPages: progressData.total_pages || 0,
+      currentPage: progressData.current_page || 0,
+    });
+
+    const conversionId = activeConversionId.current;
+    if (progressData.preview_ready && progressData.preview && progressData.status === 'processing'
+        && previewConversionId.current !== conversionId) {
+      showPreview(conversionId, progressData.preview);
+    }
+
+    if (progressData.status === 'completed' && progressData.result) {
+      activeConversionId.current = null;
+      completeConversion(progressData.result, fileName);
+      return true;
+    }
+    if (progressData.status === 'error') {
+      activeConversionId.current = null;
+      console.error(`Conversion failed for ${fileName}:`, progressData.error);
+      updateFileStatus(fileName, {
+        status: 'Error',
+        error: progressData.error || 'Unknown conversion error',
+        progress: 0,
+        stage: 'Error'
+      });
+      setIsLoading(false); // Allow next file in queue to process
+      setCurrentFile(null);
+      resetGlobalProgress();
+      return true;
+    }
+    return false;
+  };
+
+  const failProgress = (fileName, error) => {
+    activeConversionId.current = null;
+    console.error(`Error watching progress for ${fileName}:`, error.message);
+    updateFileStatus(fileName, {
+      status: 'Error',
+      error: `Progress updates failed: ${error.message}`,
+      progress: 0,
+      stage: 'Error'
+    });
+    setIsLoading(false);
+    setCurrentFile(null);
+    resetGlobalProgress();
+  };
+
+  // Fallback for browsers without EventSource: long-poll until the job changes
+  const longPollProgress = async (conversionId, fileName) => {
+    let version = -1;
+    while (activeConversionId.current === conversionId) {
       try {
-        const response = await fetch(`${getBackendUrl()}/progress/${conversionId}`);
+        const response = await fetch(`${getBackendUrl()}/progress/${conversionId}?wait=${version}&timeout=25`);
         if (!response.ok) throw new Error(`HTTP error! status: ${response.status}`);
 
         const progressData = await response.json();
-
-        setLoadingProgress(progressData.progress || 0);
-        setLoadingStage(progressData.stage || 'Processing...');
-        setTotalPages(progressData.total_pages || 0);
-        setCurrentPage(progressData.current_page || 0);
-        updateFileStatus(fileName, {
-          progress: progressData.progress || 0,
-          stage: progressData.stage || 'Processing...',
-          totalPages: progressData.total_pages || 0,
-          currentPage: progressData.current_page || 0,
-        });
-
-        if (progressData.status === 'completed' && progressData.result) {
-          clearInterval(pollInterval);
-          activeConversionId.current = null;
-          setMarkdown(progressData.result.markdown); // Display the latest markdown
-          addToHistory(progressData.result);
-          updateFileStatus(fileName, { status: 'Completed', markdown: progressData.result.markdown, progress: 100 });
-
-          // Reset for next file or finish
-          setIsLoading(false); // This will trigger the useEffect to process next file in queue
-          setCurrentFile(null);
-          // Don't reset global loading progress/stage here if queue has items
-          if (uploadQueue.length === 0) {
-            setLoadingProgress(0);
-            setLoadingStage('');
-            setTotalPages(0);
-            setCurrentPage(0);
-          }
-        } else if (progressData.status === 'error') {
-          clearInterval(pollInterval);
-          activeConversionId.current = null;
-          // alert(`Conversion failed for ${fileName}: ${progressData.error}`); // Removed alert for better UX with multi-upload
-          console.error(`Conversion failed for ${fileName}:`, progressData.error);
-          updateFileStatus(fileName, {
-            status: 'Error',
-            error: progressData.error || 'Unknown conversion error',
-            progress: 0,
-            stage: 'Error'
-          });
-          setIsLoading(false); // Allow next file in queue to process
-          setCurrentFile(null);
-          if (uploadQueue.length === 0) {
-            setLoadingProgress(0);
-            setLoadingStage('');
-            setTotalPages(0);
-            setCurrentPage(0);
-          }
-        }
+        if (activeConversionId.current !== conversionId) return;
+        version = progressData.version;
+        if (applyProgress(progressData, fileName)) return;
       } catch (error) {
-        console.error('Error polling progress:', error);
-        clearInterval(pollInterval);
-        activeConversionId.current = null;
-        // alert(`Error checking conversion progress for ${fileName}. Please try again.`); // Removed alert
-        console.error(`Error polling progress for ${fileName}:`, error.message);
-        updateFileStatus(fileName, {
-          status: 'Error',
-          error: `Polling failed: ${error.message}`,
-          progress: 0,
-          stage: 'Error'
-        });
-        setIsLoading(false);
-        setCurrentFile(null);
-        if (uploadQueue.length === 0) {
-          setLoadingProgress(0);
-          setLoadingStage('');
-          setTotalPages(0);
-          setCurrentPage(0);
-        }
+        failProgress(fileName, error);
+        return;
       }
-    }, 500);
-    return pollInterval;
+    }
+  };
+
+  // Progress is pushed by the server; nothing is polled on a timer
+  const watchProgress = (conversionId, fileName) => {
+    activeConversionId.current = conversionId;
+    if (typeof EventSource === 'undefined') {
+      longPollProgress(conversionId, fileName);
+      return;
+    }
+
+    const source = new EventSource(`${getBackendUrl()}/progress/${conversionId}/stream`);
+    source.addEventListener('progress', (event) => {
+      if (activeConversionId.current !== conversionId) {
+        source.close(); // Stop listening if a new conversion has started
+        return;
+      }
+      if (applyProgress(JSON.parse(event.data), fileName)) {
+        source.close();
+      }
+    });
+    source.addEventListener('error', (event) => {
+      // Network errors reconnect automatically; a closed stream means the job is gone
+      if (source.readyState !== EventSource.CLOSED && !event.data) return;
+      source.close();
+      if (activeConversionId.current === conversionId) {
+        failProgress(fileName, new Error(event.data ? JSON.parse(event.data).error : 'Connection closed'));
+      }
+    });
   };
 
   const processFile = async (file) => {
@@ -306,6 +370,7 @@ function App() {
 
     if (isPdf) {
       formData.append('pdf', file);
+      formData.append('preview', String(PREVIEW_PAGES));
       endpoint = `/convert`;
       fileKey = 'pdf';
     } else if (isDocx) {
@@ -320,6 +385,14 @@ function App() {
         body: formData,
       });
 
+      if (response.status === 429) {
+        // Conversion queue is full: retry once the server has room again
+        const retryAfter = parseInt(response.headers.get('Retry-After'), 10) || 5;
+        updateFileStatus(file.name, { status: 'Queued', stage: `Server busy, retrying in ${retryAfter}s...` });
+        setLoadingStage(`Server busy, retrying in ${retryAfter}s...`);
+        setTimeout(() => processFile(file), retryAfter * 1000);
+        return;
+      }
       if (!response.ok) throw new Error(`HTTP error! status: ${response.status}`);
 
       const data = await response.json();
@@ -327,7 +400,7 @@ function App() {
       if (isPdf) {
         if (data.success && data.conversion_id) {
           updateFileStatus(file.name, { status: 'Processing', stage: 'Waiting for conversion...' });
-          pollProgress(data.conversion_id, file.name);
+          watchProgress(data.conversion_id, file.name);
         } else {
           throw new Error(data.error || 'PDF conversion failed to start');
         }
@@ -513,6 +513,18 @@ function ProfileEditor({ profile, onSave, onCancel }) {
                                     />
                                 </div>
                             </div>
+
+                            <h3>Formatting Mode</h3>
+                            <div className="pe-field">
+                                <label>Apply Settings</label>
+                                <select
+                                    value={formData.formatting?.mode || 'direct'}
+                                    onChange={(e) => handleChange('formatting', 'mode', e.target.value)}
+                                >
+                                    <option value="direct">Styles and every text run</option>
+                                    <option value="styles">Styles only (smaller file)</option>
+                                </select>
+                            </div>
                         </div>
                     )}
 
@@ -1,12 +1,18 @@
 """Utility modules for pdf3md."""
 
-from .file_utils import format_file_size, cleanup_temp_files
+from .file_utils import format_file_size, save_upload
+from .disk_cache import DiskCache
+from .page_ranges import PageRangeError, parse_page_ranges, format_page_ranges
 from .pandoc_utils import ensure_pandoc_available, get_pandoc_executable_name
 from .version_utils import load_version_meta, get_git_info
 
 __all__ = [
     "format_file_size",
-    "cleanup_temp_files",
+    "save_upload",
+    "DiskCache",
+    "PageRangeError",
+    "parse_page_ranges",
+    "format_page_ranges",
     "ensure_pandoc_available",
     "get_pandoc_executable_name",
     "load_version_meta",
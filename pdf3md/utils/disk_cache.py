@@ -0,0 +1,156 @@
+"""Size-bounded on-disk LRU cache."""
+
+import os
+import logging
+import tempfile
+from collections import OrderedDict
+from threading import Lock
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+
+class DiskCache:
+    """Content-addressed blob cache with LRU eviction by total size.
+
+    Entries are stored as ``<cache_dir>/<key[:2]>/<key>``. Recency is kept in
+    memory and persisted through file modification times, so the LRU order
+    survives restarts.
+    """
+
+    def __init__(self, cache_dir: str, max_bytes: int):
+        """Initialize the cache.
+
+        Args:
+            cache_dir: Directory holding cache entries
+            max_bytes: Maximum total size of all entries
+        """
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self._lock = Lock()
+        self._index = OrderedDict()
+        self._total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self._load_index()
+
+    def _entry_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key[:2], key)
+
+    def _load_index(self):
+        """Rebuild the LRU index from the files on disk."""
+        entries = []
+        for root, _dirs, files in os.walk(self.cache_dir):
+            for name in files:
+                if name.startswith("."):
+                    continue
+                try:
+                    stat = os.stat(os.path.join(root, name))
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, name, stat.st_size))
+
+        for _mtime, key, size in sorted(entries):
+            self._index[key] = size
+            self._total_bytes += size
+
+        logger.info(
+            f"Cache {self.cache_dir}: {len(self._index)} entries, "
+            f"{self._total_bytes} bytes"
+        )
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Read an entry and mark it as most recently used.
+
+        Args:
+            key: Entry key (hex digest)
+
+        Returns:
+            Entry data, or None on a miss
+        """
+        path = self._entry_path(key)
+        with self._lock:
+            if key not in self._index:
+                self.misses += 1
+                return None
+            self._index.move_to_end(key)
+
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+            os.utime(path)
+        except OSError:
+            with self._lock:
+                self._forget(key)
+                self.misses += 1
+            return None
+
+        with self._lock:
+            self.hits += 1
+        return data
+
+    def put(self, key: str, data: bytes):
+        """Store an entry, evicting least recently used entries if needed.
+
+        Args:
+            key: Entry key (hex digest)
+            data: Entry data
+        """
+        if len(data) > self.max_bytes:
+            logger.debug(f"Cache entry {key} larger than cache, not stored")
+            return
+
+        path = self._entry_path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(prefix=".", dir=os.path.dirname(path))
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Could not write cache entry {key}: {e}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return
+
+        with self._lock:
+            self._forget(key)
+            self._index[key] = len(data)
+            self._total_bytes += len(data)
+            self._evict()
+
+    def _forget(self, key: str):
+        size = self._index.pop(key, None)
+        if size is not None:
+            self._total_bytes -= size
+
+    def _evict(self):
+        while self._total_bytes > self.max_bytes and self._index:
+            key, size = self._index.popitem(last=False)
+            self._total_bytes -= size
+            self.evictions += 1
+            try:
+                os.remove(self._entry_path(key))
+            except OSError as e:
+                logger.debug(f"Could not remove cache entry {key}: {e}")
+
+    def stats(self):
+        """Get cache counters.
+
+        Returns:
+            Dictionary with entry count, size and hit/miss/eviction counters
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._index),
+                "bytes": self._total_bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            }
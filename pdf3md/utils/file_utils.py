@@ -1,8 +1,8 @@
 """File utility functions."""
 
 import os
+import hashlib
 import logging
-import tempfile
 
 logger = logging.getLogger(__name__)
 
@@ -24,34 +24,29 @@ def format_file_size(size_bytes):
         return f"{size_bytes / (1024 * 1024):.1f} MB"
 
 
-def cleanup_temp_files(prefix="temp_", suffix=".pdf"):
-    """Proactively clean up orphaned temporary files.
+def save_upload(file_storage, destination, chunk_size=1024 * 1024):
+    """Save an uploaded file while computing its SHA-256 digest.
 
     Args:
-        prefix: Filename prefix to match
-        suffix: Filename suffix to match
+        file_storage: Werkzeug FileStorage from the request
+        destination: Destination path or writable binary file object
+        chunk_size: Bytes read per iteration
 
     Returns:
-        Number of files cleaned up
+        Tuple of (hex digest, size in bytes)
     """
-    temp_dir = tempfile.gettempdir()
-    logger.debug(f"Checking for orphaned temp files in: {temp_dir}")
-    cleaned_count = 0
-
-    try:
-        for filename in os.listdir(temp_dir):
-            if filename.startswith(prefix) and filename.endswith(suffix):
-                file_path = os.path.join(temp_dir, filename)
-                try:
-                    os.remove(file_path)
-                    logger.info(f"Removed orphaned temp file: {file_path}")
-                    cleaned_count += 1
-                except Exception as e:
-                    logger.debug(f"Could not remove temp file {file_path}: {e}")
-
-        if cleaned_count > 0:
-            logger.info(f"Cleaned up {cleaned_count} orphaned temp files.")
-    except Exception as e:
-        logger.debug(f"Could not clean temp directory: {e}")
-
-    return cleaned_count
+    if isinstance(destination, (str, os.PathLike)):
+        with open(destination, "wb") as out:
+            return save_upload(file_storage, out, chunk_size)
+
+    hasher = hashlib.sha256()
+    size = 0
+    while True:
+        chunk = file_storage.stream.read(chunk_size)
+        if not chunk:
+            break
+        hasher.update(chunk)
+        destination.write(chunk)
+        size += len(chunk)
+    return hasher.hexdigest(), size
+
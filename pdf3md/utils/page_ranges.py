@@ -0,0 +1,69 @@
+"""Parsing of page range specifications such as ``1-5,8,10-``."""
+
+from typing import List
+
+
+class PageRangeError(ValueError):
+    """Raised for malformed or out-of-range page selections."""
+
+
+def parse_page_ranges(spec: str, page_count: int) -> List[int]:
+    """Parse a page range specification.
+
+    Pages are 1-based. Items are separated by commas and are either a single
+    page (``8``), a closed range (``1-5``) or an open range (``10-`` up to
+    the last page, ``-3`` from the first page). Pages are returned in
+    document order without duplicates.
+
+    Args:
+        spec: Page range specification
+        page_count: Number of pages in the document
+
+    Returns:
+        Sorted 0-based page numbers
+
+    Raises:
+        PageRangeError: If the specification is malformed, out of range or empty
+    """
+    selected = set()
+    for item in spec.replace(" ", "").split(","):
+        if not item:
+            continue
+        try:
+            if "-" in item:
+                first, _, last = item.partition("-")
+                start = int(first) if first else 1
+                end = int(last) if last else page_count
+            else:
+                start = end = int(item)
+        except ValueError:
+            raise PageRangeError(f"Invalid page range '{item}'") from None
+
+        if start < 1 or end > page_count or start > end:
+            raise PageRangeError(f"Page range '{item}' is outside pages 1-{page_count}")
+        selected.update(range(start - 1, end))
+
+    if not selected:
+        raise PageRangeError("No pages selected")
+    return sorted(selected)
+
+
+def format_page_ranges(page_numbers: List[int]) -> str:
+    """Format 0-based page numbers as a canonical 1-based range specification.
+
+    Args:
+        page_numbers: Sorted 0-based page numbers
+
+    Returns:
+        Specification such as ``1-5,8``
+    """
+    ranges = []
+    for pno in page_numbers:
+        if ranges and pno == ranges[-1][1] + 1:
+            ranges[-1][1] = pno
+        else:
+            ranges.append([pno, pno])
+    return ",".join(
+        str(start + 1) if start == end else f"{start + 1}-{end + 1}"
+        for start, end in ranges
+    )
@@ -0,0 +1,74 @@
+"""Shared test setup.
+
+The app creates its job store, result store and caches when it is first
+imported, so their locations are pointed at a temporary directory before
+any test imports it.
+"""
+
+import os
+import time
+import uuid
+import importlib
+import tempfile
+
+import pymupdf
+import pytest
+
+_root = tempfile.mkdtemp(prefix="pdf3md-tests-")
+for _name, _directory in (
+    ("PDF3MD_CACHE_DIR", "cache"),
+    ("PDF3MD_RESULT_DIR", "results"),
+    ("PDF3MD_SCRATCH_DIR", "scratch"),
+):
+    os.environ.setdefault(_name, os.path.join(_root, _directory))
+os.environ.setdefault("PDF3MD_JOB_STORE", "memory")
+os.environ.setdefault("PDF3MD_SKIP_PANDOC_DOWNLOAD", "1")
+
+
+@pytest.fixture
+def app_module():
+    """The pdf3md.app module with its stores."""
+    return importlib.import_module("pdf3md.app")
+
+
+@pytest.fixture
+def client(app_module):
+    """Flask test client of the app."""
+    return app_module.app.test_client()
+
+
+@pytest.fixture
+def make_pdf():
+    """Factory for small PDFs whose pages carry unique text.
+
+    Unique content keeps conversions from being answered by the result
+    cache of an earlier test.
+    """
+
+    def make(pages=2):
+        doc = pymupdf.open()
+        for number in range(pages):
+            page = doc.new_page()
+            page.insert_text((72, 72), f"Page {number + 1} of {uuid.uuid4()}")
+        data = doc.tobytes()
+        doc.close()
+        return data
+
+    return make
+
+
+@pytest.fixture
+def wait_until_finished(client):
+    """Long-poll /progress until a conversion completes or fails."""
+
+    def wait(conversion_id, timeout=60):
+        progress = client.get(f"/progress/{conversion_id}").get_json()
+        deadline = time.monotonic() + timeout
+        while progress["status"] not in ("completed", "error"):
+            assert time.monotonic() < deadline, progress
+            progress = client.get(
+                f"/progress/{conversion_id}?wait={progress['version']}&timeout=5"
+            ).get_json()
+        return progress
+
+    return wait
@@ -0,0 +1,132 @@
+"""POST /convert/batch, GET /batch/<id> and the streamed zip download."""
+
+import io
+import time
+import zipfile
+
+import pytest
+
+
+def upload(data, filename):
+    return io.BytesIO(data), filename
+
+
+def zip_of(files):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        for name, data in files.items():
+            archive.writestr(name, data)
+    return buffer.getvalue()
+
+
+@pytest.fixture
+def batch(client, make_pdf):
+    """A batch of two good PDFs sharing a name, one zipped PDF and a broken one."""
+    response = client.post(
+        "/convert/batch",
+        data={
+            "files": [
+                upload(make_pdf(), "report.pdf"),
+                upload(make_pdf(), "report.pdf"),
+                upload(b"not a pdf", "broken.pdf"),
+                upload(b"some notes", "notes.txt"),
+                upload(
+                    zip_of(
+                        {
+                            "nested/appendix.pdf": make_pdf(),
+                            "__MACOSX/nested/._appendix.pdf": b"resource fork",
+                            "readme.md": b"# Readme",
+                        }
+                    ),
+                    "more.zip",
+                ),
+            ]
+        },
+    )
+    assert response.status_code == 200
+    body = response.get_json()
+    assert body["total"] == 4
+    assert body["skipped"] == ["notes.txt", "readme.md"]
+    return body["batch_id"]
+
+
+def wait_for_batch(client, batch_id, timeout=60):
+    deadline = time.monotonic() + timeout
+    while True:
+        summary = client.get(f"/batch/{batch_id}").get_json()
+        if summary["status"] == "completed":
+            return summary
+        assert time.monotonic() < deadline, summary
+        time.sleep(0.1)
+
+
+def test_aggregate_status(client, batch):
+    summary = wait_for_batch(client, batch)
+    assert summary["total"] == 4
+    assert summary["progress"] == 100
+    assert summary["counts"] == {
+        "queued": 0,
+        "processing": 0,
+        "completed": 3,
+        "error": 1,
+    }
+    assert summary["skipped"] == ["notes.txt", "readme.md"]
+    assert summary["download_url"] == f"/batch/{batch}/download"
+
+    jobs = {job["filename"]: job for job in summary["jobs"] if job["status"] == "error"}
+    assert list(jobs) == ["broken.pdf"]
+    assert jobs["broken.pdf"]["error"]
+    for job in summary["jobs"]:
+        if job["status"] == "completed":
+            assert job["result_url"] == f"/result/{job['conversion_id']}"
+
+
+def test_download_streams_all_results(client, batch):
+    # Requested right away, the download waits for the running conversions
+    response = client.get(f"/batch/{batch}/download")
+    assert response.status_code == 200
+    assert response.mimetype == "application/zip"
+    assert "attachment" in response.headers["Content-Disposition"]
+
+    with zipfile.ZipFile(io.BytesIO(response.get_data())) as archive:
+        names = sorted(archive.namelist())
+        assert names == [
+            "appendix.md",
+            "broken.error.txt",
+            "report.md",
+            "report_2.md",
+        ]
+        assert archive.read("broken.error.txt")
+        contents = {name: archive.read(name).decode("utf-8") for name in names}
+
+    summary = client.get(f"/batch/{batch}").get_json()
+    assert summary["status"] == "completed"
+    results = {
+        client.get(job["result_url"]).get_data(as_text=True)
+        for job in summary["jobs"]
+        if job["status"] == "completed"
+    }
+    assert {contents[name] for name in names if name.endswith(".md")} == results
+
+
+def test_unknown_batch(client):
+    assert client.get("/batch/unknown").status_code == 404
+    assert client.get("/batch/unknown/download").status_code == 404
+
+
+def test_batch_without_pdfs(client):
+    response = client.post(
+        "/convert/batch", data={"files": [upload(b"some notes", "notes.txt")]}
+    )
+    assert response.status_code == 400
+    assert response.get_json()["skipped"] == ["notes.txt"]
+
+    response = client.post("/convert/batch", data={})
+    assert response.status_code == 400
+
+
+def test_invalid_zip(client):
+    response = client.post(
+        "/convert/batch", data={"files": [upload(b"PK not a zip", "broken.zip")]}
+    )
+    assert response.status_code == 400
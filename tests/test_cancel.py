@@ -0,0 +1,121 @@
+"""DELETE /convert/<id>: cancelling queued and running conversions."""
+
+import io
+import os
+import uuid
+from threading import Event
+
+import pytest
+
+from pdf3md.converters import pdf_converter
+from pdf3md.converters.pdf_converter import JobProgress
+from pdf3md.jobs import JobExecutor, SQLiteJobStore
+
+
+def pdf_upload(data):
+    """Form data uploading a PDF to the fast engine."""
+    return {"pdf": (io.BytesIO(data), "cancel.pdf"), "engine": "fast"}
+
+
+def wait_until_idle(executor):
+    """Wait for the executor to finish all running and queued jobs."""
+    done = Event()
+    executor.submit("idle-probe", done.set, bounded=False, cost=0)
+    assert done.wait(30)
+
+
+@pytest.fixture
+def executor(app_module, monkeypatch):
+    """Single-worker executor used by the app for this test."""
+    executor = JobExecutor(workers=1, max_queue=8)
+    monkeypatch.setattr(app_module, "get_job_executor", lambda: executor)
+    return executor
+
+
+def test_cancel_queued_job(client, executor, make_pdf):
+    release = Event()
+    executor.submit("blocker", release.wait, bounded=False)
+    try:
+        response = client.post("/convert", data=pdf_upload(make_pdf()))
+        conversion_id = response.get_json()["conversion_id"]
+        workspace = os.path.join(os.environ["PDF3MD_SCRATCH_DIR"], conversion_id)
+        assert os.path.isdir(workspace)
+        assert executor.queue_position(conversion_id) == 1
+
+        response = client.delete(f"/convert/{conversion_id}")
+        assert response.status_code == 200
+        assert response.get_json()["cancelled"] is True
+        assert response.get_json()["status"] == "queued"
+    finally:
+        release.set()
+
+    wait_until_idle(executor)
+    assert executor.queue_position(conversion_id) is None
+    assert executor.stats()["cancelled"] == 1
+    assert not os.path.exists(workspace)
+    assert client.get(f"/progress/{conversion_id}").status_code == 404
+
+
+def test_cancel_running_job(client, app_module, executor, make_pdf, monkeypatch):
+    converting = Event()
+    resume = Event()
+    convert_page = pdf_converter.convert_page
+    calls = []
+
+    def blocking_convert_page(doc, pno, *args, **kwargs):
+        calls.append(pno)
+        if pno == 0:
+            converting.set()
+            assert resume.wait(30)
+        return convert_page(doc, pno, *args, **kwargs)
+
+    monkeypatch.setenv("PDF3MD_ISOLATION", "0")
+    monkeypatch.setenv("PDF3MD_PDF_WORKERS", "1")
+    monkeypatch.setattr(pdf_converter, "convert_page", blocking_convert_page)
+
+    response = client.post("/convert", data=pdf_upload(make_pdf(pages=5)))
+    conversion_id = response.get_json()["conversion_id"]
+    try:
+        assert converting.wait(30)
+        response = client.delete(f"/convert/{conversion_id}")
+        assert response.status_code == 200
+        assert response.get_json()["cancelled"] is True
+        assert response.get_json()["status"] == "processing"
+    finally:
+        resume.set()
+
+    wait_until_idle(executor)
+    # The job stopped after the page it was converting
+    assert calls == [0]
+    assert app_module.job_store.get(conversion_id) is None
+    assert client.get(f"/progress/{conversion_id}").status_code == 404
+    assert client.get(f"/result/{conversion_id}").status_code == 404
+
+
+def test_cancel_job_of_another_process(client, app_module):
+    # A job queued in another server process is unknown to this executor
+    conversion_id = str(uuid.uuid4())
+    app_module.job_store.put(conversion_id, {"status": "processing"})
+
+    response = client.delete(f"/convert/{conversion_id}")
+    assert response.get_json()["cancelled"] is True
+    assert app_module.job_store.is_cancelled(conversion_id)
+    assert JobProgress(conversion_id, app_module.job_store).is_cancelled()
+
+
+def test_cancellation_is_shared_through_sqlite(tmp_path):
+    path = str(tmp_path / "jobs.db")
+    server, owner = SQLiteJobStore(path, ttl=60), SQLiteJobStore(path, ttl=60)
+    try:
+        owner.put("job", {"status": "processing"})
+        progress = JobProgress("job", owner)
+        assert not progress.is_cancelled()
+
+        server.cancel("job")
+        assert progress.is_cancelled()
+        # A conversion starting late does not bring the job back
+        owner.put("job", {"status": "processing"})
+        assert owner.get("job") is None
+    finally:
+        server.stop()
+        owner.stop()
@@ -0,0 +1,100 @@
+"""DOCX export: styles-only formatting leaves the runs of the body alone."""
+
+import copy
+import zipfile
+
+import pytest
+from lxml import etree
+
+from pdf3md.converters import docx_converter
+from pdf3md.formatters.profile_manager import ProfileManager
+from pdf3md.formatters.profile_schema import DEFAULT_PROFILE
+
+pypandoc = pytest.importorskip("pypandoc")
+
+W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+
+MARKDOWN = """# Quarterly report
+
+Revenue grew in every region during the quarter.
+
+## Details
+
+The second paragraph explains the numbers.
+
+- First point
+- Second point
+
+| Region | Revenue |
+|--------|---------|
+| North  | 10      |
+| South  | 12      |
+"""
+
+# Run properties that only direct formatting sets; pandoc itself uses
+# character styles (w:rStyle) and toggles such as w:i for emphasis
+DIRECT_RUN_PROPERTIES = ("rFonts", "sz", "szCs", "b", "bCs", "color")
+
+
+@pytest.fixture(autouse=True)
+def pandoc():
+    try:
+        pypandoc.get_pandoc_path()
+    except OSError:
+        pytest.skip("pandoc is not installed")
+
+
+@pytest.fixture
+def profiles(tmp_path, monkeypatch):
+    manager = ProfileManager(str(tmp_path / "profiles"))
+    monkeypatch.setattr(docx_converter, "get_profile_manager", lambda: manager)
+    for mode in ("styles", "direct"):
+        profile = copy.deepcopy(DEFAULT_PROFILE)
+        profile["name"] = f"Georgia {mode}"
+        profile["fonts"]["body"] = {"name": "Georgia", "size": 12}
+        profile["formatting"] = {"mode": mode}
+        assert manager.save_profile(profile)
+    return manager
+
+
+def export(profile_name):
+    docx = docx_converter.markdown_to_docx(MARKDOWN, "report", profile_name)
+    with zipfile.ZipFile(docx) as archive:
+        body = etree.fromstring(archive.read("word/document.xml"))
+        styles = etree.fromstring(archive.read("word/styles.xml"))
+    return body, styles
+
+
+def direct_run_properties(body):
+    return [
+        child.tag.replace(W, "")
+        for run_properties in body.iter(f"{W}rPr")
+        if run_properties.getparent().tag == f"{W}r"
+        for child in run_properties
+        if child.tag.replace(W, "") in DIRECT_RUN_PROPERTIES
+    ]
+
+
+def test_styles_mode_uses_style_references_only(profiles):
+    body, styles = export("Georgia styles")
+
+    paragraphs = [p for p in body.iter(f"{W}p") if "".join(p.itertext()).strip()]
+    assert len(paragraphs) >= 8
+    style_ids = set()
+    for paragraph in paragraphs:
+        style = paragraph.find(f"{W}pPr/{W}pStyle")
+        assert style is not None, "".join(paragraph.itertext())
+        style_ids.add(style.get(f"{W}val"))
+    assert {"Heading1", "Heading2"} <= style_ids
+    assert direct_run_properties(body) == []
+
+    # The profile font reaches the text through the Normal style instead
+    normal = styles.find(f"{W}style[@{W}styleId='Normal']")
+    fonts = normal.find(f"{W}rPr/{W}rFonts")
+    assert fonts.get(f"{W}ascii") == "Georgia"
+    assert normal.find(f"{W}rPr/{W}sz").get(f"{W}val") == "24"
+
+
+def test_direct_mode_formats_runs(profiles):
+    body, _ = export("Georgia direct")
+    assert "rFonts" in direct_run_properties(body)
@@ -0,0 +1,137 @@
+"""Job executor: shortest-job-first ordering, aging and cost calibration."""
+
+from threading import Event
+
+import pytest
+
+from pdf3md.jobs import executor as executor_module
+from pdf3md.jobs.cost_model import CostModel
+from pdf3md.jobs.executor import (
+    AGING_RATE,
+    PRIORITY_HIGH,
+    PRIORITY_LOW,
+    JobExecutor,
+    JobFailedError,
+)
+
+
+class Clock:
+    """Stand-in for time.monotonic that only moves when told to."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(executor_module.time, "monotonic", clock)
+    return clock
+
+
+@pytest.fixture
+def cost_model(monkeypatch):
+    cost_model = CostModel()
+    monkeypatch.setattr(executor_module, "get_cost_model", lambda: cost_model)
+    return cost_model
+
+
+@pytest.fixture
+def blocked():
+    """Single-worker executor whose worker is busy until released."""
+    executor = JobExecutor(workers=1, max_queue=16)
+    release = Event()
+    started = Event()
+
+    def block():
+        started.set()
+        release.wait(30)
+
+    executor.submit("blocker", block)
+    assert started.wait(30)
+    yield executor, release
+    release.set()
+
+
+def run_all(executor, release):
+    """Release the worker and wait until all queued jobs have run."""
+    done = Event()
+    executor.submit("last", done.set, cost=1e9, priority=PRIORITY_LOW)
+    release.set()
+    assert done.wait(30)
+
+
+def test_shortest_job_first(blocked):
+    executor, release = blocked
+    order = []
+    for job_id, cost in (("long", 30), ("short", 5), ("medium", 10)):
+        executor.submit(job_id, order.append, args=(job_id,), cost=cost)
+    assert executor.queue_position("short") == 1
+    run_all(executor, release)
+    assert order == ["short", "medium", "long"]
+
+
+def test_priority_class_wins_over_cost(blocked):
+    executor, release = blocked
+    order = []
+    executor.submit("cheap", order.append, args=("cheap",), cost=1)
+    executor.submit(
+        "urgent", order.append, args=("urgent",), cost=100, priority=PRIORITY_HIGH
+    )
+    run_all(executor, release)
+    assert order == ["urgent", "cheap"]
+
+
+def test_waiting_jobs_age(blocked, clock):
+    executor, release = blocked
+    order = []
+    executor.submit("long", order.append, args=("long",), cost=60)
+    # Once the long job has waited about as long as it runs, it goes first
+    clock.now += 60 / AGING_RATE
+    executor.submit("short", order.append, args=("short",), cost=5)
+    assert executor.queue_position("long") == 1
+    run_all(executor, release)
+    assert order == ["long", "short"]
+
+
+def run_job(executor, job_id, fn, cost=None):
+    """Run a job on an idle executor and wait until it is accounted for."""
+    done = Event()
+    executor.submit(job_id, fn, cost=cost)
+    executor.submit(f"{job_id}-after", done.set, priority=PRIORITY_LOW)
+    assert done.wait(30)
+
+
+def test_only_successful_jobs_calibrate(cost_model):
+    executor = JobExecutor(workers=1, max_queue=16)
+
+    def fail():
+        raise RuntimeError("broken PDF")
+
+    def report_failure():
+        raise JobFailedError("error reported in the job store")
+
+    run_job(executor, "error", fail, cost=50)
+    run_job(executor, "failed", report_failure, cost=50)
+    assert cost_model.scale == 1.0
+
+    # A cancelled job returns normally once it notices the cancellation
+    started, resume = Event(), Event()
+
+    def cancelled():
+        started.set()
+        resume.wait(30)
+
+    executor.submit("cancelled", cancelled, cost=50)
+    assert started.wait(30)
+    assert executor.cancel("cancelled") == ("running", None)
+    resume.set()
+    run_job(executor, "next", lambda: None)
+    assert cost_model.scale == 1.0
+
+    # A job far faster than predicted pulls the scale down
+    run_job(executor, "ok", lambda: None, cost=50)
+    assert cost_model.scale < 1.0
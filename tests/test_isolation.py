@@ -0,0 +1,73 @@
+"""Per-job limits of isolated workers and page-parallel pool processes."""
+
+import time
+
+import pytest
+
+from pdf3md.converters import pdf_converter
+from pdf3md.jobs import isolation
+from pdf3md.jobs.isolation import WorkerCrashedError, WorkerSupervisor, job_limits
+
+pytestmark = pytest.mark.skipif(
+    isolation.resource is None, reason="resource limits are not supported here"
+)
+
+MB = 1024 * 1024
+
+
+def spin():
+    """Burn CPU until the CPU limit stops the process."""
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        pass
+    yield "finished"
+
+
+def allocate(size):
+    """Allocate and touch ``size`` bytes."""
+    yield len(bytearray(size))
+
+
+def spin_with_pool_limits():
+    """Burn CPU in a pool process under the limits of its initializer."""
+    with job_limits(*pdf_converter._pool_job_limits):
+        return list(spin())
+
+
+@pytest.fixture
+def supervisor():
+    supervisor = WorkerSupervisor(
+        max_jobs=10, max_rss_bytes=1024 * MB, memory_limit=64 * MB, cpu_limit=1
+    )
+    yield supervisor
+    supervisor.stop()
+
+
+def test_cpu_limit_kills_only_the_worker(supervisor):
+    with pytest.raises(WorkerCrashedError, match="CPU time limit of 1s"):
+        list(supervisor.run(spin))
+    assert supervisor.stats()["crashed"] == 1
+
+    # The next job gets a fresh worker
+    assert supervisor.call(len, "next job") == 8
+    assert supervisor.stats()["started"] == 2
+
+
+def test_memory_limit_fails_the_job(supervisor):
+    with pytest.raises(RuntimeError, match="MemoryError"):
+        list(supervisor.run(allocate, 256 * MB))
+
+    # Jobs within the limit still run
+    assert list(supervisor.run(allocate, 16 * MB)) == [16 * MB]
+
+
+def test_pool_processes_run_under_job_limits(monkeypatch):
+    monkeypatch.setenv("PDF3MD_ISOLATION", "1")
+    monkeypatch.setenv("PDF3MD_JOB_CPU_LIMIT", "1")
+    pdf_converter._reset_process_pool()
+    try:
+        future = pdf_converter.get_process_pool(1).submit(spin_with_pool_limits)
+        with pytest.raises(pdf_converter.BrokenProcessPool):
+            future.result(timeout=60)
+    finally:
+        pdf_converter._reset_process_pool()
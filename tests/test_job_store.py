@@ -0,0 +1,123 @@
+"""Job stores: versions, chunk release, TTL expiry and the memory budget."""
+
+import time
+
+import pytest
+
+from pdf3md.jobs import store as store_module
+from pdf3md.jobs.store import ENTRY_OVERHEAD_BYTES, MemoryJobStore, SQLiteJobStore
+
+CHUNK = {"page": 1, "markdown": "# Page one\n"}
+
+
+class ShiftedTime:
+    """Stand-in for the time module of the store, running ahead."""
+
+    def __init__(self, offset):
+        self.offset = offset
+
+    def time(self):
+        return time.time() + self.offset
+
+    def monotonic(self):
+        return time.monotonic() + self.offset
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def job_store(request, tmp_path):
+    if request.param == "memory":
+        job_store = MemoryJobStore(ttl=60, max_bytes=16 * 1024 * 1024)
+    else:
+        job_store = SQLiteJobStore(str(tmp_path / "jobs.db"), ttl=60)
+    yield job_store
+    job_store.stop()
+
+
+def test_versions(job_store):
+    assert job_store.snapshot("job") == (None, None)
+    job_store.put("job", {"status": "queued"})
+    assert job_store.version("job") == 1
+    assert job_store.update("job", status="processing", progress=10)
+    assert job_store.append_chunk("job", CHUNK) == 0
+    assert job_store.snapshot("job") == (
+        {"status": "processing", "progress": 10},
+        3,
+    )
+    # Replacing a job keeps counting, so waiters see the change
+    job_store.put("job", {"status": "queued"})
+    assert job_store.version("job") == 4
+    assert job_store.get_chunks("job") == []
+
+    assert not job_store.update("unknown", status="processing")
+    assert job_store.append_chunk("unknown", CHUNK) is None
+
+
+def test_wait_returns_on_change(job_store):
+    job_store.put("job", {"status": "processing"})
+    started = time.monotonic()
+    assert job_store.wait("job", 1, timeout=0.2) == 1
+    assert time.monotonic() - started >= 0.2
+    job_store.update("job", progress=50)
+    assert job_store.wait("job", 1, timeout=5) == 2
+
+
+@pytest.mark.parametrize("status", ["completed", "error"])
+def test_chunks_released_when_job_finishes(job_store, status):
+    job_store.put("job", {"status": "processing"})
+    job_store.append_chunk("job", CHUNK)
+    job_store.append_chunk("job", {**CHUNK, "page": 2})
+    assert [chunk["page"] for chunk in job_store.get_chunks("job", 1)] == [2]
+
+    job_store.update("job", status=status)
+    assert job_store.get_chunks("job") == []
+    assert job_store.get("job")["status"] == status
+    if isinstance(job_store, SQLiteJobStore):
+        assert job_store.stats()["chunks"] == 0
+
+
+def test_finished_jobs_keep_no_chunks(job_store):
+    job_store.put("job", {"status": "completed"}, chunks=[CHUNK])
+    assert job_store.get_chunks("job") == []
+
+
+def test_reap_expires_finished_jobs_only(job_store, monkeypatch):
+    job_store.put("done", {"status": "completed"})
+    job_store.put("failed", {"status": "error"})
+    job_store.put("running", {"status": "processing"})
+    job_store.put("cancelled", {"status": "processing"})
+    job_store.cancel("cancelled")
+    assert job_store.reap() == 0
+
+    monkeypatch.setattr(store_module, "time", ShiftedTime(job_store.ttl + 1))
+    assert job_store.reap() == 2
+    assert job_store.get("done") is None
+    assert job_store.get("failed") is None
+    assert job_store.get("running") == {"status": "processing"}
+    assert job_store.stats()["expired"] == 2
+    # Cancellation marks expire with the TTL as well
+    assert not job_store.is_cancelled("cancelled")
+
+
+def test_memory_budget_evicts_least_recently_updated_finished_jobs():
+    job_store = MemoryJobStore(ttl=60, max_bytes=3 * ENTRY_OVERHEAD_BYTES + 300)
+    try:
+        job_store.put("running", {"status": "processing"})
+        job_store.put("older", {"status": "completed"})
+        job_store.put("newer", {"status": "completed"})
+        # Updating a job makes it the most recently used one
+        job_store.update("older", progress=100)
+
+        job_store.put("latest", {"status": "completed"})
+        assert job_store.get("newer") is None
+        assert job_store.get("older") is not None
+        assert job_store.get("latest") is not None
+        stats = job_store.stats()
+        assert stats["evicted"] == 1
+        assert stats["bytes"] <= stats["max_bytes"]
+
+        # Running jobs stay even when the budget cannot be met
+        job_store.put("big", {"status": "processing", "text": "x" * 4096})
+        assert job_store.get("running") is not None
+        assert job_store.get("big") is not None
+    finally:
+        job_store.stop()
@@ -0,0 +1,91 @@
+"""Page range specifications, parsed alone and through /convert."""
+
+import io
+
+import pytest
+
+from pdf3md.utils import PageRangeError, format_page_ranges, parse_page_ranges
+
+
+@pytest.mark.parametrize(
+    "spec, expected",
+    [
+        ("1-3", [0, 1, 2]),
+        ("3,1", [0, 2]),
+        ("1-3,2-4", [0, 1, 2, 3]),
+        ("2,2,1-2", [0, 1]),
+        ("4-", [3, 4]),
+        ("-2", [0, 1]),
+        ("-", [0, 1, 2, 3, 4]),
+        (" 1 - 2 , 5 ", [0, 1, 4]),
+        ("1,,3,", [0, 2]),
+        ("5-5", [4]),
+    ],
+)
+def test_valid_specs(spec, expected):
+    assert parse_page_ranges(spec, 5) == expected
+
+
+@pytest.mark.parametrize(
+    "spec, message",
+    [
+        ("abc", "Invalid page range 'abc'"),
+        ("1-2-3", "Invalid page range '1-2-3'"),
+        ("1.5", "Invalid page range '1.5'"),
+        ("1;2", "Invalid page range '1;2'"),
+        ("0", "outside pages 1-5"),
+        ("6", "outside pages 1-5"),
+        ("4-2", "outside pages 1-5"),
+        ("2-9", "outside pages 1-5"),
+        ("--2", "outside pages 1-5"),
+        ("", "No pages selected"),
+        (" , ", "No pages selected"),
+    ],
+)
+def test_invalid_specs(spec, message):
+    with pytest.raises(PageRangeError, match=message):
+        parse_page_ranges(spec, 5)
+
+
+def test_format_is_canonical():
+    assert format_page_ranges([0, 1, 2, 4, 6, 7]) == "1-3,5,7-8"
+    assert format_page_ranges(parse_page_ranges("3,1-2,2", 5)) == "1-3"
+
+
+def convert(client, data, pages):
+    upload = (io.BytesIO(data), "ranges.pdf")
+    return client.post(
+        "/convert", data={"pdf": upload, "pages": pages, "engine": "fast"}
+    )
+
+
+@pytest.mark.parametrize("pages", ["x", "0", "5", "3-2", ","])
+def test_convert_rejects_bad_selections(client, make_pdf, pages):
+    response = convert(client, make_pdf(pages=4), pages)
+    assert response.status_code == 400
+    assert response.get_json()["success"] is False
+    assert response.get_json()["error"]
+
+
+def test_convert_overlapping_selection(client, make_pdf, wait_until_finished):
+    data = make_pdf(pages=4)
+    response = convert(client, data, "3,2-3,2")
+    progress = wait_until_finished(response.get_json()["conversion_id"])
+    assert progress["status"] == "completed"
+    assert progress["total_pages"] == 2
+    result = progress["result"]
+    assert result["pages"] == "2-3"
+    assert result["pageCount"] == 2
+    assert result["documentPageCount"] == 4
+
+    markdown = client.get(result["result_url"]).get_data(as_text=True)
+    assert "Page 2 of" in markdown and "Page 3 of" in markdown
+    assert "Page 1 of" not in markdown and "Page 4 of" not in markdown
+
+
+def test_convert_selection_of_all_pages(client, make_pdf, wait_until_finished):
+    response = convert(client, make_pdf(pages=3), "2-,1")
+    progress = wait_until_finished(response.get_json()["conversion_id"])
+    # Selecting every page is a whole-document conversion
+    assert "pages" not in progress["result"]
+    assert progress["result"]["pageCount"] == 3
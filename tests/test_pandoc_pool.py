@@ -0,0 +1,112 @@
+"""Pandoc server pool: conversions never wait for a server to start."""
+
+import sys
+import time
+
+import pytest
+
+from pdf3md.config import get_pandoc_servers
+from pdf3md.converters import pandoc_pool
+from pdf3md.converters.pandoc_pool import PandocPool
+
+# Stand-in for pandoc: subprocess calls upper-case stdin; ``server`` either
+# answers like pandoc server or, in silent mode, never answers at all
+FAKE_PANDOC = """#!{python}
+import sys, json, time
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+args = sys.argv[1:]
+if not args or args[0] != "server":
+    sys.stdout.write(sys.stdin.read().upper())
+    sys.exit(0)
+if {silent}:
+    time.sleep(60)
+    sys.exit(0)
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def reply(self, body):
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        self.reply(b"3.0-test")
+
+    def do_POST(self):
+        request = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        output = "SERVER:" + request["text"].upper()
+        self.reply(json.dumps({{"output": output, "base64": False}}).encode())
+
+
+port = int(next(a for a in args if a.startswith("--port=")).split("=")[1])
+ThreadingHTTPServer(("127.0.0.1", port), Handler).serve_forever()
+"""
+
+
+def fake_pandoc(tmp_path, monkeypatch, silent):
+    path = tmp_path / "pandoc"
+    path.write_text(FAKE_PANDOC.format(python=sys.executable, silent=silent))
+    path.chmod(0o755)
+    monkeypatch.setattr(pandoc_pool.pypandoc, "get_pandoc_path", lambda: str(path))
+
+
+def wait_for(condition, timeout=10):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.05)
+    return False
+
+
+@pytest.fixture
+def pool():
+    pool = PandocPool(servers=1, concurrency=2, timeout=30)
+    yield pool
+    pool.stop()
+
+
+def test_servers_are_opt_in(monkeypatch):
+    monkeypatch.delenv("PDF3MD_PANDOC_SERVERS", raising=False)
+    assert get_pandoc_servers() == 0
+
+
+def test_silent_server_falls_back_to_subprocesses(pool, tmp_path, monkeypatch):
+    fake_pandoc(tmp_path, monkeypatch, silent=True)
+
+    started = time.monotonic()
+    assert pool.convert("markdown", "html", text="hello") == b"HELLO"
+    # The first conversion does not wait for the server probe
+    assert time.monotonic() - started < pandoc_pool.STARTUP_TIMEOUT
+
+    # The probe gives up after STARTUP_TIMEOUT and disables the servers
+    assert wait_for(lambda: pool._retry_at > 0)
+    stats = pool.stats()
+    assert stats["servers_alive"] == 0
+    assert stats["server_calls"] == 0
+
+    started = time.monotonic()
+    assert pool.convert("markdown", "html", text="again") == b"AGAIN"
+    assert time.monotonic() - started < pandoc_pool.STARTUP_TIMEOUT
+    assert pool.stats()["subprocess_calls"] == 2
+
+
+def test_server_is_used_once_it_answers(pool, tmp_path, monkeypatch):
+    fake_pandoc(tmp_path, monkeypatch, silent=False)
+
+    # Subprocesses serve the conversions while the server starts
+    assert pool.convert("markdown", "html", text="hello") == b"HELLO"
+    assert wait_for(lambda: pool.stats()["servers_alive"] == 1)
+    assert wait_for(lambda: not pool._servers[0].starting)
+
+    assert pool.convert("markdown", "html", text="hello") == b"SERVER:HELLO"
+    stats = pool.stats()
+    assert stats["server_calls"] == 1
+    assert stats["subprocess_calls"] == 1
@@ -0,0 +1,145 @@
+"""Page-wise conversion must match a single whole-document pymupdf4llm call."""
+
+import uuid
+
+import pymupdf
+import pymupdf4llm
+import pytest
+
+from pdf3md.converters import page_cache
+from pdf3md.converters.pdf_converter import (
+    JobProgress,
+    convert_pdf,
+    convert_pdf_serial,
+    convert_pdf_with_progress,
+    identify_headers,
+)
+from pdf3md.converters.pdf_source import PdfSource
+from pdf3md.jobs.store import MemoryJobStore
+
+
+def make_pdf(path):
+    """Write a PDF whose heading levels depend on font sizes of other pages.
+
+    The second page's 16pt heading is a level-2 heading for the whole
+    document but the largest font on its own page.
+    """
+    doc = pymupdf.open()
+    page = doc.new_page()
+    page.insert_text((72, 72), "Title", fontsize=24)
+    page.insert_text((72, 112), "Subtitle", fontsize=16)
+    for line in range(10):
+        page.insert_text((72, 142 + line * 16), f"Body line {line} of page one.")
+    page = doc.new_page()
+    page.insert_text((72, 72), "Minor heading", fontsize=16)
+    for line in range(10):
+        page.insert_text((72, 102 + line * 16), f"Body line {line} of page two.")
+    page = doc.new_page()
+    for line in range(12):
+        page.insert_text((72, 72 + line * 16), f"Body line {line} of page three.")
+    doc.save(path)
+    doc.close()
+    return str(path)
+
+
+@pytest.fixture
+def pdf_path(tmp_path, monkeypatch):
+    monkeypatch.setenv("PDF3MD_CACHE_ENABLED", "0")
+    monkeypatch.setenv("PDF3MD_PDF_WORKERS", "1")
+    monkeypatch.setenv("PDF3MD_ISOLATION", "0")
+    return make_pdf(tmp_path / "headings.pdf")
+
+
+def baseline(path, pages=None):
+    """Markdown of the unmodified whole-document conversion."""
+    with pymupdf.open(path) as doc:
+        return pymupdf4llm.to_markdown(doc, pages=pages, show_progress=False)
+
+
+def run_conversion(path, pages=None):
+    """Run convert_pdf and return the finished job."""
+    job_store = MemoryJobStore(ttl=60, max_bytes=16 * 1024 * 1024)
+    conversion_id = str(uuid.uuid4())
+    try:
+        progress = JobProgress(conversion_id, job_store)
+        convert_pdf(path, "headings.pdf", progress, pages=pages)
+        job = job_store.get(conversion_id)
+    finally:
+        job_store.stop()
+    assert job["status"] == "completed", job.get("error")
+    return job
+
+
+@pytest.mark.parametrize("selection", [None, [1, 2]])
+def test_serial_matches_whole_document(pdf_path, selection):
+    pages = {}
+    with pymupdf.open(pdf_path) as doc:
+        page_numbers = selection if selection is not None else range(len(doc))
+        convert_pdf_serial(
+            doc,
+            page_numbers,
+            identify_headers(doc, selection),
+            lambda pno, markdown: pages.__setitem__(pno, markdown),
+        )
+    assert sorted(pages) == list(page_numbers)
+    markdown = "".join(pages[pno] for pno in page_numbers)
+    assert markdown == baseline(pdf_path, selection)
+
+
+@pytest.mark.parametrize("selection", [None, [1, 2]])
+def test_convert_pdf_matches_whole_document(pdf_path, selection):
+    job = run_conversion(pdf_path, selection)
+    assert job["result"]["markdown"] == baseline(pdf_path, selection)
+
+
+def test_parallel_request_matches_whole_document(pdf_path, monkeypatch):
+    monkeypatch.setenv("PDF3MD_PDF_WORKERS", "2")
+    monkeypatch.setenv("PDF3MD_PARALLEL_MIN_PAGES", "1")
+    job = run_conversion(pdf_path)
+    assert job["result"]["markdown"] == baseline(pdf_path)
+
+
+def test_cached_pages_match_whole_document(pdf_path, tmp_path, monkeypatch):
+    monkeypatch.setenv("PDF3MD_CACHE_ENABLED", "1")
+    monkeypatch.setenv("PDF3MD_CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.setattr(page_cache, "_page_cache", None)
+    # Converting a selection first must not leak its headings into later runs
+    run_conversion(pdf_path, [1])
+    for _ in range(2):
+        job = run_conversion(pdf_path)
+        assert job["result"]["markdown"] == baseline(pdf_path)
+
+
+def test_preview_then_full_match_whole_document(pdf_path, tmp_path, monkeypatch):
+    monkeypatch.setenv("PDF3MD_CACHE_ENABLED", "1")
+    monkeypatch.setenv("PDF3MD_CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.setattr(page_cache, "_page_cache", None)
+    job_store = MemoryJobStore(ttl=60, max_bytes=16 * 1024 * 1024)
+    conversion_id = str(uuid.uuid4())
+    source = PdfSource.from_path(pdf_path)
+    try:
+        convert_pdf_with_progress(
+            source, conversion_id, "headings.pdf", job_store, pages=[1], preview=True
+        )
+        preview = job_store.get(conversion_id)["preview"]
+        convert_pdf_with_progress(source, conversion_id, "headings.pdf", job_store)
+        job = job_store.get(conversion_id)
+    finally:
+        source.close()
+        job_store.stop()
+    assert preview["markdown"] == baseline(pdf_path, [1])
+    assert job["status"] == "completed", job.get("error")
+    assert job["result"]["markdown"] == baseline(pdf_path)
+
+
+@pytest.mark.parametrize("selection", [None, [1, 2]])
+def test_isolated_worker_matches_whole_document(pdf_path, monkeypatch, selection):
+    monkeypatch.setenv("PDF3MD_ISOLATION", "1")
+
+    def open_in_server(source):
+        raise AssertionError("the server process must not parse the PDF")
+
+    # The pre-passes run in the worker too, never on the shared document
+    monkeypatch.setattr(PdfSource, "open", open_in_server)
+    job = run_conversion(pdf_path, selection)
+    assert job["result"]["markdown"] == baseline(pdf_path, selection)
@@ -0,0 +1,124 @@
+"""Long-polling /progress, its SSE stream and the per-page /stream."""
+
+import json
+import time
+import uuid
+from threading import Timer
+
+import pytest
+
+
+def parse_sse(body):
+    """Split an SSE body into (event, data, id) tuples, skipping comments."""
+    events = []
+    for message in body.strip().split("\n\n"):
+        fields = {}
+        for line in message.splitlines():
+            if line.startswith(":"):
+                continue
+            name, _, value = line.partition(": ")
+            fields[name] = value
+        if fields:
+            data = json.loads(fields["data"])
+            events.append((fields["event"], data, fields.get("id")))
+    return events
+
+
+def later(delay, fn, *args, **kwargs):
+    timer = Timer(delay, fn, args, kwargs)
+    timer.start()
+    return timer
+
+
+@pytest.fixture
+def job(app_module):
+    """ID of a processing job that no conversion updates."""
+    conversion_id = str(uuid.uuid4())
+    app_module.job_store.put(
+        conversion_id, {"status": "processing", "progress": 10, "stage": "Working"}
+    )
+    yield conversion_id
+    app_module.release_conversion(conversion_id)
+
+
+def test_long_poll_times_out_without_changes(client, job):
+    started = time.monotonic()
+    response = client.get(f"/progress/{job}?wait=1&timeout=0.3")
+    assert time.monotonic() - started >= 0.3
+    assert response.status_code == 200
+    assert response.get_json()["version"] == 1
+
+
+def test_long_poll_returns_on_change(client, app_module, job):
+    later(0.2, app_module.job_store.update, job, progress=50)
+    started = time.monotonic()
+    progress = client.get(f"/progress/{job}?wait=1&timeout=30").get_json()
+    assert time.monotonic() - started < 10
+    assert progress["version"] == 2
+    assert progress["progress"] == 50
+
+
+def test_long_poll_with_stale_version_returns_at_once(client, job):
+    started = time.monotonic()
+    progress = client.get(f"/progress/{job}?wait=0&timeout=30").get_json()
+    assert time.monotonic() - started < 5
+    assert progress["version"] == 1
+
+
+def test_long_poll_timeout_is_clamped(client, job):
+    started = time.monotonic()
+    response = client.get(f"/progress/{job}?wait=1&timeout=-5")
+    assert time.monotonic() - started < 5
+    assert response.status_code == 200
+
+
+def test_long_poll_unknown_conversion(client):
+    response = client.get("/progress/unknown?wait=1&timeout=0")
+    assert response.status_code == 404
+
+
+def test_progress_stream_until_completed(client, app_module, job):
+    later(0.2, app_module.job_store.update, job, progress=60, stage="Halfway")
+    later(0.4, app_module.job_store.update, job, progress=100, status="completed")
+
+    response = client.get(f"/progress/{job}/stream")
+    assert response.status_code == 200
+    assert response.mimetype == "text/event-stream"
+    assert response.headers["Cache-Control"] == "no-cache"
+    events = parse_sse(response.get_data(as_text=True))
+
+    assert {event for event, _, _ in events} == {"progress"}
+    # Each event carries the job version as its ID
+    assert [int(event_id) for _, _, event_id in events] == [
+        data["version"] for _, data, _ in events
+    ]
+    assert events[0][1]["progress"] == 10
+    assert events[-1][1]["status"] == "completed"
+    assert events[-1][1]["eta_seconds"] == 0
+
+
+def test_progress_stream_of_removed_job(client, app_module, job):
+    later(0.2, app_module.job_store.delete, job)
+    events = parse_sse(client.get(f"/progress/{job}/stream").get_data(as_text=True))
+    assert events[-1][:2] == ("error", {"error": "Conversion not found"})
+
+
+def test_progress_stream_unknown_conversion(client):
+    assert client.get("/progress/unknown/stream").status_code == 404
+
+
+def test_page_stream_resumes_after_last_event_id(client, app_module, job):
+    job_store = app_module.job_store
+    for page in (1, 2):
+        job_store.append_chunk(job, {"page": page, "markdown": f"Page {page}\n"})
+    later(0.2, job_store.append_chunk, job, {"page": 3, "markdown": "Page 3\n"})
+    later(1.0, job_store.update, job, status="completed", result={"pageCount": 3})
+
+    response = client.get(f"/stream/{job}", headers={"Last-Event-ID": "0"})
+    events = parse_sse(response.get_data(as_text=True))
+
+    pages = [
+        (data["page"], event_id) for event, data, event_id in events if event == "page"
+    ]
+    assert pages == [(2, "1"), (3, "2")]
+    assert events[-1][:2] == ("done", {"pageCount": 3})
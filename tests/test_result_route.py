@@ -0,0 +1,88 @@
+"""GET /result/<id>: encodings, validators and Range requests."""
+
+import gzip
+import uuid
+
+import pytest
+
+MARKDOWN = "# Result\n\n" + "Some converted text. " * 200
+
+
+@pytest.fixture
+def finished(app_module):
+    """ID of a completed job whose result was spilled to the result store."""
+    conversion_id = str(uuid.uuid4())
+    app_module.job_store.put(conversion_id, {"status": "processing"})
+    result = app_module.result_store.spill(conversion_id, {"markdown": MARKDOWN})
+    app_module.job_store.update(conversion_id, status="completed", result=result)
+    yield conversion_id
+    app_module.release_conversion(conversion_id)
+
+
+def test_identity_with_strong_etag(client, finished):
+    response = client.get(f"/result/{finished}")
+    assert response.status_code == 200
+    assert response.mimetype == "text/markdown"
+    assert response.get_data(as_text=True) == MARKDOWN
+    assert "Content-Encoding" not in response.headers
+    assert response.headers["Vary"] == "Accept-Encoding"
+    etag, weak = response.get_etag()
+    assert etag and not weak
+
+
+def test_gzip_negotiation(client, finished):
+    identity = client.get(f"/result/{finished}")
+    response = client.get(f"/result/{finished}", headers={"Accept-Encoding": "gzip"})
+    assert response.status_code == 200
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert response.headers["Vary"] == "Accept-Encoding"
+    assert gzip.decompress(response.get_data()).decode("utf-8") == MARKDOWN
+    # Each encoding is a different representation with its own validator
+    assert response.get_etag()[0] != identity.get_etag()[0]
+
+
+def test_zstd_negotiation(client, finished, app_module):
+    zstandard = pytest.importorskip("zstandard")
+    response = client.get(
+        f"/result/{finished}", headers={"Accept-Encoding": "zstd, gzip;q=0.5"}
+    )
+    assert response.headers["Content-Encoding"] == "zstd"
+    data = zstandard.ZstdDecompressor().decompressobj().decompress(response.get_data())
+    assert data.decode("utf-8") == MARKDOWN
+
+
+def test_zstd_not_offered_without_zstandard(client, finished, app_module):
+    if "zstd" in app_module.result_store.encodings:
+        pytest.skip("zstandard is installed")
+    response = client.get(f"/result/{finished}", headers={"Accept-Encoding": "zstd"})
+    assert "Content-Encoding" not in response.headers
+    assert response.get_data(as_text=True) == MARKDOWN
+
+
+def test_if_none_match_returns_304(client, finished):
+    etag = client.get(f"/result/{finished}").get_etag()[0]
+    response = client.get(f"/result/{finished}", headers={"If-None-Match": f'"{etag}"'})
+    assert response.status_code == 304
+    assert response.get_data() == b""
+
+
+def test_range_returns_206(client, finished):
+    response = client.get(f"/result/{finished}", headers={"Range": "bytes=2-9"})
+    assert response.status_code == 206
+    assert response.get_data(as_text=True) == MARKDOWN[2:10]
+    assert response.headers["Content-Range"] == f"bytes 2-9/{len(MARKDOWN)}"
+
+
+def test_unsatisfiable_range_returns_416(client, finished):
+    response = client.get(
+        f"/result/{finished}", headers={"Range": "bytes=999999999-"}
+    )
+    assert response.status_code == 416
+    assert response.headers["Content-Range"] == f"bytes */{len(MARKDOWN)}"
+
+
+def test_unknown_result_and_variant(client, finished):
+    assert client.get(f"/result/{uuid.uuid4()}").status_code == 404
+    assert client.get(f"/result/{finished}?variant=other").status_code == 400
+    # No preview was converted for this job
+    assert client.get(f"/result/{finished}?variant=preview").status_code == 404